@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Модули журнала импортируются по именам из каталога пакета (как в main.py)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cli import main
+
+sys.exit(main())
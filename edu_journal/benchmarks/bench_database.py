@@ -0,0 +1,103 @@
+"""Бенчмарк методов Database на синтетических данных разного объема
+
+Для каждого объема создается временная база, заполняется генератором
+synthetic.generate_dataset и замеряются задержка и пропускная способность
+основных запросов. Результаты сохраняются в JSON для сравнения запусков.
+
+Запуск: python benchmarks/bench_database.py --scales 10000 100000 1000000
+"""
+import argparse
+import os
+import statistics
+import time
+
+from common import run_metadata, save_results, synthetic_database
+
+
+DEFAULT_SCALES = [10000, 100000]
+DEFAULT_REPEATS = 20
+SEARCH_TEXT = 'расчеты'
+
+
+def measure(function, repeats):
+    """Замер задержки вызова: минимум, медиана, 95-й перцентиль и строк в секунду"""
+    function()  # Прогрев кэша страниц SQLite
+    timings = []
+    rows = 0
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - started)
+        rows = len(result) if hasattr(result, '__len__') else 1
+    timings.sort()
+    median = statistics.median(timings)
+    return {
+        'min_ms': timings[0] * 1000,
+        'median_ms': median * 1000,
+        'p95_ms': timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000,
+        'rows': rows,
+        'calls_per_sec': 1 / median if median > 0 else None,
+        'rows_per_sec': rows / median if median > 0 else None,
+    }
+
+
+def build_cases(db, dataset):
+    """Набор замеряемых вызовов для заполненной базы"""
+    student_id = dataset['student_ids'][len(dataset['student_ids']) // 2]
+    teacher_id = dataset['teacher_ids'][0]
+    competency_id = db.fetch_one("SELECT competency_id FROM grades LIMIT 1")[0]
+    grade_ids = [row[0] for row in db.fetch_all(
+        "SELECT id FROM grades WHERE student_id = ? LIMIT 50", (student_id,))]
+    change_seq = db.get_change_seq()
+    group_name = db.fetch_one("SELECT group_name FROM users WHERE id = ?", (student_id,))[0]
+
+    return {
+        'get_student_grades_with_details': lambda: db.get_student_grades_with_details(student_id),
+        'get_teacher_journal': lambda: db.get_teacher_journal(teacher_id),
+        'get_competency_stats': lambda: db.get_competency_stats(competency_id),
+        'get_grade_details': lambda: db.get_grade_details(grade_ids),
+        'get_teacher_bootstrap': lambda: db.get_teacher_bootstrap(teacher_id),
+        'get_grade_changes': lambda: db.get_grade_changes(max(0, change_seq - 100))[1],
+        'search_grades': lambda: db.search_grades(SEARCH_TEXT, limit=100),
+        'get_mastery_matrix': lambda: db.get_mastery_matrix(group_name, 'best')['cells'],
+    }
+
+
+def run_scale(grades, repeats, seed=0):
+    """Заполнение временной базы и замер всех вызовов для одного объема"""
+    with synthetic_database(grades, seed) as (db, dataset, path):
+        result = {
+            'grades': grades,
+            'students': len(dataset['student_ids']),
+            'generate_sec': dataset['elapsed'],
+            'generate_rows_per_sec': grades / dataset['elapsed'] if dataset['elapsed'] > 0 else None,
+            'db_size_bytes': os.path.getsize(path),
+            'methods': {},
+        }
+        for name, function in build_cases(db, dataset).items():
+            result['methods'][name] = measure(function, repeats)
+            print(f"  {name:<34} {result['methods'][name]['median_ms']:>10.2f} мс")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Бенчмарк методов Database')
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES,
+                        help='Количество оценок в каждом прогоне')
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS,
+                        help='Количество замеров каждого вызова')
+    parser.add_argument('--seed', type=int, default=0, help='Начальное значение генератора')
+    parser.add_argument('--output', help='Файл результатов (по умолчанию benchmarks/results/...)')
+    args = parser.parse_args(argv)
+
+    results = run_metadata(repeats=args.repeats, seed=args.seed, scales=[])
+    for grades in args.scales:
+        print(f"Объем {grades} оценок:")
+        results['scales'].append(run_scale(grades, args.repeats, args.seed))
+
+    save_results(results, 'bench_database', args.output)
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""Бенчмарк компактного хранения: размер базы и скорость вставки
+
+Сравниваются схема до миграции компактного хранения (AUTOINCREMENT во
+всех таблицах, grade_indicators с суррогатным id) и после нее. Для
+каждого объема замеряются пакетная генерация, вставка оценок по одной с
+фиксацией, размер файла и размер таблиц по dbstat (если он доступен).
+
+Запуск: python benchmarks/bench_storage.py --scales 10000 100000
+"""
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import time
+
+from common import run_metadata, save_results, synthetic_database
+from core.database import Database
+
+
+DEFAULT_SCALES = [10000, 100000]
+SINGLE_INSERTS = 500  # Количество оценок, добавляемых по одной
+
+
+class LegacyStorageDatabase(Database):
+    """База без миграции компактного хранения (схема до изменения)"""
+    MIGRATIONS = [migration for migration in Database.MIGRATIONS
+                  if migration is not Database._migrate_compact_storage]
+
+
+SCHEMAS = {
+    'before': LegacyStorageDatabase,
+    'after': Database,
+}
+
+
+def table_sizes(db):
+    """Размер таблиц и индексов в байтах по виртуальной таблице dbstat"""
+    try:
+        rows = db.connection.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name").fetchall()
+    except sqlite3.Error:
+        return None  # SQLite собран без SQLITE_ENABLE_DBSTAT_VTAB
+    return {name: size for name, size in rows if name.startswith(('grade', 'idx_grade', 'sqlite_sequence'))}
+
+
+def single_inserts(db, dataset, count):
+    """Оценки по одной через add_grade_with_indicators, оценок в секунду"""
+    template = db.fetch_one(
+        "SELECT subject_id, competency_id, comment FROM grades ORDER BY id LIMIT 1"
+    )
+    indicator_ids = [row[0] for row in db.get_indicators_by_competency(template[1])[:4]]
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for number in range(count):
+            db.add_grade_with_indicators({
+                'student_id': dataset['student_ids'][number % len(dataset['student_ids'])],
+                'teacher_id': dataset['teacher_ids'][0],
+                'subject_id': template[0],
+                'competency_id': template[1],
+                'grade_value': 3,
+                'percentage': 50,
+                'comment': template[2],
+                'date': '2024-06-01',
+            }, indicator_ids)
+    elapsed = time.perf_counter() - started
+    return count / elapsed if elapsed > 0 else None
+
+
+def run_scale(grades, seed=0):
+    """Замеры обеих схем для одного объема"""
+    result = {'grades': grades}
+    for name, database_class in SCHEMAS.items():
+        with synthetic_database(grades, seed, database_class) as (db, dataset, path):
+            db.connection.execute("VACUUM")
+            result[name] = {
+                'generate_rows_per_sec': grades / dataset['elapsed'] if dataset['elapsed'] > 0 else None,
+                'db_size_kb': os.path.getsize(path) / 1024,
+                'tables_bytes': table_sizes(db),
+                'single_insert_rows_per_sec': single_inserts(db, dataset, SINGLE_INSERTS),
+            }
+        print(f"  {name:<7} размер {result[name]['db_size_kb']:>10.0f} КБ, "
+              f"пакетно {result[name]['generate_rows_per_sec']:>8.0f} оценок/с, "
+              f"по одной {result[name]['single_insert_rows_per_sec']:>6.0f} оценок/с")
+    result['size_ratio'] = result['after']['db_size_kb'] / result['before']['db_size_kb']
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Бенчмарк компактного хранения')
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES,
+                        help='Количество оценок в каждом прогоне')
+    parser.add_argument('--seed', type=int, default=0, help='Начальное значение генератора')
+    parser.add_argument('--output', help='Файл результатов (по умолчанию benchmarks/results/...)')
+    args = parser.parse_args(argv)
+
+    results = run_metadata(seed=args.seed, single_inserts=SINGLE_INSERTS, scales=[])
+    for grades in args.scales:
+        print(f"Объем {grades} оценок:")
+        results['scales'].append(run_scale(grades, args.seed))
+
+    save_results(results, 'bench_storage', args.output)
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+"""Бенчмарк окон интерфейса без дисплея (QT_QPA_PLATFORM=offscreen)
+
+Для каждого объема синтетической базы замеряются создание окон входа,
+студента и преподавателя, загрузка оценок, заполнение таблицы,
+resizeColumnsToContents и пиковая память (resource или psutil, если
+доступны). Время и прирост памяти Python-объектов измеряются отдельными
+прогонами, чтобы tracemalloc не искажал время. С параметром --baseline
+результаты сравниваются с прошлым запуском, и при замедлении больше
+допуска скрипт завершается с кодом 1.
+
+Запуск: python benchmarks/bench_ui.py --scales 10000 100000 --baseline results/base.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Модуль есть только в POSIX
+    resource = None
+
+try:
+    import psutil
+except ImportError:  # Без psutil на Windows пиковая память не измеряется
+    psutil = None
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication
+
+from common import find_regressions, run_metadata, save_results, synthetic_database
+from core.database import USER_COLUMNS, USER_FROM
+from core.models import User
+from ui.login_window import LoginWindow
+from ui.student_window import StudentWindow
+from ui.teacher_window import TeacherWindow
+
+
+DEFAULT_SCALES = [10000, 100000]
+DEFAULT_TOLERANCE = 0.25  # Допустимое замедление относительно базового запуска
+BOOTSTRAP_TIMEOUT_SEC = 60
+
+
+def max_rss_kb():
+    """Пиковый размер процесса в КБ (resource или psutil), None - если измерить нечем"""
+    if resource is not None:
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage // 1024 if sys.platform == 'darwin' else usage  # macOS возвращает байты
+    if psutil is not None:
+        memory = psutil.Process().memory_info()
+        return getattr(memory, 'peak_wset', memory.rss) // 1024  # peak_wset есть только в Windows
+    return None
+
+
+@contextlib.contextmanager
+def timed(results, name):
+    """Замер блока: время без tracemalloc или пиковый прирост памяти под ним
+
+    Трассировка каждого выделения памяти замедляет код на Python, поэтому
+    время ({name}_ms) записывается только в прогоне без tracemalloc, а
+    память ({name}_peak_kb) - только в прогоне с ним (см. measured).
+    """
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+    if tracing:
+        results[f'{name}_peak_kb'] = (tracemalloc.get_traced_memory()[1] - before) / 1024
+    else:
+        results[f'{name}_ms'] = (time.perf_counter() - started) * 1000
+
+
+def measured(bench, *args):
+    """Два прогона замера: время без tracemalloc, затем память под tracemalloc"""
+    results = bench(*args)
+    tracemalloc.start()
+    try:
+        memory = bench(*args)
+    finally:
+        tracemalloc.stop()
+    results.update((key, value) for key, value in memory.items() if key.endswith('_peak_kb'))
+    return results
+
+
+def fill_table(window, grades):
+    """Заполнение таблицы окна так же, как load_grades, с отдельным замером этапов"""
+    results = {}
+    table = window.grades_table
+    with timed(results, 'table_fill'):
+        table.setSortingEnabled(False)
+        window.grade_items.clear()
+        table.setRowCount(len(grades))
+        for row, grade in enumerate(grades):
+            window.fill_grade_row(row, grade)
+        table.setSortingEnabled(True)
+    with timed(results, 'resize_columns'):
+        table.resizeColumnsToContents()
+    return results
+
+
+def load_user(db, user_id):
+    """Пользователь по id"""
+    return User(*db.fetch_one(f"SELECT {USER_COLUMNS} FROM {USER_FROM} WHERE u.id = ?", (user_id,)))
+
+
+def bench_login(app, db):
+    """Создание и отображение окна входа"""
+    results = {}
+    with timed(results, 'construct'):
+        window = LoginWindow(db, lambda user: None)
+        window.show()
+        app.processEvents()
+    window.close()
+    return results
+
+
+def bench_student(app, db, student_id):
+    """Создание окна студента, загрузка оценок и заполнение таблицы"""
+    user = load_user(db, student_id)
+    results = {}
+    with timed(results, 'construct'):
+        window = StudentWindow(user, db)
+        window.show()
+        app.processEvents()
+    with timed(results, 'load_grades'):
+        window.load_grades()
+    with timed(results, 'query'):
+        grades = db.get_student_grades_with_details(student_id, as_models=True)
+    results.update(fill_table(window, grades))
+    results['rows'] = len(grades)
+    window.close()
+    return results
+
+
+def bench_teacher(app, db, teacher_id):
+    """Создание окна преподавателя, загрузка снимка и заполнение журнала"""
+    user = load_user(db, teacher_id)
+    results = {}
+    with timed(results, 'construct'):
+        window = TeacherWindow(user, db)
+        window.show()
+        app.processEvents()
+    with timed(results, 'bootstrap'):
+        deadline = time.perf_counter() + BOOTSTRAP_TIMEOUT_SEC
+        while window.time_to_interactive_ms is None and time.perf_counter() < deadline:
+            app.processEvents()
+    results['time_to_interactive_ms'] = window.time_to_interactive_ms
+    with timed(results, 'load_grades'):
+        window.load_grades()
+    with timed(results, 'query'):
+        grades = db.get_teacher_journal(teacher_id, as_models=True)
+    results.update(fill_table(window, grades))
+    results['rows'] = len(grades)
+    window.close()
+    return results
+
+
+def run_scale(app, grades, seed=0):
+    """Замеры всех окон на базе одного объема"""
+    with synthetic_database(grades, seed) as (db, dataset, path):
+        # Самый нагруженный преподаватель и студент из середины списка
+        teacher_id = db.fetch_one("""
+            SELECT teacher_id FROM grades GROUP BY teacher_id ORDER BY COUNT(*) DESC LIMIT 1
+        """)[0]
+        student_id = dataset['student_ids'][len(dataset['student_ids']) // 2]
+
+        result = {
+            'grades': grades,
+            'login': measured(bench_login, app, db),
+            'student': measured(bench_student, app, db, student_id),
+            'teacher': measured(bench_teacher, app, db, teacher_id),
+        }
+    for window in ('login', 'student', 'teacher'):
+        timings = ', '.join(f"{key[:-3]} {value:.0f} мс" for key, value in result[window].items()
+                            if key.endswith('_ms') and value is not None)
+        print(f"  {window:<8} {timings}")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Бенчмарк окон интерфейса')
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES,
+                        help='Количество оценок в каждом прогоне')
+    parser.add_argument('--seed', type=int, default=0, help='Начальное значение генератора')
+    parser.add_argument('--output', help='Файл результатов (по умолчанию benchmarks/results/...)')
+    parser.add_argument('--baseline', help='Результаты прошлого запуска для поиска регрессий')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Допустимое замедление, доля (0.25 = 25%%)')
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    results = run_metadata(seed=args.seed, qt_platform=os.environ['QT_QPA_PLATFORM'], scales=[])
+    for grades in args.scales:
+        print(f"Объем {grades} оценок:")
+        results['scales'].append(run_scale(app, grades, args.seed))
+
+    # Пиковый размер процесса учитывает и память Qt, невидимую для tracemalloc
+    rss = max_rss_kb()
+    if rss is not None:
+        results['max_rss_kb'] = rss
+    save_results(results, 'bench_ui', args.output)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            regressions = find_regressions(json.load(file), results, args.tolerance)
+        for regression in regressions:
+            print(f"✗ Регрессия {regression}")
+        if regressions:
+            return 1
+        print("✓ Регрессий относительно базового запуска нет")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""Общие функции бенчмарков: временные базы, метаданные и сохранение результатов"""
+import contextlib
+import io
+import json
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+# Добавляем путь к исходному коду
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.database import Database
+from core.synthetic import generate_dataset
+
+
+GRADES_PER_STUDENT = 20  # Среднее количество оценок студента за семестр
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+
+@contextlib.contextmanager
+def synthetic_database(grades, seed=0, database_class=Database):
+    """Временная база, заполненная синтетическими данными
+
+    Возвращает (Database, результат generate_dataset, путь к файлу).
+    database_class позволяет сравнить варианты схемы.
+    """
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    db = None
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            db = database_class(db_path=path)
+            students = max(1, grades // GRADES_PER_STUDENT)
+            dataset = generate_dataset(db, students=students, grades=grades, seed=seed)
+        yield db, dataset, path
+    finally:
+        if db is not None:
+            with contextlib.redirect_stdout(io.StringIO()):
+                db.close()
+        os.remove(path)
+
+
+def run_metadata(**extra):
+    """Сведения об окружении запуска"""
+    metadata = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+    }
+    metadata.update(extra)
+    return metadata
+
+
+def save_results(results, name, output=None):
+    """Сохранение результатов в JSON (по умолчанию benchmarks/results/<name>_<время>.json)"""
+    output = Path(output) if output else RESULTS_DIR / f"{name}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"✓ Результаты сохранены: {output}")
+    return output
+
+
+def find_regressions(baseline, current, tolerance, keys=('_ms', '_kb')):
+    """Сравнение результатов с базовым запуском
+
+    Сравниваются числовые поля с окончаниями из keys (время, память) для
+    одинаковых объемов. Возвращает список строк с описанием замедлений
+    больше чем на долю tolerance.
+    """
+    regressions = []
+
+    def walk(old, new, path):
+        if isinstance(old, dict) and isinstance(new, dict):
+            for key in sorted(old.keys() & new.keys()):
+                walk(old[key], new[key], f"{path}.{key}" if path else key)
+        elif (isinstance(old, (int, float)) and isinstance(new, (int, float))
+              and path.endswith(keys) and old > 0 and new > old * (1 + tolerance)):
+            regressions.append(f"{path}: {old:.1f} -> {new:.1f} (+{(new / old - 1) * 100:.0f}%)")
+
+    old_scales = {scale['grades']: scale for scale in baseline.get('scales', [])}
+    for scale in current.get('scales', []):
+        if scale['grades'] in old_scales:
+            walk(old_scales[scale['grades']], scale, f"{scale['grades']}")
+    return regressions
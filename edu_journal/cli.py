@@ -0,0 +1,203 @@
+import argparse
+import math
+import os
+import sys
+import time
+
+
+DB_ENV = 'EDU_JOURNAL_DB'  # Переменная окружения с путем к базе по умолчанию
+BENCHMARKS = {'database': 'bench_database', 'storage': 'bench_storage'}  # Бенчмарки без интерфейса
+EXPORT_FILTERS = ['student_id', 'teacher_id', 'subject_id', 'competency_id', 'group_name', 'date_from', 'date_to']
+
+# Модули команд импортируются внутри обработчиков: запуск одной команды не
+# загружает зависимости остальных, а PyQt5 не импортируется вовсе
+
+
+def _print_progress(label, total=None):
+    """Функция progress для длительных операций, печатает ход выполнения"""
+    def progress(done, *_):
+        print(f"  {label}: {done}" + (f" из {total}" if total else ''), flush=True)
+    return progress
+
+
+def open_database(args):
+    """Подключение к базе, указанной в --db"""
+    from core.database import Database
+
+    database = Database(db_path=args.db)
+    if database.connection is None:
+        raise SystemExit(f"✗ Не удалось открыть базу данных: {args.db}")
+    return database
+
+
+def recompute_grades(db, dry_run=False):
+    """Пересчет оценок и процентов по выбранным индикаторам
+
+    Правила те же, что при выставлении оценки (validators.
+    calculate_grade_by_count). Процент сравнивается и записывается без
+    округления, как его сохраняет окно преподавателя. Возвращает количество
+    оценок, которые отличались от расчетных; при dry_run изменения не
+    записываются.
+    """
+    from core.validators import calculate_grade_by_count
+
+    totals = dict(db.fetch_all("SELECT competency_id, COUNT(*) FROM fgos_indicators GROUP BY competency_id"))
+    changed = []
+    for grade_id, _, competency_id, _, _, grade_value, percentage, _, indicator_count, _ in db.iter_grade_facts():
+        expected, expected_percentage = calculate_grade_by_count(indicator_count, totals.get(competency_id, 0))
+        if expected != grade_value or not math.isclose(expected_percentage, percentage):
+            changed.append((expected, expected_percentage, grade_id))
+    if changed and not dry_run:
+        with db.connection:
+            db.connection.executemany("UPDATE grades SET grade_value = ?, percentage = ? WHERE id = ?", changed)
+    return len(changed)
+
+
+def command_import(args):
+    from core.importers import IMPORT_CHUNK_SIZE, import_grades, import_roster
+
+    db = open_database(args)
+    chunk_size = args.chunk_size or IMPORT_CHUNK_SIZE
+    progress = _print_progress('обработано строк')
+    if args.kind == 'roster':
+        report = import_roster(db, args.path, chunk_size=chunk_size, progress=progress,
+                               update_credentials=args.update_credentials)
+    else:
+        report = import_grades(db, args.path, chunk_size=chunk_size, dry_run=args.dry_run, progress=progress)
+    db.close()
+
+    for line_number, message in report.errors:
+        print(f"✗ Строка {line_number}: {message}")
+    print(f"✓ Импортировано: {report.imported}, ошибок: {len(report.errors)}, "
+          f"{report.rows_per_second:.0f} строк/с за {report.elapsed:.1f} с")
+    return 1 if report.errors else 0
+
+
+def command_export(args):
+    from core.export import export_journal
+
+    filters = {name: getattr(args, name) for name in EXPORT_FILTERS if getattr(args, name) is not None}
+    started = time.perf_counter()
+    count = export_journal(args.db, args.path, filters, progress=_print_progress('выгружено строк'))
+    print(f"✓ Выгружено строк: {count} в {args.path} за {time.perf_counter() - started:.1f} с")
+    return 0
+
+
+def command_recompute(args):
+    db = open_database(args)
+    started = time.perf_counter()
+    changed = recompute_grades(db, args.dry_run)
+    db.close()
+    action = 'Требуют пересчета' if args.dry_run else 'Пересчитано'
+    print(f"✓ {action} оценок: {changed} за {time.perf_counter() - started:.1f} с")
+    return 0
+
+
+def command_backup(args):
+    from core.backup import BackupService
+
+    result = BackupService(args.db, args.backup_dir, keep=args.keep).run_backup()
+    for path in result['removed']:
+        print(f"✓ Удален старый снимок: {path}")
+    return 0
+
+
+def command_maintenance(args):
+    from core.maintenance import run_maintenance
+
+    report = run_maintenance(args.db, args.tasks)
+    return 0 if all(item['task'] != 'integrity' or item['result'] == 'ok' for item in report) else 1
+
+
+def command_stats(args):
+    db = open_database(args)
+    roles = dict(db.fetch_all("SELECT role, COUNT(*) FROM users GROUP BY role"))
+    groups = db.fetch_one("SELECT COUNT(DISTINCT group_name) FROM users WHERE role = 'student'")[0]
+    print(f"Студентов: {roles.get('student', 0)}, преподавателей: {roles.get('teacher', 0)}, групп: {groups}", flush=True)
+
+    grades, average, first, last = db.fetch_one("SELECT COUNT(*), AVG(percentage), MIN(date), MAX(date) FROM grades")
+    indicators = db.fetch_one("SELECT COUNT(*) FROM grade_indicators")[0]
+    print(f"Оценок: {grades}, выбранных индикаторов: {indicators}, период: {first or '-'} - {last or '-'}", flush=True)
+    if grades:
+        distribution = db.fetch_all("SELECT grade_value, COUNT(*) FROM grades GROUP BY grade_value ORDER BY grade_value DESC")
+        print("Распределение оценок: " + ', '.join(f"{value}: {count}" for value, count in distribution)
+              + f"; средний процент освоения: {average:.1f}%", flush=True)
+
+    for year, path, count in db.get_archives():
+        print(f"Архив {year}/{year + 1}: {count} оценок ({path})", flush=True)
+
+    page_count, freelist_count, page_size = (db.fetch_one(f"PRAGMA {name}")[0]
+                                             for name in ('page_count', 'freelist_count', 'page_size'))
+    print(f"Размер базы: {page_count * page_size // 1024} КБ, страниц: {page_count}, свободных: {freelist_count}")
+    db.close()
+    return 0
+
+
+def command_benchmark(args):
+    # Бенчмарки импортируют общий модуль common из своего каталога
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks'))
+    module = __import__(BENCHMARKS[args.name])
+    module.main(args.options)
+    return 0
+
+
+def build_parser():
+    from core.backup import BACKUP_KEEP
+    from core.maintenance import MAINTENANCE_TASKS, TASK_FUNCTIONS
+
+    parser = argparse.ArgumentParser(
+        prog='python -m edu_journal',
+        description='Пакетные операции журнала без графического интерфейса'
+    )
+    parser.add_argument('--db', default=os.environ.get(DB_ENV),
+                        help=f'Путь к файлу базы данных (по умолчанию из переменной {DB_ENV})')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    command = commands.add_parser('import', help='Импорт студентов или оценок из CSV')
+    command.add_argument('kind', choices=['roster', 'grades'], help='Тип файла')
+    command.add_argument('path', help='Путь к CSV')
+    command.add_argument('--chunk-size', type=int, default=None, help='Строк в одной транзакции')
+    command.add_argument('--dry-run', action='store_true', help='Проверить оценки без записи')
+    command.add_argument('--update-credentials', action='store_true',
+                         help='Заменить пароль и роль существующих пользователей')
+    command.set_defaults(handler=command_import)
+
+    command = commands.add_parser('export', help='Выгрузка журнала в CSV или XLSX')
+    command.add_argument('path', help='Файл результата (.csv или .xlsx)')
+    for name in EXPORT_FILTERS:
+        command.add_argument(f"--{name.replace('_', '-')}", dest=name,
+                             type=int if name.endswith('_id') else str, help='Фильтр оценок')
+    command.set_defaults(handler=command_export)
+
+    command = commands.add_parser('recompute', help='Пересчет оценок по выбранным индикаторам')
+    command.add_argument('--dry-run', action='store_true', help='Только подсчитать расхождения')
+    command.set_defaults(handler=command_recompute)
+
+    command = commands.add_parser('backup', help='Онлайн-копия базы с ротацией снимков')
+    command.add_argument('backup_dir', help='Каталог снимков')
+    command.add_argument('--keep', type=int, default=BACKUP_KEEP, help='Количество хранимых снимков')
+    command.set_defaults(handler=command_backup)
+
+    command = commands.add_parser('maintenance', help='Обслуживание базы данных')
+    command.add_argument('tasks', nargs='*', default=list(MAINTENANCE_TASKS), choices=sorted(TASK_FUNCTIONS),
+                         help='Задачи обслуживания (по умолчанию: %(default)s)')
+    command.set_defaults(handler=command_maintenance)
+
+    command = commands.add_parser('stats', help='Сводка по базе данных')
+    command.set_defaults(handler=command_stats)
+
+    command = commands.add_parser('benchmark', help='Бенчмарки на синтетических данных')
+    command.add_argument('name', choices=sorted(BENCHMARKS), help='Бенчмарк')
+    command.add_argument('options', nargs=argparse.REMAINDER, help='Параметры бенчмарка (--scales и др.)')
+    command.set_defaults(handler=command_benchmark, needs_db=False)
+
+    return parser
+
+
+def main(argv=None):
+    """Разбор аргументов и выполнение команды, возвращает код завершения"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, 'needs_db', True) and not args.db:
+        parser.error(f"укажите --db или переменную окружения {DB_ENV}")
+    return args.handler(args)
@@ -0,0 +1,7 @@
+"""Ядро журнала без графического интерфейса
+
+Слой данных (database, models), правила оценивания (validators) и
+пакетные операции. Модули импортируются по отдельности
+(from core.database import Database), пакет ничего не загружает заранее,
+поэтому фоновые процессы и тесты не тянут зависимости интерфейса.
+"""
@@ -0,0 +1,275 @@
+import math
+from array import array
+from collections import Counter
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:  # Аналитика работает и без NumPy, но медленнее
+    np = None
+
+
+# Столбцы хранилища и коды типов array (совпадают с кодами dtype NumPy)
+GRADE_COLUMNS = [
+    ('id', 'q'),
+    ('student_id', 'q'),
+    ('competency_id', 'q'),
+    ('subject_id', 'q'),
+    ('teacher_id', 'q'),
+    ('grade_value', 'b'),
+    ('percentage', 'd'),  # Процент освоения не округляется (5 из 8 = 62.5)
+    ('date', 'i'),  # Порядковый номер дня (date.toordinal)
+    ('indicator_count', 'H'),
+    ('indicator_mask', 'q'),  # Биты выбранных индикаторов (fgos_indicators.bit_index)
+]
+
+AGGREGATES = ('count', 'sum', 'mean', 'min', 'max')
+
+
+def date_ordinal(value):
+    """Порядковый номер дня для даты ГГГГ-ММ-ДД (0, если дата не распознана)"""
+    try:
+        return date.fromisoformat(str(value)[:10]).toordinal()
+    except ValueError:
+        return 0
+
+
+def _percentile(sorted_values, q):
+    """Перцентиль с линейной интерполяцией (как numpy.percentile по умолчанию)"""
+    position = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class GradeStore:
+    """Столбцовое хранилище оценок в памяти для аналитических запросов
+
+    Каждое поле оценки хранится в отдельном array, поэтому группировки,
+    перцентили и гистограммы считаются векторно (NumPy, если установлен)
+    без обращения к базе. refresh() подтягивает только оценки, измененные
+    после последней синхронизации, по журналу grade_changes.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.columns = {name: array(typecode) for name, typecode in GRADE_COLUMNS}
+        self.positions = {}  # Позиция оценки в столбцах по id
+        self.change_seq = None
+
+    def __len__(self):
+        return len(self.columns['id'])
+
+    def _append(self, row):
+        self.positions[row[0]] = len(self.columns['id'])
+        for (name, _), value in zip(GRADE_COLUMNS, self._normalize(row)):
+            self.columns[name].append(value)
+
+    def _update(self, position, row):
+        for (name, _), value in zip(GRADE_COLUMNS, self._normalize(row)):
+            self.columns[name][position] = value
+
+    def _remove(self, grade_id):
+        """Удаление переносом последней строки на место удаляемой"""
+        position = self.positions.pop(grade_id)
+        last = len(self.columns['id']) - 1
+        if position != last:
+            moved_id = self.columns['id'][last]
+            for column in self.columns.values():
+                column[position] = column[last]
+            self.positions[moved_id] = position
+        for column in self.columns.values():
+            column.pop()
+
+    @staticmethod
+    def _normalize(row):
+        row = list(row)
+        row[7] = date_ordinal(row[7])
+        return row
+
+    def load(self):
+        """Полная загрузка оценок из базы"""
+        self.columns = {name: array(typecode) for name, typecode in GRADE_COLUMNS}
+        self.positions = {}
+        with self.db.read_transaction():
+            # Точка синхронизации фиксируется в том же снимке, что и данные
+            self.change_seq = self.db.get_change_seq()
+            for row in self.db.iter_grade_facts():
+                self._append(row)
+        return len(self)
+
+    def refresh(self):
+        """Применение изменений оценок с прошлой синхронизации
+
+        Возвращает количество измененных оценок.
+        """
+        if self.change_seq is None:
+            self.load()
+            return len(self)
+
+        last_seq, changed_ids = self.db.get_grade_changes(self.change_seq)
+        if not changed_ids:
+            return 0
+
+        rows = {row[0]: row for row in self.db.get_grade_facts(changed_ids)}
+        for grade_id in changed_ids:
+            row = rows.get(grade_id)
+            if row is None:
+                if grade_id in self.positions:
+                    self._remove(grade_id)
+            elif grade_id in self.positions:
+                self._update(self.positions[grade_id], row)
+            else:
+                self._append(row)
+        self.change_seq = last_seq
+        return len(changed_ids)
+
+    def _selected(self, filters):
+        """Позиции строк (список) или маска NumPy, удовлетворяющие фильтрам {столбец: значение}"""
+        if np is not None:
+            mask = np.ones(len(self), dtype=bool)
+            for name, value in (filters or {}).items():
+                mask &= self.values(name) == value
+            return mask
+        positions = range(len(self))
+        for name, value in (filters or {}).items():
+            column = self.columns[name]
+            positions = [position for position in positions if column[position] == value]
+        return list(positions)
+
+    def values(self, name, filters=None):
+        """Значения столбца (массив NumPy или список) с учетом фильтров"""
+        column = self.columns[name]
+        if np is not None:
+            values = np.frombuffer(column, dtype=column.typecode).copy() if len(column) else np.zeros(0, dtype=column.typecode)
+            return values if filters is None else values[self._selected(filters)]
+        if filters is None:
+            return list(column)
+        return [column[position] for position in self._selected(filters)]
+
+    def group_by(self, key, value='grade_value', aggregate='mean', filters=None):
+        """Агрегирование столбца value по значениям столбца key
+
+        aggregate - одно из count, sum, mean, min, max. Возвращает словарь
+        {значение key: результат}.
+        """
+        if aggregate not in AGGREGATES:
+            raise ValueError(f"Неизвестная агрегатная функция: {aggregate}")
+        keys = self.values(key, filters)
+        values = self.values(value, filters)
+        if len(keys) == 0:
+            return {}
+
+        if np is not None:
+            groups, inverse = np.unique(keys, return_inverse=True)
+            counts = np.bincount(inverse)
+            if aggregate == 'count':
+                result = counts
+            elif aggregate in ('sum', 'mean'):
+                result = np.bincount(inverse, weights=values.astype(np.float64))
+                if aggregate == 'mean':
+                    result = result / counts
+            else:
+                order = np.lexsort((values, inverse))
+                starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+                ends = starts + counts - 1
+                result = values[order][starts if aggregate == 'min' else ends]
+            return {group.item(): item.item() for group, item in zip(groups, result)}
+
+        grouped = {}
+        for group, item in zip(keys, values):
+            grouped.setdefault(group, []).append(item)
+        functions = {
+            'count': len,
+            'sum': lambda items: float(sum(items)),
+            'mean': lambda items: sum(items) / len(items),
+            'min': min,
+            'max': max,
+        }
+        return {group: functions[aggregate](items) for group, items in grouped.items()}
+
+    def percentile(self, column, q, filters=None):
+        """Перцентиль столбца (q от 0 до 100), None для пустой выборки"""
+        values = self.values(column, filters)
+        if len(values) == 0:
+            return None
+        if np is not None:
+            return float(np.percentile(values, q))
+        return float(_percentile(sorted(values), q))
+
+    def histogram(self, column, bins, filters=None):
+        """Количество значений столбца в интервалах между границами bins
+
+        Интервалы полуоткрытые [a, b), последний включает правую границу
+        (как numpy.histogram).
+        """
+        values = self.values(column, filters)
+        if np is not None:
+            return np.histogram(values, bins=bins)[0].tolist()
+        counts = [0] * (len(bins) - 1)
+        for item in values:
+            for index in range(len(counts)):
+                last = index == len(counts) - 1
+                if bins[index] <= item < bins[index + 1] or (last and item == bins[-1]):
+                    counts[index] += 1
+                    break
+        return counts
+
+    def value_counts(self, column, filters=None):
+        """Количество строк для каждого значения столбца"""
+        return self.group_by(column, column, 'count', filters)
+
+    def competency_stats(self, competency_id):
+        """Средний процент и количество оценок по компетенции"""
+        filters = {'competency_id': competency_id}
+        percentages = self.values('percentage', filters)
+        if len(percentages) == 0:
+            return None, 0
+        return float(sum(percentages)) / len(percentages), len(percentages)
+
+
+def indicator_gaps(db, competency_id, filters=None):
+    """Анализ пробелов по индикаторам компетенции за один проход по оценкам
+
+    filters - фильтры оценок (например, {'student_id': ...} или
+    {'group_name': ...}), без фильтров анализируется весь колледж.
+    Маски оценок объединяются по студентам через OR (индикатор показан
+    хотя бы раз) и AND (показан в каждой оценке). Возвращает словарь:
+    grades, students, average_indicators (среднее число индикаторов в
+    оценке) и indicators - список словарей по индикаторам, отсортированный
+    по возрастанию доли оценок с индикатором (самые частые пробелы первыми).
+    """
+    indicators = db.get_indicator_bits(competency_id)
+    mask_counts = Counter()
+    demonstrated = {}  # OR масок оценок студента
+    consistent = {}  # AND масок оценок студента
+    for student_id, mask in db.iter_indicator_masks(competency_id, filters):
+        mask_counts[mask] += 1
+        demonstrated[student_id] = demonstrated.get(student_id, 0) | mask
+        consistent[student_id] = consistent.get(student_id, mask) & mask
+
+    grades = sum(mask_counts.values())
+    students = len(demonstrated)
+    selected = sum(mask.bit_count() * count for mask, count in mask_counts.items())
+
+    result = []
+    for indicator_id, code, description, bit_index in indicators:
+        bit = 1 << bit_index
+        passed = sum(count for mask, count in mask_counts.items() if mask & bit)
+        result.append({
+            'id': indicator_id,
+            'code': code,
+            'description': description,
+            'passed': passed,
+            'pass_rate': passed / grades if grades else 0.0,
+            'students_missing': sum(1 for mask in demonstrated.values() if not mask & bit),
+            'students_consistent': sum(1 for mask in consistent.values() if mask & bit),
+        })
+    result.sort(key=lambda item: (item['pass_rate'], item['code']))
+
+    return {
+        'grades': grades,
+        'students': students,
+        'average_indicators': selected / grades if grades else 0.0,
+        'indicators': result,
+    }
@@ -0,0 +1,200 @@
+import argparse
+import glob
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+
+BACKUP_PAGES = 256  # Страниц, копируемых за один шаг резервного копирования
+BACKUP_SLEEP = 0.05  # Пауза между шагами, секунды (в это время база не заблокирована)
+BACKUP_KEEP = 7  # Количество хранимых снимков
+BACKUP_INTERVAL = 24 * 60 * 60  # Период резервного копирования, секунды
+CHECKPOINT_INTERVAL = 5 * 60  # Период контрольных точек WAL, секунды
+NIGHT_HOURS = (0, 6)  # Часы [с, до), когда контрольная точка усекает WAL
+SNAPSHOT_FORMAT = '%Y%m%d_%H%M%S_%f'
+
+
+def checkpoint_mode(moment=None):
+    """Режим контрольной точки: TRUNCATE ночью, PASSIVE днем
+
+    PASSIVE не ждет читателей и писателей, TRUNCATE дожидается их и
+    обнуляет файл WAL, поэтому выполняется в часы без нагрузки.
+    """
+    hour = (moment or datetime.now()).hour
+    return 'TRUNCATE' if NIGHT_HOURS[0] <= hour < NIGHT_HOURS[1] else 'PASSIVE'
+
+
+def checkpoint(connection, mode='PASSIVE'):
+    """Контрольная точка WAL, возвращает (занято, страниц в WAL, перенесено страниц)"""
+    if mode not in ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE'):
+        raise ValueError(f"Неизвестный режим контрольной точки: {mode}")
+    return tuple(connection.execute(f"PRAGMA wal_checkpoint({mode})").fetchone())
+
+
+def snapshot_path(db_path, backup_dir, moment=None):
+    """Путь снимка базы: {имя базы}_{ГГГГММДД_ЧЧММСС_мкс}.db в каталоге копий"""
+    stem = os.path.splitext(os.path.basename(db_path))[0]
+    return os.path.join(backup_dir, f"{stem}_{(moment or datetime.now()).strftime(SNAPSHOT_FORMAT)}.db")
+
+
+def list_snapshots(db_path, backup_dir):
+    """Снимки базы в каталоге копий, от старых к новым"""
+    stem = os.path.splitext(os.path.basename(db_path))[0]
+    return sorted(glob.glob(os.path.join(glob.escape(backup_dir), f"{glob.escape(stem)}_*.db")))
+
+
+def rotate_snapshots(db_path, backup_dir, keep=BACKUP_KEEP):
+    """Удаление старых снимков сверх keep, возвращает пути удаленных"""
+    snapshots = list_snapshots(db_path, backup_dir)
+    removed = snapshots[:max(0, len(snapshots) - keep)]
+    for path in removed:
+        os.remove(path)
+    return removed
+
+
+def backup_database(db_path, target_path, pages=BACKUP_PAGES, sleep=BACKUP_SLEEP):
+    """Онлайн-копия базы данных через sqlite3.Connection.backup
+
+    Копирование идет шагами по pages страниц с паузой sleep, поэтому
+    блокировка чтения удерживается недолго и запись в базу продолжается.
+    Если база изменилась другим подключением, SQLite начинает копирование
+    заново, и скопированных страниц оказывается больше размера базы.
+    Копия пишется во временный файл и переименовывается после завершения.
+    Возвращает словарь: path, pages (скопировано страниц), total (страниц
+    в копии), steps и elapsed (секунды).
+    """
+    started = time.perf_counter()
+    temp_path = target_path + '.part'
+    progress = {'pages': 0, 'total': 0, 'steps': 0, 'remaining': None}
+
+    def on_progress(status, remaining, total):
+        # remaining растет, если копирование началось заново
+        previous = progress['remaining']
+        progress['pages'] += total - remaining if previous is None or remaining >= previous else previous - remaining
+        progress.update(total=total, remaining=remaining, steps=progress['steps'] + 1)
+
+    source = sqlite3.connect(db_path)
+    target = sqlite3.connect(temp_path)
+    try:
+        source.backup(target, pages=pages, progress=on_progress, sleep=sleep)
+    except sqlite3.Error:
+        target.close()
+        os.remove(temp_path)
+        raise
+    finally:
+        source.close()
+    target.close()
+    os.replace(temp_path, target_path)
+
+    return {
+        'path': target_path,
+        'pages': progress['pages'],
+        'total': progress['total'],
+        'steps': progress['steps'],
+        'elapsed': time.perf_counter() - started,
+    }
+
+
+class BackupService:
+    """Фоновое резервное копирование и контрольные точки WAL
+
+    Поток с собственным подключением каждые checkpoint_interval секунд
+    выполняет контрольную точку (режим по checkpoint_mode), а раз в
+    interval секунд снимает онлайн-копию в backup_dir и удаляет снимки
+    сверх keep. Результаты копирований сохраняются в history; функция
+    on_backup, если передана, вызывается из фонового потока.
+    """
+
+    def __init__(self, db_path, backup_dir, interval=BACKUP_INTERVAL, checkpoint_interval=CHECKPOINT_INTERVAL,
+                 keep=BACKUP_KEEP, on_backup=None):
+        self.db_path = db_path
+        self.backup_dir = backup_dir
+        self.interval = interval
+        self.checkpoint_interval = checkpoint_interval
+        self.keep = keep
+        self.on_backup = on_backup
+        self.history = []
+        self.last_checkpoint = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Запуск фонового обслуживания"""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='BackupService', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Остановка фонового обслуживания (текущее копирование завершается)"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def is_running(self):
+        """Проверка, выполняется ли обслуживание"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def run_backup(self):
+        """Снимок базы с ротацией старых снимков, возвращает результат backup_database"""
+        with self._lock:
+            os.makedirs(self.backup_dir, exist_ok=True)
+            result = backup_database(self.db_path, snapshot_path(self.db_path, self.backup_dir))
+            result['removed'] = rotate_snapshots(self.db_path, self.backup_dir, self.keep)
+            self.history.append(result)
+        print(f"✓ Резервная копия {result['path']}: {result['pages']} страниц за {result['elapsed']:.2f} с")
+        if self.on_backup is not None:
+            self.on_backup(result)
+        return result
+
+    def _run(self):
+        """Цикл обслуживания, выполняется в фоновом потоке"""
+        try:
+            connection = sqlite3.connect(self.db_path)
+        except sqlite3.Error as e:
+            print(f"✗ Резервное копирование не запущено: {e}")
+            return
+
+        # Первый снимок - через interval после последнего сохраненного, чтобы
+        # перезапуски приложения не вытесняли ротацией более старые снимки
+        snapshots = list_snapshots(self.db_path, self.backup_dir) if os.path.isdir(self.backup_dir) else []
+        age = time.time() - os.path.getmtime(snapshots[-1]) if snapshots else self.interval
+        next_backup = time.monotonic() + max(0, self.interval - age)
+        next_checkpoint = time.monotonic() + self.checkpoint_interval
+        try:
+            while True:
+                now = time.monotonic()
+                try:
+                    if now >= next_backup:
+                        next_backup = now + self.interval
+                        self.run_backup()
+                    if now >= next_checkpoint:
+                        next_checkpoint = now + self.checkpoint_interval
+                        mode = checkpoint_mode()
+                        self.last_checkpoint = (mode,) + checkpoint(connection, mode)
+                except (sqlite3.Error, OSError) as e:
+                    # База может быть временно заблокирована - повторим на следующем шаге
+                    print(f"✗ Ошибка обслуживания базы данных: {e}")
+                if self._stop_event.wait(max(0, min(next_backup, next_checkpoint) - time.monotonic())):
+                    break
+        finally:
+            connection.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Резервная копия базы данных журнала')
+    parser.add_argument('db_path', help='Путь к файлу базы данных')
+    parser.add_argument('backup_dir', help='Каталог снимков')
+    parser.add_argument('--keep', type=int, default=BACKUP_KEEP, help='Количество хранимых снимков')
+    args = parser.parse_args()
+
+    service = BackupService(args.db_path, args.backup_dir, keep=args.keep)
+    result = service.run_backup()
+    for path in result['removed']:
+        print(f"✓ Удален старый снимок: {path}")
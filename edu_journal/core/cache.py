@@ -0,0 +1,41 @@
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Кэш ограниченного размера с вытеснением давно не использованных записей"""
+
+    def __init__(self, max_size=128):
+        self.max_size = max_size
+        self._items = OrderedDict()
+
+    def get(self, key, default=None):
+        """Получение значения с отметкой об использовании"""
+        if key not in self._items:
+            return default
+        self._items.move_to_end(key)
+        return self._items[key]
+
+    def put(self, key, value):
+        """Добавление значения, самая старая запись вытесняется при переполнении"""
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def invalidate(self, key):
+        """Удаление устаревшего значения"""
+        self._items.pop(key, None)
+
+    def keys(self):
+        """Список ключей без отметки об использовании"""
+        return list(self._items)
+
+    def clear(self):
+        """Очистка кэша"""
+        self._items.clear()
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
@@ -0,0 +1,64 @@
+import sqlite3
+import threading
+
+
+DEFAULT_POLL_INTERVAL = 2.0  # Период опроса базы данных, секунды
+
+
+class ChangeWatcher:
+    """Фоновое отслеживание фиксаций в базе данных через PRAGMA data_version
+
+    Опрос выполняется в отдельном потоке с собственным подключением, поэтому
+    не нагружает поток интерфейса. Функция on_change вызывается из фонового
+    потока только тогда, когда значение data_version изменилось.
+    """
+
+    def __init__(self, db_path, on_change, interval=DEFAULT_POLL_INTERVAL):
+        self.db_path = db_path
+        self.on_change = on_change
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Запуск фонового опроса"""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='ChangeWatcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Остановка фонового опроса"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout=self.interval + 1)
+        self._thread = None
+
+    def is_running(self):
+        """Проверка, выполняется ли опрос"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        """Цикл опроса, выполняется в фоновом потоке"""
+        try:
+            connection = sqlite3.connect(self.db_path)
+        except sqlite3.Error as e:
+            print(f"✗ Наблюдатель изменений не запущен: {e}")
+            return
+
+        try:
+            last_version = connection.execute("PRAGMA data_version").fetchone()[0]
+            while not self._stop_event.wait(self.interval):
+                try:
+                    version = connection.execute("PRAGMA data_version").fetchone()[0]
+                except sqlite3.Error as e:
+                    # База может быть временно заблокирована - повторим на следующем шаге
+                    print(f"Error polling data_version: {e}")
+                    continue
+                if version != last_version:
+                    last_version = version
+                    self.on_change()
+        finally:
+            connection.close()
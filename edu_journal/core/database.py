@@ -0,0 +1,2129 @@
+import sqlite3
+from sqlite3 import Error
+import os
+import re
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+
+from .models import GradeWithDetails, JournalEntry
+from .passwords import verify_password
+
+
+# Текст индикаторов оценки для полнотекстового индекса (подставляется id оценки)
+FTS_INDICATORS_SQL = '''
+(SELECT COALESCE(GROUP_CONCAT(fi.description, '; '), '')
+ FROM grade_indicators gi
+ JOIN fgos_indicators fi ON gi.indicator_id = fi.id
+ WHERE gi.grade_id = {grade_id})
+'''
+
+# Допустимые фильтры для выборок оценок (таблица grades под псевдонимом g)
+GRADE_FILTER_CONDITIONS = {
+    'student_id': 'g.student_id = ?',
+    'teacher_id': 'g.teacher_id = ?',
+    'subject_id': 'g.subject_id = ?',
+    'competency_id': 'g.competency_id = ?',
+    'group_name': 'g.student_id IN (SELECT id FROM users WHERE group_name = ?)',
+    'date_from': 'g.date >= ?',
+    'date_to': 'g.date <= ?',
+}
+
+# Размер порции идентификаторов в условии IN (...)
+ID_CHUNK_SIZE = 500
+
+# Маска выбранных индикаторов оценки (подставляется id оценки); индикатор
+# с номером бита bit_index соответствует биту 1 << bit_index
+INDICATOR_MASK_SQL = '''
+(SELECT COALESCE(SUM(DISTINCT 1 << fi.bit_index), 0)
+ FROM grade_indicators gi
+ JOIN fgos_indicators fi ON gi.indicator_id = fi.id
+ WHERE gi.grade_id = {grade_id})
+'''
+MAX_INDICATOR_BITS = 63  # Маска хранится в 64-битном целом SQLite, бит знака не используется
+
+# Форматы дат, встречавшиеся в старых записях; хранится только ГГГГ-ММ-ДД
+DATE_FORMATS = ['%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%d.%m.%Y', '%Y/%m/%d', '%d/%m/%Y']
+
+# Таблицы со специальностью: хранится только целочисленный specialty_id,
+# код специальности берется из справочника specialties
+SPECIALTY_TABLES = ['users', 'subjects', 'fgos_competencies']
+
+# Таблицы, которым не нужны монотонные id (пересоздаются без AUTOINCREMENT)
+COMPACT_TABLES = ['users', 'subjects', 'fgos_competencies', 'fgos_indicators', 'grades']
+
+# Столбцы пользователя в порядке параметров модели User и источник строк
+# (код специальности подставляется из справочника)
+USER_COLUMNS = 'u.id, u.username, u.password, u.role, u.full_name, sp.code, u.group_name, u.created_at'
+USER_FROM = 'users u LEFT JOIN specialties sp ON u.specialty_id = sp.id'
+
+# Код специальности в параметрах вставки заменяется ее id из справочника
+SPECIALTY_ID_SQL = '(SELECT id FROM specialties WHERE code = ?)'
+
+# Группировка рядов динамики оценок: (ключ ряда, подпись ряда)
+TREND_GROUPS = {
+    'competency': ('g.competency_id', 'fc.code'),
+    'subject': ('g.subject_id', 's.name'),
+    'all': ('0', "'Все оценки'"),
+}
+
+# Порядок выбора оценки для ячейки карты освоения (первая строка в группе)
+MASTERY_ORDER = {
+    'latest': 'g.date DESC, g.id DESC',
+    'best': 'g.grade_value DESC, g.percentage DESC, g.date DESC, g.id DESC',
+}
+
+# Архивы закрытых учебных лет: таблицы и столбцы, переносимые из основного
+# файла (объединяются представлениями {таблица}_all после attach_archives)
+ARCHIVE_COLUMNS = {
+    'grades': 'id, student_id, teacher_id, subject_id, competency_id, grade_value, '
+              'percentage, comment, date, created_at, indicator_mask',
+    'grade_indicators': 'grade_id, indicator_id, score',
+}
+ARCHIVE_SCHEMA = [
+    '''
+    CREATE TABLE grades (
+        id INTEGER PRIMARY KEY,
+        student_id INTEGER NOT NULL,
+        teacher_id INTEGER NOT NULL,
+        subject_id INTEGER NOT NULL,
+        competency_id INTEGER NOT NULL,
+        grade_value INTEGER NOT NULL,
+        percentage INTEGER NOT NULL,
+        comment TEXT NOT NULL,
+        date DATE NOT NULL,
+        created_at TIMESTAMP,
+        indicator_mask INTEGER NOT NULL DEFAULT 0
+    )
+    ''',
+    '''
+    CREATE TABLE grade_indicators (
+        grade_id INTEGER NOT NULL,
+        indicator_id INTEGER NOT NULL,
+        score INTEGER NOT NULL DEFAULT 1,
+        PRIMARY KEY (grade_id, indicator_id)
+    ) WITHOUT ROWID
+    ''',
+    'CREATE INDEX idx_grades_student_date ON grades (student_id, date)',
+]
+
+
+def grade_filter_sql(filters):
+    """Построение условий WHERE по словарю фильтров оценок
+
+    Возвращает строку вида " AND ... AND ..." и список параметров.
+    """
+    conditions = []
+    params = []
+    for key, value in (filters or {}).items():
+        if key not in GRADE_FILTER_CONDITIONS:
+            raise ValueError(f"Неизвестный фильтр оценок: {key}")
+        if value is not None:
+            conditions.append(GRADE_FILTER_CONDITIONS[key])
+            params.append(value)
+    return ''.join(f" AND {condition}" for condition in conditions), params
+
+
+def model_row_factory(model):
+    """Фабрика строк sqlite3, создающая объекты модели по именам столбцов
+
+    Столбцы запроса должны называться как параметры конструктора модели
+    (например, g.id AS grade_id), поэтому порядок столбцов не важен.
+    """
+    description = None
+    names = ()
+
+    def factory(cursor, row):
+        nonlocal description, names
+        if cursor.description is not description:
+            description = cursor.description
+            names = [column[0] for column in description]
+        return model(**dict(zip(names, row)))
+
+    return factory
+
+
+def normalize_date(value):
+    """Приведение даты к строке ГГГГ-ММ-ДД (None, если дата не распознана)
+
+    Принимает объекты date/datetime и строки в форматах DATE_FORMATS.
+    """
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    text = str(value or '').strip()
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def semester_range(year, semester):
+    """Границы семестра учебного года, начинающегося в year
+
+    Первый семестр - с 1 сентября по 31 января, второй - с 1 февраля по
+    31 августа. Возвращает (дата начала, дата окончания) в формате
+    ГГГГ-ММ-ДД для фильтров date_from и date_to.
+    """
+    if semester == 1:
+        return f"{year}-09-01", f"{year + 1}-01-31"
+    if semester == 2:
+        return f"{year + 1}-02-01", f"{year + 1}-08-31"
+    raise ValueError(f"Неверный номер семестра: {semester}")
+
+
+def academic_year_range(year):
+    """Границы учебного года, начинающегося в year (оба семестра)"""
+    return semester_range(year, 1)[0], semester_range(year, 2)[1]
+
+
+def academic_year(value):
+    """Год начала учебного года, к которому относится дата"""
+    day = date.fromisoformat(normalize_date(value) or '')
+    return day.year if day.month >= 9 else day.year - 1
+
+
+def connect_readonly(db_path):
+    """Подключение к базе данных только для чтения (для фоновых потоков и процессов)"""
+    uri = Path(os.path.abspath(db_path)).as_uri() + '?mode=ro'
+    return sqlite3.connect(uri, uri=True)
+
+
+class Database:
+    def __init__(self, db_path=None):
+        if db_path is None:
+            # Указание жесткого пути к базе данных
+            db_path = r'C:\dmitiy\PKOvchinnikova_21IS_4semestr_AlekseevDmitriy\edu_journal\data\edu_journal.db'
+        
+        # Проверяем существование директории и создаем при необходимости
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+            print(f"✓ Создана директория: {db_dir}")
+        
+        print(f"Используется база данных: {os.path.abspath(db_path)}")
+        self.db_path = db_path
+        self.connection = None
+        self.fts_enabled = False
+        self.attached_archives = {}  # Имя схемы подключенного архива по году
+        self.archive_views = False
+        self.data_version = None
+        self.init_database()
+
+    def create_connection(self):
+        """Создание подключения к базе данных"""
+        try:
+            # uri=True нужен для подключения архивов только для чтения;
+            # обычный путь к файлу по-прежнему открывается как есть
+            self.connection = sqlite3.connect(self.db_path, uri=True)
+            # Для нового файла включает освобождение страниц по
+            # incremental_vacuum (см. maintenance); на существующую базу
+            # без полного VACUUM не влияет
+            self.connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            # В режиме WAL чтение не блокирует запись, а резервное копирование
+            # и контрольные точки выполняются фоновым BackupService
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.data_version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+            print(f"✓ Подключение к базе данных установлено")
+            print(f"✓ База данных находится в: {os.path.abspath(self.db_path)}")
+            return self.connection
+        except Error as e:
+            print(f"✗ Ошибка подключения к базе данных: {e}")
+            print(f"Путь: {self.db_path}")
+            return None
+
+    def init_database(self):
+        """Инициализация базы данных с тестовыми данными по ФГОС"""
+        conn = self.create_connection()
+        if conn is not None:
+            try:
+                cursor = conn.cursor()
+                
+                # Создание таблицы пользователей
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT UNIQUE NOT NULL,
+                    password TEXT NOT NULL,
+                    role TEXT NOT NULL CHECK(role IN ('teacher', 'student')),
+                    full_name TEXT NOT NULL,
+                    specialty TEXT,
+                    group_name TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                ''')
+
+                # Создание таблицы предметов
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS subjects (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    code TEXT,
+                    specialty TEXT,
+                    teacher_id INTEGER REFERENCES users(id)
+                )
+                ''')
+
+                # Создание таблицы компетенций ФГОС
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS fgos_competencies (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    code TEXT UNIQUE NOT NULL,
+                    name TEXT NOT NULL,
+                    description TEXT,
+                    specialty TEXT,
+                    type TEXT CHECK(type IN ('ПК', 'ОПК', 'УК'))
+                )
+                ''')
+
+                # Создание таблицы индикаторов освоения (пунктов ФГОС)
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS fgos_indicators (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    competency_id INTEGER NOT NULL,
+                    code TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    weight INTEGER DEFAULT 1,
+                    max_score INTEGER DEFAULT 1,
+                    FOREIGN KEY (competency_id) REFERENCES fgos_competencies(id)
+                )
+                ''')
+
+                # Создание таблицы оценок с привязкой к индикаторам ФГОС
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS grades (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    student_id INTEGER NOT NULL,
+                    teacher_id INTEGER NOT NULL,
+                    subject_id INTEGER NOT NULL,
+                    competency_id INTEGER NOT NULL,
+                    
+                    -- Данные по ФГОС
+                    grade_value INTEGER NOT NULL CHECK(grade_value BETWEEN 2 AND 5),
+                    percentage INTEGER NOT NULL CHECK(percentage BETWEEN 0 AND 100),
+                    comment TEXT NOT NULL CHECK(LENGTH(comment) >= 100),
+                    
+                    -- Системные поля
+                    date DATE NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    
+                    FOREIGN KEY (student_id) REFERENCES users(id),
+                    FOREIGN KEY (teacher_id) REFERENCES users(id),
+                    FOREIGN KEY (subject_id) REFERENCES subjects(id),
+                    FOREIGN KEY (competency_id) REFERENCES fgos_competencies(id)
+                )
+                ''')
+
+                # Таблица для хранения выбранных индикаторов для каждой оценки
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS grade_indicators (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    grade_id INTEGER NOT NULL,
+                    indicator_id INTEGER NOT NULL,
+                    score INTEGER NOT NULL DEFAULT 1,
+                    FOREIGN KEY (grade_id) REFERENCES grades(id),
+                    FOREIGN KEY (indicator_id) REFERENCES fgos_indicators(id)
+                )
+                ''')
+
+                # Применение миграций схемы (индексы, триггеры, служебные таблицы)
+                self.migrate_database(cursor)
+
+                # Добавление тестовых пользователей
+                cursor.execute("SELECT COUNT(*) FROM users")
+                if cursor.fetchone()[0] == 0:
+                    print("Добавление тестовых пользователей...")
+                    test_users = [
+                        ('teacher1', '123456', 'teacher', 'Иванов Иван Иванович', '15.02.01', 'Преподаватель'),
+                        ('student1', '123456', 'student', 'Петров Петр Петрович', '15.02.01', 'Группа 101'),
+                        ('student2', '123456', 'student', 'Сидорова Анна Сергеевна', '15.02.01', 'Группа 101'),
+                        ('student3', '123456', 'student', 'Козлова Елена Владимировна', '15.02.01', 'Группа 102'),
+                        ('student4', '123456', 'student', 'Николаев Андрей Сергеевич', '15.02.01', 'Группа 102'),
+                    ]
+                    self._add_specialties(cursor, {user[4] for user in test_users})
+                    cursor.executemany(
+                        "INSERT INTO users (username, password, role, full_name, specialty_id, group_name) "
+                        f"VALUES (?, ?, ?, ?, {SPECIALTY_ID_SQL}, ?)",
+                        test_users
+                    )
+
+                # Добавление тестовых предметов
+                cursor.execute("SELECT COUNT(*) FROM subjects")
+                if cursor.fetchone()[0] == 0:
+                    print("Добавление тестовых предметов...")
+                    test_subjects = [
+                        ('Математика', 'МАТ-101', '15.02.01', 1),
+                        ('Программирование', 'ПРОГ-102', '15.02.01', 1),
+                        ('Базы данных', 'БД-103', '15.02.01', 1),
+                        ('Электротехника', 'ЭЛ-104', '15.02.01', 1),
+                        ('Автоматизация процессов', 'АП-105', '15.02.01', 1),
+                        ('Техническая механика', 'ТМ-106', '15.02.01', 1),
+                        ('Информационные технологии', 'ИТ-107', '15.02.01', 1),
+                    ]
+                    self._add_specialties(cursor, {subject[2] for subject in test_subjects})
+                    cursor.executemany(
+                        f"INSERT INTO subjects (name, code, specialty_id, teacher_id) VALUES (?, ?, {SPECIALTY_ID_SQL}, ?)",
+                        test_subjects
+                    )
+
+                # Добавление компетенций ФГОС для специальности 15.02.01 (Автоматизация технологических процессов)
+                cursor.execute("SELECT COUNT(*) FROM fgos_competencies")
+                if cursor.fetchone()[0] == 0:
+                    print("Добавление компетенций ФГОС...")
+                    competencies = [
+                        # Профессиональные компетенции (ПК)
+                        ('ПК 1.1', 'Выполнять наладку, регулировку и проверку электрического и электромеханического оборудования', 
+                         'Наладка и регулировка оборудования', '15.02.01', 'ПК'),
+                        ('ПК 1.2', 'Осуществлять диагностирование и техническое обслуживание электрооборудования', 
+                         'Диагностика и обслуживание', '15.02.01', 'ПК'),
+                        ('ПК 1.3', 'Производить монтаж и демонтаж электрооборудования', 
+                         'Монтаж и демонтаж', '15.02.01', 'ПК'),
+                        ('ПК 1.4', 'Выполнять ремонт электрических машин и аппаратов', 
+                         'Ремонт оборудования', '15.02.01', 'ПК'),
+                        ('ПК 2.1', 'Разрабатывать и оформлять конструкторскую и технологическую документацию', 
+                         'Разработка документации', '15.02.01', 'ПК'),
+                        ('ПК 2.2', 'Выполнять расчеты и конструирование деталей и узлов электрооборудования', 
+                         'Расчеты и конструирование', '15.02.01', 'ПК'),
+                        ('ПК 2.3', 'Проектировать системы автоматизации', 
+                         'Проектирование систем', '15.02.01', 'ПК'),
+                        ('ПК 3.1', 'Контролировать и анализировать функционирование параметров оборудования', 
+                         'Контроль параметров', '15.02.01', 'ПК'),
+                        ('ПК 3.2', 'Настраивать и программировать контроллеры', 
+                         'Настройка контроллеров', '15.02.01', 'ПК'),
+                        ('ПК 3.3', 'Эксплуатировать системы автоматического управления', 
+                         'Эксплуатация систем', '15.02.01', 'ПК'),
+                        ('ПК 4.1', 'Обеспечивать безопасность труда при эксплуатации электрооборудования', 
+                         'Безопасность труда', '15.02.01', 'ПК'),
+                        
+                        # Общепрофессиональные компетенции (ОПК)
+                        ('ОПК 1.1', 'Понимать сущность и социальную значимость своей будущей профессии', 
+                         'Понимание профессии', '15.02.01', 'ОПК'),
+                        ('ОПК 1.2', 'Проявлять к ней устойчивый интерес', 
+                         'Интерес к профессии', '15.02.01', 'ОПК'),
+                        ('ОПК 2.1', 'Организовывать собственную деятельность', 
+                         'Организация деятельности', '15.02.01', 'ОПК'),
+                        ('ОПК 2.2', 'Выбирать типовые методы и способы выполнения задач', 
+                         'Выбор методов', '15.02.01', 'ОПК'),
+                        ('ОПК 3.1', 'Работать в коллективе и команде', 
+                         'Работа в команде', '15.02.01', 'ОПК'),
+                        ('ОПК 3.2', 'Эффективно общаться с коллегами', 
+                         'Эффективное общение', '15.02.01', 'ОПК'),
+                        ('ОПК 4.1', 'Осуществлять поиск и использование информации', 
+                         'Работа с информацией', '15.02.01', 'ОПК'),
+                        ('ОПК 4.2', 'Оценивать информацию критически', 
+                         'Критическое мышление', '15.02.01', 'ОПК'),
+                        ('ОПК 5.1', 'Использовать информационно-коммуникационные технологии', 
+                         'ИКТ компетенции', '15.02.01', 'ОПК'),
+                        
+                        # Универсальные компетенции (УК)
+                        ('УК 1.1', 'Понимать и анализировать мировоззренческие проблемы', 
+                         'Мировоззрение', '15.02.01', 'УК'),
+                        ('УК 1.2', 'Ориентироваться в системе духовных ценностей', 
+                         'Ценностные ориентиры', '15.02.01', 'УК'),
+                        ('УК 2.1', 'Использовать современные коммуникативные технологии', 
+                         'Коммуникативные технологии', '15.02.01', 'УК'),
+                        ('УК 2.2', 'Работать с различными источниками информации', 
+                         'Работа с источниками', '15.02.01', 'УК'),
+                        ('УК 3.1', 'Самостоятельно определять задачи профессионального развития', 
+                         'Профессиональное развитие', '15.02.01', 'УК'),
+                        ('УК 3.2', 'Осуществлять планирование своего развития', 
+                         'Планирование развития', '15.02.01', 'УК'),
+                        ('УК 4.1', 'Применять знания в нестандартных ситуациях', 
+                         'Креативное мышление', '15.02.01', 'УК'),
+                        ('УК 4.2', 'Находить нестандартные решения проблем', 
+                         'Решение проблем', '15.02.01', 'УК'),
+                    ]
+                    self._add_specialties(cursor, {competency[3] for competency in competencies})
+                    cursor.executemany(
+                        "INSERT INTO fgos_competencies (code, name, description, specialty_id, type) "
+                        f"VALUES (?, ?, ?, {SPECIALTY_ID_SQL}, ?)",
+                        competencies
+                    )
+
+                # Добавление индикаторов освоения для каждой компетенции
+                cursor.execute("SELECT COUNT(*) FROM fgos_indicators")
+                if cursor.fetchone()[0] == 0:
+                    print("Добавление индикаторов ФГОС...")
+                    
+                    # Получаем ID компетенций
+                    cursor.execute("SELECT id, code FROM fgos_competencies")
+                    competencies_dict = {row[1]: row[0] for row in cursor.fetchall()}
+                    
+                    indicators = [
+                        # Индикаторы для ПК 1.1 (8 пунктов)
+                        (competencies_dict['ПК 1.1'], 'ПК 1.1.1', 'Выполнил наладку оборудования согласно инструкции', 1, 1),
+                        (competencies_dict['ПК 1.1'], 'ПК 1.1.2', 'Произвел регулировку параметров в заданных пределах', 1, 1),
+                        (competencies_dict['ПК 1.1'], 'ПК 1.1.3', 'Проверил работоспособность после наладки', 1, 1),
+                        (competencies_dict['ПК 1.1'], 'ПК 1.1.4', 'Выявил и устранил неисправности', 2, 1),
+                        (competencies_dict['ПК 1.1'], 'ПК 1.1.5', 'Документировал результаты наладки', 1, 1),
+                        (competencies_dict['ПК 1.1'], 'ПК 1.1.6', 'Соблюл технику безопасности при работе с оборудованием', 2, 1),
+                        (competencies_dict['ПК 1.1'], 'ПК 1.1.7', 'Применил инструменты и приборы контроля', 1, 1),
+                        (competencies_dict['ПК 1.1'], 'ПК 1.1.8', 'Проанализировал причины неисправностей', 2, 1),
+                        
+                        # Индикаторы для ПК 1.2 (8 пунктов)
+                        (competencies_dict['ПК 1.2'], 'ПК 1.2.1', 'Провел диагностику оборудования', 1, 1),
+                        (competencies_dict['ПК 1.2'], 'ПК 1.2.2', 'Выполнил техническое обслуживание по плану', 1, 1),
+                        (competencies_dict['ПК 1.2'], 'ПК 1.2.3', 'Определил изношенные детали', 1, 1),
+                        (competencies_dict['ПК 1.2'], 'ПК 1.2.4', 'Составил отчет о техническом состоянии', 2, 1),
+                        (competencies_dict['ПК 1.2'], 'ПК 1.2.5', 'Произвел замену изношенных деталей', 2, 1),
+                        (competencies_dict['ПК 1.2'], 'ПК 1.2.6', 'Выполнил профилактические работы', 1, 1),
+                        (competencies_dict['ПК 1.2'], 'ПК 1.2.7', 'Применил диагностическое оборудование', 1, 1),
+                        (competencies_dict['ПК 1.2'], 'ПК 1.2.8', 'Оценил ресурс оборудования после обслуживания', 2, 1),
+                        
+                        # Индикаторы для ПК 1.3 (6 пунктов)
+                        (competencies_dict['ПК 1.3'], 'ПК 1.3.1', 'Выполнил монтаж электрооборудования', 1, 1),
+                        (competencies_dict['ПК 1.3'], 'ПК 1.3.2', 'Произвел демонтаж оборудования', 1, 1),
+                        (competencies_dict['ПК 1.3'], 'ПК 1.3.3', 'Соблюл технологическую последовательность', 2, 1),
+                        (competencies_dict['ПК 1.3'], 'ПК 1.3.4', 'Использовал специальный инструмент', 1, 1),
+                        (competencies_dict['ПК 1.3'], 'ПК 1.3.5', 'Проверил качество монтажа', 2, 1),
+                        (competencies_dict['ПК 1.3'], 'ПК 1.3.6', 'Составил акт выполненных работ', 1, 1),
+                        
+                        # Индикаторы для ПК 1.4 (6 пунктов)
+                        (competencies_dict['ПК 1.4'], 'ПК 1.4.1', 'Диагностировал неисправность', 1, 1),
+                        (competencies_dict['ПК 1.4'], 'ПК 1.4.2', 'Разобрал оборудование для ремонта', 1, 1),
+                        (competencies_dict['ПК 1.4'], 'ПК 1.4.3', 'Заменил неисправные компоненты', 2, 1),
+                        (competencies_dict['ПК 1.4'], 'ПК 1.4.4', 'Собрал оборудование после ремонта', 1, 1),
+                        (competencies_dict['ПК 1.4'], 'ПК 1.4.5', 'Протестировал работоспособность', 2, 1),
+                        (competencies_dict['ПК 1.4'], 'ПК 1.4.6', 'Оформил ремонтную документацию', 1, 1),
+                        
+                        # Индикаторы для ПК 2.1 (8 пунктов)
+                        (competencies_dict['ПК 2.1'], 'ПК 2.1.1', 'Разработал чертеж детали', 1, 1),
+                        (competencies_dict['ПК 2.1'], 'ПК 2.1.2', 'Оформил технологическую карту', 1, 1),
+                        (competencies_dict['ПК 2.1'], 'ПК 2.1.3', 'Соблюл требования ЕСКД', 2, 1),
+                        (competencies_dict['ПК 2.1'], 'ПК 2.1.4', 'Применил стандарты оформления', 1, 1),
+                        (competencies_dict['ПК 2.1'], 'ПК 2.1.5', 'Рассчитал технологические параметры', 2, 1),
+                        (competencies_dict['ПК 2.1'], 'ПК 2.1.6', 'Выполнил спецификацию материалов', 1, 1),
+                        (competencies_dict['ПК 2.1'], 'ПК 2.1.7', 'Разработал сборочный чертеж', 2, 1),
+                        (competencies_dict['ПК 2.1'], 'ПК 2.1.8', 'Применил средства автоматизированного проектирования', 2, 1),
+                        
+                        # Индикаторы для ПК 2.2 (8 пунктов)
+                        (competencies_dict['ПК 2.2'], 'ПК 2.2.1', 'Выполнил расчеты прочности деталей', 2, 1),
+                        (competencies_dict['ПК 2.2'], 'ПК 2.2.2', 'Спроектировал узел электрооборудования', 2, 1),
+                        (competencies_dict['ПК 2.2'], 'ПК 2.2.3', 'Подобрал материалы для конструкции', 1, 1),
+                        (competencies_dict['ПК 2.2'], 'ПК 2.2.4', 'Рассчитал электрические параметры', 2, 1),
+                        (competencies_dict['ПК 2.2'], 'ПК 2.2.5', 'Разработал компоновку оборудования', 1, 1),
+                        (competencies_dict['ПК 2.2'], 'ПК 2.2.6', 'Выполнил проверку расчетов', 1, 1),
+                        (competencies_dict['ПК 2.2'], 'ПК 2.2.7', 'Оптимизировал конструкцию по массе', 2, 1),
+                        (competencies_dict['ПК 2.2'], 'ПК 2.2.8', 'Учел требования эргономики', 1, 1),
+                        
+                        # Индикаторы для ПК 2.3 (6 пунктов)
+                        (competencies_dict['ПК 2.3'], 'ПК 2.3.1', 'Проанализировал требования к системе', 1, 1),
+                        (competencies_dict['ПК 2.3'], 'ПК 2.3.2', 'Разработал структурную схему', 2, 1),
+                        (competencies_dict['ПК 2.3'], 'ПК 2.3.3', 'Выбрал компоненты системы', 1, 1),
+                        (competencies_dict['ПК 2.3'], 'ПК 2.3.4', 'Спроектировал алгоритм управления', 2, 1),
+                        (competencies_dict['ПК 2.3'], 'ПК 2.3.5', 'Рассчитал параметры системы', 2, 1),
+                        (competencies_dict['ПК 2.3'], 'ПК 2.3.6', 'Оформил проектную документацию', 1, 1),
+                        
+                        # Индикаторы для ПК 3.1 (8 пунктов)
+                        (competencies_dict['ПК 3.1'], 'ПК 3.1.1', 'Контролировал параметры оборудования', 1, 1),
+                        (competencies_dict['ПК 3.1'], 'ПК 3.1.2', 'Анализировал функционирование систем', 2, 1),
+                        (competencies_dict['ПК 3.1'], 'ПК 3.1.3', 'Выявил отклонения от нормативных значений', 2, 1),
+                        (competencies_dict['ПК 3.1'], 'ПК 3.1.4', 'Составил отчет по контролю', 1, 1),
+                        (competencies_dict['ПК 3.1'], 'ПК 3.1.5', 'Применил средства автоматического контроля', 2, 1),
+                        (competencies_dict['ПК 3.1'], 'ПК 3.1.6', 'Проанализировал тренды параметров', 2, 1),
+                        (competencies_dict['ПК 3.1'], 'ПК 3.1.7', 'Разработал рекомендации по оптимизации', 2, 1),
+                        (competencies_dict['ПК 3.1'], 'ПК 3.1.8', 'Оценил эффективность работы оборудования', 2, 1),
+                        
+                        # Индикаторы для ПК 3.2 (6 пунктов)
+                        (competencies_dict['ПК 3.2'], 'ПК 3.2.1', 'Изучил инструкцию контроллера', 1, 1),
+                        (competencies_dict['ПК 3.2'], 'ПК 3.2.2', 'Настроил параметры контроллера', 2, 1),
+                        (competencies_dict['ПК 3.2'], 'ПК 3.2.3', 'Написал программу управления', 2, 1),
+                        (competencies_dict['ПК 3.2'], 'ПК 3.2.4', 'Протестировал программу', 2, 1),
+                        (competencies_dict['ПК 3.2'], 'ПК 3.2.5', 'Отладил систему управления', 2, 1),
+                        (competencies_dict['ПК 3.2'], 'ПК 3.2.6', 'Документировал настройки', 1, 1),
+                        
+                        # Индикаторы для ПК 3.3 (6 пунктов)
+                        (competencies_dict['ПК 3.3'], 'ПК 3.3.1', 'Изучил руководство по эксплуатации', 1, 1),
+                        (competencies_dict['ПК 3.3'], 'ПК 3.3.2', 'Запустил систему автоматизации', 1, 1),
+                        (competencies_dict['ПК 3.3'], 'ПК 3.3.3', 'Контролировал работу системы', 2, 1),
+                        (competencies_dict['ПК 3.3'], 'ПК 3.3.4', 'Реагировал на аварийные ситуации', 2, 1),
+                        (competencies_dict['ПК 3.3'], 'ПК 3.3.5', 'Вел журнал эксплуатации', 1, 1),
+                        (competencies_dict['ПК 3.3'], 'ПК 3.3.6', 'Провел плановое обслуживание', 2, 1),
+                        
+                        # Индикаторы для ПК 4.1 (6 пунктов)
+                        (competencies_dict['ПК 4.1'], 'ПК 4.1.1', 'Изучил правила безопасности', 1, 1),
+                        (competencies_dict['ПК 4.1'], 'ПК 4.1.2', 'Применил средства индивидуальной защиты', 1, 1),
+                        (competencies_dict['ПК 4.1'], 'ПК 4.1.3', 'Обеспечил безопасные условия работы', 2, 1),
+                        (competencies_dict['ПК 4.1'], 'ПК 4.1.4', 'Провел инструктаж по безопасности', 2, 1),
+                        (competencies_dict['ПК 4.1'], 'ПК 4.1.5', 'Контролировал соблюдение правил', 2, 1),
+                        (competencies_dict['ПК 4.1'], 'ПК 4.1.6', 'Оформил документацию по безопасности', 1, 1),
+                        
+                        # Индикаторы для ОПК 1.1 (6 пунктов)
+                        (competencies_dict['ОПК 1.1'], 'ОПК 1.1.1', 'Объяснил социальную значимость профессии', 1, 1),
+                        (competencies_dict['ОПК 1.1'], 'ОПК 1.1.2', 'Описал профессиональные обязанности', 1, 1),
+                        (competencies_dict['ОПК 1.1'], 'ОПК 1.1.3', 'Определил перспективы развития профессии', 2, 1),
+                        (competencies_dict['ОПК 1.1'], 'ОПК 1.1.4', 'Проанализировал требования к специалисту', 1, 1),
+                        (competencies_dict['ОПК 1.1'], 'ОПК 1.1.5', 'Оценил свою готовность к профессии', 2, 1),
+                        (competencies_dict['ОПК 1.1'], 'ОПК 1.1.6', 'Представил профессию в современном контексте', 2, 1),
+                        
+                        # Индикаторы для ОПК 1.2 (6 пунктов)
+                        (competencies_dict['ОПК 1.2'], 'ОПК 1.2.1', 'Проявил интерес к профессии', 1, 1),
+                        (competencies_dict['ОПК 1.2'], 'ОПК 1.2.2', 'Изучал дополнительную литературу', 1, 1),
+                        (competencies_dict['ОПК 1.2'], 'ОПК 1.2.3', 'Посещал профильные мероприятия', 2, 1),
+                        (competencies_dict['ОПК 1.2'], 'ОПК 1.2.4', 'Общался с профессионалами', 2, 1),
+                        (competencies_dict['ОПК 1.2'], 'ОПК 1.2.5', 'Следил за новостями отрасли', 1, 1),
+                        (competencies_dict['ОПК 1.2'], 'ОПК 1.2.6', 'Участвовал в профессиональных обсуждениях', 2, 1),
+                        
+                        # Индикаторы для ОПК 2.1 (6 пунктов)
+                        (competencies_dict['ОПК 2.1'], 'ОПК 2.1.1', 'Составил план работы', 1, 1),
+                        (competencies_dict['ОПК 2.1'], 'ОПК 2.1.2', 'Распределил время эффективно', 1, 1),
+                        (competencies_dict['ОПК 2.1'], 'ОПК 2.1.3', 'Выполнил работу в срок', 2, 1),
+                        (competencies_dict['ОПК 2.1'], 'ОПК 2.1.4', 'Проанализировал результаты', 1, 1),
+                        (competencies_dict['ОПК 2.1'], 'ОПК 2.1.5', 'Скорректировал план при необходимости', 2, 1),
+                        (competencies_dict['ОПК 2.1'], 'ОПК 2.1.6', 'Оценил эффективность организации', 2, 1),
+                        
+                        # Индикаторы для ОПК 2.2 (6 пунктов)
+                        (competencies_dict['ОПК 2.2'], 'ОПК 2.2.1', 'Выбрал метод решения задачи', 1, 1),
+                        (competencies_dict['ОПК 2.2'], 'ОПК 2.2.2', 'Сравнил альтернативные методы', 2, 1),
+                        (competencies_dict['ОПК 2.2'], 'ОПК 2.2.3', 'Обосновал выбор метода', 2, 1),
+                        (competencies_dict['ОПК 2.2'], 'ОПК 2.2.4', 'Применил метод на практике', 2, 1),
+                        (competencies_dict['ОПК 2.2'], 'ОПК 2.2.5', 'Оценил эффективность метода', 2, 1),
+                        (competencies_dict['ОПК 2.2'], 'ОПК 2.2.6', 'Адаптировал метод к условиям задачи', 2, 1),
+                        
+                        # Индикаторы для ОПК 3.1 (6 пунктов)
+                        (competencies_dict['ОПК 3.1'], 'ОПК 3.1.1', 'Участвовал в обсуждении задачи', 1, 1),
+                        (competencies_dict['ОПК 3.1'], 'ОПК 3.1.2', 'Выполнил свою часть работы', 1, 1),
+                        (competencies_dict['ОПК 3.1'], 'ОПК 3.1.3', 'Помог другим членам команды', 2, 1),
+                        (competencies_dict['ОПК 3.1'], 'ОПК 3.1.4', 'Представил результаты команды', 1, 1),
+                        (competencies_dict['ОПК 3.1'], 'ОПК 3.1.5', 'Разрешил конфликтные ситуации', 2, 1),
+                        (competencies_dict['ОПК 3.1'], 'ОПК 3.1.6', 'Проявил лидерские качества', 2, 1),
+                        
+                        # Индикаторы для ОПК 3.2 (6 пунктов)
+                        (competencies_dict['ОПК 3.2'], 'ОПК 3.2.1', 'Ясно выражал мысли', 1, 1),
+                        (competencies_dict['ОПК 3.2'], 'ОПК 3.2.2', 'Слушал и понимал других', 1, 1),
+                        (competencies_dict['ОПК 3.2'], 'ОПК 3.2.3', 'Задавал уточняющие вопросы', 1, 1),
+                        (competencies_dict['ОПК 3.2'], 'ОПК 3.2.4', 'Давал конструктивную обратную связь', 2, 1),
+                        (competencies_dict['ОПК 3.2'], 'ОПК 3.2.5', 'Использовал профессиональную терминологию', 2, 1),
+                        (competencies_dict['ОПК 3.2'], 'ОПК 3.2.6', 'Адаптировал стиль общения к ситуации', 2, 1),
+                        
+                        # Индикаторы для ОПК 4.1 (6 пунктов)
+                        (competencies_dict['ОПК 4.1'], 'ОПК 4.1.1', 'Нашел необходимую информацию', 1, 1),
+                        (competencies_dict['ОПК 4.1'], 'ОПК 4.1.2', 'Проанализировал источники информации', 1, 1),
+                        (competencies_dict['ОПК 4.1'], 'ОПК 4.1.3', 'Применил информацию для решения задачи', 2, 1),
+                        (competencies_dict['ОПК 4.1'], 'ОПК 4.1.4', 'Оценил достоверность информации', 2, 1),
+                        (competencies_dict['ОПК 4.1'], 'ОПК 4.1.5', 'Систематизировал полученные данные', 1, 1),
+                        (competencies_dict['ОПК 4.1'], 'ОПК 4.1.6', 'Представил информацию в структурированном виде', 1, 1),
+                        
+                        # Индикаторы для ОПК 4.2 (6 пунктов)
+                        (competencies_dict['ОПК 4.2'], 'ОПК 4.2.1', 'Выявил противоречия в информации', 2, 1),
+                        (competencies_dict['ОПК 4.2'], 'ОПК 4.2.2', 'Проверил факты', 1, 1),
+                        (competencies_dict['ОПК 4.2'], 'ОПК 4.2.3', 'Сравнил разные точки зрения', 2, 1),
+                        (competencies_dict['ОПК 4.2'], 'ОПК 4.2.4', 'Выявил предвзятость источников', 2, 1),
+                        (competencies_dict['ОПК 4.2'], 'ОПК 4.2.5', 'Сформировал собственную оценку', 2, 1),
+                        (competencies_dict['ОПК 4.2'], 'ОПК 4.2.6', 'Обосновал свою позицию', 2, 1),
+                        
+                        # Индикаторы для ОПК 5.1 (6 пунктов)
+                        (competencies_dict['ОПК 5.1'], 'ОПК 5.1.1', 'Использовал компьютер для работы', 1, 1),
+                        (competencies_dict['ОПК 5.1'], 'ОПК 5.1.2', 'Применил специализированное ПО', 2, 1),
+                        (competencies_dict['ОПК 5.1'], 'ОПК 5.1.3', 'Работал с офисными программами', 1, 1),
+                        (competencies_dict['ОПК 5.1'], 'ОПК 5.1.4', 'Использовал интернет-ресурсы', 1, 1),
+                        (competencies_dict['ОПК 5.1'], 'ОПК 5.1.5', 'Создал презентацию', 2, 1),
+                        (competencies_dict['ОПК 5.1'], 'ОПК 5.1.6', 'Организовал данные в цифровом виде', 1, 1),
+                        
+                        # Индикаторы для УК 1.1 (6 пунктов)
+                        (competencies_dict['УК 1.1'], 'УК 1.1.1', 'Проанализировал мировоззренческие проблемы', 2, 1),
+                        (competencies_dict['УК 1.1'], 'УК 1.1.2', 'Сформулировал собственную позицию', 2, 1),
+                        (competencies_dict['УК 1.1'], 'УК 1.1.3', 'Рассмотрел проблему с разных точек зрения', 1, 1),
+                        (competencies_dict['УК 1.1'], 'УК 1.1.4', 'Применил философские знания', 1, 1),
+                        (competencies_dict['УК 1.1'], 'УК 1.1.5', 'Обосновал свою позицию', 2, 1),
+                        (competencies_dict['УК 1.1'], 'УК 1.1.6', 'Уважил мнение других', 1, 1),
+                        
+                        # Индикаторы для УК 1.2 (6 пунктов)
+                        (competencies_dict['УК 1.2'], 'УК 1.2.1', 'Определил свои ценности', 1, 1),
+                        (competencies_dict['УК 1.2'], 'УК 1.2.2', 'Соотнес ценности с профессиональной этикой', 2, 1),
+                        (competencies_dict['УК 1.2'], 'УК 1.2.3', 'Проявил толерантность', 1, 1),
+                        (competencies_dict['УК 1.2'], 'УК 1.2.4', 'Соблюл моральные нормы', 2, 1),
+                        (competencies_dict['УК 1.2'], 'УК 1.2.5', 'Принял ответственное решение', 2, 1),
+                        (competencies_dict['УК 1.2'], 'УК 1.2.6', 'Объяснил свою позицию с точки зрения ценностей', 2, 1),
+                        
+                        # Индикаторы для УК 2.1 (6 пунктов)
+                        (competencies_dict['УК 2.1'], 'УК 2.1.1', 'Использовал коммуникативные технологии', 1, 1),
+                        (competencies_dict['УК 2.1'], 'УК 2.1.2', 'Создал презентацию', 1, 1),
+                        (competencies_dict['УК 2.1'], 'УК 2.1.3', 'Провел онлайн-конференцию', 2, 1),
+                        (competencies_dict['УК 2.1'], 'УК 2.1.4', 'Использовал облачные технологии', 2, 1),
+                        (competencies_dict['УК 2.1'], 'УК 2.1.5', 'Применил средства совместной работы', 1, 1),
+                        (competencies_dict['УК 2.1'], 'УК 2.1.6', 'Оценил эффективность технологий', 2, 1),
+                        
+                        # Индикаторы для УК 2.2 (6 пунктов)
+                        (competencies_dict['УК 2.2'], 'УК 2.2.1', 'Нашел информацию в библиотеке', 1, 1),
+                        (competencies_dict['УК 2.2'], 'УК 2.2.2', 'Использовал базы данных', 2, 1),
+                        (competencies_dict['УК 2.2'], 'УК 2.2.3', 'Работал с научной литература', 2, 1),
+                        (competencies_dict['УК 2.2'], 'УК 2.2.4', 'Применил справочные материалы', 1, 1),
+                        (competencies_dict['УК 2.2'], 'УК 2.2.5', 'Сравнил разные источники', 2, 1),
+                        (competencies_dict['УК 2.2'], 'УК 2.2.6', 'Систематизировал найденную информацию', 1, 1),
+                        
+                        # Индикаторы для УК 3.1 (6 пунктов)
+                        (competencies_dict['УК 3.1'], 'УК 3.1.1', 'Определил цели развития', 1, 1),
+                        (competencies_dict['УК 3.1'], 'УК 3.1.2', 'Составил план самообразования', 1, 1),
+                        (competencies_dict['УК 3.1'], 'УК 3.1.3', 'Изучил дополнительную литературу', 2, 1),
+                        (competencies_dict['УК 3.1'], 'УК 3.1.4', 'Применил новые знания на практике', 2, 1),
+                        (competencies_dict['УК 3.1'], 'УК 3.1.5', 'Проанализировал результаты развития', 2, 1),
+                        (competencies_dict['УК 3.1'], 'УК 3.1.6', 'Скорректировал план развития', 2, 1),
+                        
+                        # Индикаторы для УК 3.2 (6 пунктов)
+                        (competencies_dict['УК 3.2'], 'УК 3.2.1', 'Разработал долгосрочный план', 2, 1),
+                        (competencies_dict['УК 3.2'], 'УК 3.2.2', 'Определил этапы развития', 1, 1),
+                        (competencies_dict['УК 3.2'], 'УК 3.2.3', 'Установил критерии успеха', 2, 1),
+                        (competencies_dict['УК 3.2'], 'УК 3.2.4', 'Распределил ресурсы', 2, 1),
+                        (competencies_dict['УК 3.2'], 'УК 3.2.5', 'Контролировал выполнение плана', 2, 1),
+                        (competencies_dict['УК 3.2'], 'УК 3.2.6', 'Оценил достигнутые результаты', 2, 1),
+                        
+                        # Индикаторы для УК 4.1 (6 пунктов)
+                        (competencies_dict['УК 4.1'], 'УК 4.1.1', 'Распознал нестандартную ситуацию', 2, 1),
+                        (competencies_dict['УК 4.1'], 'УК 4.1.2', 'Адаптировал знания к новой ситуации', 2, 1),
+                        (competencies_dict['УК 4.1'], 'УК 4.1.3', 'Проявил гибкость мышления', 2, 1),
+                        (competencies_dict['УК 4.1'], 'УК 4.1.4', 'Использовал знания из разных областей', 2, 1),
+                        (competencies_dict['УК 4.1'], 'УК 4.1.5', 'Нашел аналогии', 1, 1),
+                        (competencies_dict['УК 4.1'], 'УК 4.1.6', 'Дал нестандартное решение', 2, 1),
+                        
+                        # Индикаторы для УК 4.2 (6 пунктов)
+                        (competencies_dict['УК 4.2'], 'УК 4.2.1', 'Выявил суть проблемы', 2, 1),
+                        (competencies_dict['УК 4.2'], 'УК 4.2.2', 'Рассмотрел альтернативные решения', 2, 1),
+                        (competencies_dict['УК 4.2'], 'УК 4.2.3', 'Оценил риски и преимущества', 2, 1),
+                        (competencies_dict['УК 4.2'], 'УК 4.2.4', 'Выбрал оптимальное решение', 2, 1),
+                        (competencies_dict['УК 4.2'], 'УК 4.2.5', 'Разработал план реализации', 2, 1),
+                        (competencies_dict['УК 4.2'], 'УК 4.2.6', 'Оценил результаты решения', 2, 1),
+                    ]
+                    
+                    cursor.executemany(
+                        "INSERT INTO fgos_indicators (competency_id, code, description, weight, max_score) VALUES (?, ?, ?, ?, ?)",
+                        indicators
+                    )
+                    print(f"✓ Добавлено {len(indicators)} индикаторов освоения")
+
+                # Добавление тестовых оценок
+                cursor.execute("SELECT COUNT(*) FROM grades")
+                if cursor.fetchone()[0] == 0:
+                    print("Добавление тестовых оценок...")
+                    
+                    # Получаем ID для тестовых данных
+                    cursor.execute("SELECT id FROM users WHERE username = 'student1'")
+                    student1_id = cursor.fetchone()[0]
+                    
+                    cursor.execute("SELECT id FROM users WHERE username = 'student2'")
+                    student2_id = cursor.fetchone()[0]
+                    
+                    cursor.execute("SELECT id FROM subjects WHERE name = 'Математика'")
+                    math_subject_id = cursor.fetchone()[0]
+                    
+                    cursor.execute("SELECT id FROM subjects WHERE name = 'Программирование'")
+                    prog_subject_id = cursor.fetchone()[0]
+                    
+                    cursor.execute("SELECT id FROM fgos_competencies WHERE code = 'ПК 2.2'")
+                    pk_2_2_id = cursor.fetchone()[0]
+                    
+                    cursor.execute("SELECT id FROM fgos_competencies WHERE code = 'ОПК 3.1'")
+                    opk_3_1_id = cursor.fetchone()[0]
+                    
+                    cursor.execute("SELECT id FROM fgos_competencies WHERE code = 'УК 3.1'")
+                    uk_3_1_id = cursor.fetchone()[0]
+                    
+                    # Добавляем несколько оценок
+                    test_grades = [
+                        # Оценка по математике для студента 1
+                        (student1_id, 1, math_subject_id, pk_2_2_id, 5, 88, 
+                         'Студент отлично освоил компетенцию ПК 2.2 "Выполнять расчеты и конструирование деталей". Выполнил все расчеты прочности, спроектировал узел электрооборудования, правильно подобрал материалы. Показал умение работать с чертежами и спецификациями. Проявил творческий подход при оптимизации конструкции.',
+                         '2024-02-15'),
+                         
+                        # Оценка по программированию для студента 1
+                        (student1_id, 1, prog_subject_id, opk_3_1_id, 4, 75,
+                         'Студент хорошо освоил компетенцию ОПК 3.1 "Работать в коллективе и команде". Активно участвовал в командных проектах, помогал коллегам, проявлял лидерские качества при организации работы группы. Нуждается в развитии навыков разрешения конфликтных ситуаций.',
+                         '2024-02-20'),
+                         
+                        # Оценка по программированию для студента 2
+                        (student2_id, 1, prog_subject_id, uk_3_1_id, 3, 58,
+                         'Студент освоил базовый уровень компетенции УК 3.1 "Самостоятельно определять задачи профессионального развития". Определил цели развития, составил план самообразования, но недостаточно применяет новые знания на практике. Рекомендуется больше практических заданий.',
+                         '2024-02-18'),
+                    ]
+                    
+                    for grade_data in test_grades:
+                        cursor.execute(
+                            """INSERT INTO grades 
+                            (student_id, teacher_id, subject_id, competency_id, grade_value, percentage, comment, date) 
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                            grade_data
+                        )
+                        
+                        grade_id = cursor.lastrowid
+                        
+                        # Для каждой оценки добавляем соответствующие индикаторы
+                        if grade_data[3] == pk_2_2_id:  # ПК 2.2 - добавляем 6 индикаторов
+                            cursor.execute("SELECT id FROM fgos_indicators WHERE code LIKE 'ПК 2.2.%' LIMIT 6")
+                            indicator_ids = [row[0] for row in cursor.fetchall()]
+                        elif grade_data[3] == opk_3_1_id:  # ОПК 3.1 - добавляем 4 индикатора
+                            cursor.execute("SELECT id FROM fgos_indicators WHERE code LIKE 'ОПК 3.1.%' LIMIT 4")
+                            indicator_ids = [row[0] for row in cursor.fetchall()]
+                        else:  # УК 3.1 - добавляем 3 индикатора
+                            cursor.execute("SELECT id FROM fgos_indicators WHERE code LIKE 'УК 3.1.%' LIMIT 3")
+                            indicator_ids = [row[0] for row in cursor.fetchall()]
+                        
+                        for indicator_id in indicator_ids:
+                            cursor.execute(
+                                "INSERT INTO grade_indicators (grade_id, indicator_id, score) VALUES (?, ?, ?)",
+                                (grade_id, indicator_id, 1)
+                            )
+
+                conn.commit()
+                print("✓ База данных инициализирована успешно")
+
+            except Error as e:
+                print(f"✗ Ошибка инициализации базы данных: {e}")
+                import traceback
+                traceback.print_exc()
+            finally:
+                cursor.close()
+        else:
+            print("✗ Не удалось подключиться к базе данных")
+
+    def migrate_database(self, cursor):
+        """Применение миграций схемы, номер версии хранится в PRAGMA user_version"""
+        cursor.execute("PRAGMA user_version")
+        version = cursor.fetchone()[0]
+
+        for target_version, migration in enumerate(self.MIGRATIONS, start=1):
+            if version < target_version:
+                migration(self, cursor)
+                cursor.execute(f"PRAGMA user_version = {target_version}")
+                print(f"✓ Применена миграция схемы №{target_version}: {migration.__doc__}")
+
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'grades_fts'")
+        self.fts_enabled = cursor.fetchone() is not None
+
+    def _migrate_fulltext_search(self, cursor):
+        """полнотекстовый индекс FTS5 по комментариям и индикаторам"""
+        try:
+            cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS grades_fts USING fts5(
+                comment, indicators, tokenize = 'unicode61'
+            )
+            ''')
+        except Error as e:
+            # Сборка SQLite без FTS5: поиск будет работать через LIKE
+            print(f"✗ FTS5 недоступен, используется поиск через LIKE: {e}")
+            return
+
+        # Синхронизация индекса с таблицей оценок
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS grades_fts_insert AFTER INSERT ON grades
+        BEGIN
+            INSERT INTO grades_fts (rowid, comment, indicators)
+            VALUES (new.id, new.comment, ''' + FTS_INDICATORS_SQL.format(grade_id='new.id') + ''');
+        END
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS grades_fts_delete AFTER DELETE ON grades
+        BEGIN
+            DELETE FROM grades_fts WHERE rowid = old.id;
+        END
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS grades_fts_update AFTER UPDATE OF comment ON grades
+        BEGIN
+            UPDATE grades_fts SET comment = new.comment WHERE rowid = new.id;
+        END
+        ''')
+
+        # Синхронизация индекса с выбранными индикаторами и их описаниями
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS grade_indicators_fts_insert AFTER INSERT ON grade_indicators
+        BEGIN
+            UPDATE grades_fts SET indicators = ''' + FTS_INDICATORS_SQL.format(grade_id='new.grade_id') + '''
+            WHERE rowid = new.grade_id;
+        END
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS grade_indicators_fts_delete AFTER DELETE ON grade_indicators
+        BEGIN
+            UPDATE grades_fts SET indicators = ''' + FTS_INDICATORS_SQL.format(grade_id='old.grade_id') + '''
+            WHERE rowid = old.grade_id;
+        END
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS fgos_indicators_fts_update AFTER UPDATE OF description ON fgos_indicators
+        BEGIN
+            UPDATE grades_fts SET indicators = ''' + FTS_INDICATORS_SQL.format(grade_id='grades_fts.rowid') + '''
+            WHERE rowid IN (SELECT grade_id FROM grade_indicators WHERE indicator_id = new.id);
+        END
+        ''')
+
+        # Индексация уже существующих оценок
+        cursor.execute("DELETE FROM grades_fts")
+        cursor.execute('''
+        INSERT INTO grades_fts (rowid, comment, indicators)
+        SELECT g.id, g.comment, ''' + FTS_INDICATORS_SQL.format(grade_id='g.id') + '''
+        FROM grades g
+        ''')
+
+    def _migrate_change_tracking(self, cursor):
+        """журнал изменений оценок для инкрементального обновления"""
+        # Для каждой оценки хранится только последнее изменение: REPLACE удаляет
+        # старую запись, а AUTOINCREMENT гарантирует возрастание номера изменения
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS grade_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            grade_id INTEGER NOT NULL UNIQUE
+        )
+        ''')
+
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS grades_track_insert AFTER INSERT ON grades
+        BEGIN
+            REPLACE INTO grade_changes (grade_id) VALUES (new.id);
+        END
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS grades_track_update AFTER UPDATE ON grades
+        BEGIN
+            REPLACE INTO grade_changes (grade_id) VALUES (new.id);
+        END
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS grades_track_delete AFTER DELETE ON grades
+        BEGIN
+            REPLACE INTO grade_changes (grade_id) VALUES (old.id);
+        END
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS grade_indicators_track_insert AFTER INSERT ON grade_indicators
+        BEGIN
+            REPLACE INTO grade_changes (grade_id) VALUES (new.grade_id);
+        END
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS grade_indicators_track_delete AFTER DELETE ON grade_indicators
+        BEGIN
+            REPLACE INTO grade_changes (grade_id) VALUES (old.grade_id);
+        END
+        ''')
+
+    def _migrate_grade_indicators_index(self, cursor):
+        """индекс индикаторов по оценке для триггеров и выборок деталей"""
+        # Без индекса каждый триггер полнотекстового индекса просматривает
+        # всю таблицу grade_indicators
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_grade_indicators_grade
+        ON grade_indicators (grade_id)
+        ''')
+
+    def _migrate_mastery_indexes(self, cursor):
+        """индексы для карты освоения компетенций группой"""
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_users_group
+        ON users (group_name)
+        ''')
+        # Оценки студента уже упорядочены по компетенциям, поэтому оконная
+        # функция карты освоения обходится без отдельной сортировки
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_grades_student_competency
+        ON grades (student_id, competency_id)
+        ''')
+
+    def _migrate_indicator_bitmask(self, cursor):
+        """битовые маски выбранных индикаторов оценок"""
+        # Номер бита индикатора внутри компетенции: существующие индикаторы
+        # нумеруются по коду, новые получают следующий свободный номер
+        cursor.execute("ALTER TABLE fgos_indicators ADD COLUMN bit_index INTEGER")
+        cursor.execute('''
+        UPDATE fgos_indicators SET bit_index = (
+            SELECT COUNT(*) FROM fgos_indicators other
+            WHERE other.competency_id = fgos_indicators.competency_id
+              AND (other.code < fgos_indicators.code
+                   OR (other.code = fgos_indicators.code AND other.id < fgos_indicators.id))
+        )
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS fgos_indicators_bit_insert AFTER INSERT ON fgos_indicators
+        WHEN new.bit_index IS NULL
+        BEGIN
+            UPDATE fgos_indicators SET bit_index = (
+                SELECT COALESCE(MAX(bit_index), -1) + 1 FROM fgos_indicators
+                WHERE competency_id = new.competency_id AND id != new.id
+            )
+            WHERE id = new.id;
+        END
+        ''')
+
+        cursor.execute("ALTER TABLE grades ADD COLUMN indicator_mask INTEGER NOT NULL DEFAULT 0")
+        cursor.execute("UPDATE grades SET indicator_mask = " + INDICATOR_MASK_SQL.format(grade_id='grades.id'))
+
+        # Синхронизация маски с таблицей grade_indicators
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS grade_indicators_mask_insert AFTER INSERT ON grade_indicators
+        BEGIN
+            UPDATE grades SET indicator_mask = indicator_mask | (
+                SELECT 1 << bit_index FROM fgos_indicators WHERE id = new.indicator_id
+            )
+            WHERE id = new.grade_id;
+        END
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS grade_indicators_mask_delete AFTER DELETE ON grade_indicators
+        BEGIN
+            UPDATE grades SET indicator_mask = ''' + INDICATOR_MASK_SQL.format(grade_id='old.grade_id') + '''
+            WHERE id = old.grade_id;
+        END
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS grade_indicators_mask_update
+        AFTER UPDATE OF grade_id, indicator_id ON grade_indicators
+        BEGIN
+            UPDATE grades SET indicator_mask = ''' + INDICATOR_MASK_SQL.format(grade_id='grades.id') + '''
+            WHERE id IN (old.grade_id, new.grade_id);
+        END
+        ''')
+        # Индикаторы, записанные раньше самой оценки (пакетная вставка без маски)
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS grades_mask_insert AFTER INSERT ON grades
+        WHEN new.indicator_mask = 0
+             AND EXISTS (SELECT 1 FROM grade_indicators WHERE grade_id = new.id)
+        BEGIN
+            UPDATE grades SET indicator_mask = ''' + INDICATOR_MASK_SQL.format(grade_id='new.id') + '''
+            WHERE id = new.id;
+        END
+        ''')
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_grades_competency
+        ON grades (competency_id)
+        ''')
+
+    def _migrate_trend_index(self, cursor):
+        """индекс оценок студента по дате для рядов динамики"""
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_grades_student_date
+        ON grades (student_id, date)
+        ''')
+
+    def _migrate_specialty_keys(self, cursor):
+        """справочник специальностей и целочисленные ключи специальности"""
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS specialties (
+            id INTEGER PRIMARY KEY,
+            code TEXT UNIQUE NOT NULL
+        )
+        ''')
+        for table in SPECIALTY_TABLES:
+            cursor.execute(f"INSERT OR IGNORE INTO specialties (code) SELECT DISTINCT specialty FROM {table} "
+                           f"WHERE specialty IS NOT NULL ORDER BY specialty")
+        for table in SPECIALTY_TABLES:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN specialty_id INTEGER REFERENCES specialties(id)")
+            cursor.execute(f'''
+            UPDATE {table} SET specialty_id = (SELECT id FROM specialties WHERE code = {table}.specialty)
+            ''')
+
+            # Ключ заполняется по текстовому коду при вставке и изменении строки.
+            # OR IGNORE внутри триггера заменяется режимом внешней команды,
+            # поэтому существующий код проверяется явно. Вставка с готовым
+            # specialty_id без текстового кода ключ не сбрасывает
+            for event in ('INSERT', 'UPDATE OF specialty'):
+                trigger = f"{table}_specialty_{event.split()[0].lower()}"
+                condition = 'WHEN new.specialty IS NOT NULL' if event == 'INSERT' else ''
+                cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {trigger} AFTER {event} ON {table} {condition}
+                BEGIN
+                    INSERT INTO specialties (code)
+                    SELECT new.specialty WHERE new.specialty IS NOT NULL
+                      AND NOT EXISTS (SELECT 1 FROM specialties WHERE code = new.specialty);
+                    UPDATE {table}
+                    SET specialty_id = (SELECT id FROM specialties WHERE code = new.specialty)
+                    WHERE rowid = new.rowid;
+                END
+                ''')
+
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_subjects_specialty
+        ON subjects (specialty_id)
+        ''')
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_fgos_competencies_specialty
+        ON fgos_competencies (specialty_id, type, code)
+        ''')
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_users_specialty
+        ON users (specialty_id)
+        ''')
+
+    @staticmethod
+    def _add_specialties(cursor, codes):
+        """Добавление в справочник отсутствующих кодов специальностей"""
+        cursor.executemany("INSERT OR IGNORE INTO specialties (code) VALUES (?)",
+                           [(code,) for code in sorted(code for code in codes if code)])
+
+    def _migrate_iso_dates(self, cursor):
+        """даты оценок в формате ГГГГ-ММ-ДД и индексы диапазонов дат"""
+        # Даты в других форматах переводятся в ГГГГ-ММ-ДД; нераспознанные
+        # заменяются датой создания записи
+        cursor.execute("SELECT id, date, created_at FROM grades WHERE date IS NOT date(date, '+0 days')")
+        for grade_id, value, created_at in cursor.fetchall():
+            normalized = normalize_date(value) or normalize_date(str(created_at)[:10]) or date.today().isoformat()
+            cursor.execute("UPDATE grades SET date = ? WHERE id = ?", (normalized, grade_id))
+            print(f"✗ Дата оценки {grade_id} {value!r} заменена на {normalized}")
+
+        # date() возвращает NULL для нераспознанной строки, а модификатор
+        # переносит несуществующий день (2024-02-30 -> 2024-03-01), поэтому
+        # совпадение с исходной строкой проверяет и формат, и саму дату
+        for event in ('INSERT', 'UPDATE OF date'):
+            cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS grades_date_{event.split()[0].lower()} BEFORE {event} ON grades
+            WHEN new.date IS NOT date(new.date, '+0 days')
+            BEGIN
+                SELECT RAISE(ABORT, 'Дата оценки должна быть в формате ГГГГ-ММ-ДД');
+            END
+            ''')
+
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_grades_teacher_date
+        ON grades (teacher_id, date)
+        ''')
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_grades_date
+        ON grades (date)
+        ''')
+
+    def _rebuild_table(self, cursor, table, create_sql, select_sql=None, skip_indexes=()):
+        """Пересоздание таблицы с новым определением и сохранением данных
+
+        create_sql - CREATE TABLE для временного имени {table}_new,
+        select_sql - запрос строк для новой таблицы (по умолчанию все
+        столбцы старой). Индексы и триггеры таблицы, кроме skip_indexes,
+        создаются заново.
+        """
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL",
+            (table,)
+        )
+        dependents = [sql for name, sql in cursor.fetchall() if name not in skip_indexes]
+
+        cursor.execute(create_sql)
+        cursor.execute(f"INSERT INTO {table}_new {select_sql or f'SELECT * FROM {table}'}")
+        cursor.execute(f"DROP TABLE {table}")
+        # Триггеры других таблиц ссылаются на удаленную таблицу, поэтому
+        # переименование выполняется без проверки схемы
+        cursor.execute("PRAGMA legacy_alter_table = ON")
+        cursor.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+        cursor.execute("PRAGMA legacy_alter_table = OFF")
+        for sql in dependents:
+            cursor.execute(sql)
+
+    def _migrate_compact_storage(self, cursor):
+        """компактное хранение: ключи без AUTOINCREMENT, индикаторы оценок WITHOUT ROWID"""
+        # AUTOINCREMENT остается только у журнала изменений: номер изменения
+        # обязан возрастать, даже если удалена запись с наибольшим номером
+        for table in COMPACT_TABLES:
+            cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+            create_sql = cursor.fetchone()[0]
+            create_sql = re.sub(r'\s+AUTOINCREMENT', '', create_sql, flags=re.IGNORECASE)
+            create_sql = re.sub(rf'^CREATE TABLE( IF NOT EXISTS)?\s+"?{table}"?', f'CREATE TABLE {table}_new', create_sql)
+            self._rebuild_table(cursor, table, create_sql)
+
+        # Естественный ключ (оценка, индикатор) вместо суррогатного id;
+        # отдельный индекс по grade_id становится префиксом первичного ключа
+        self._rebuild_table(cursor, 'grade_indicators', '''
+        CREATE TABLE grade_indicators_new (
+            grade_id INTEGER NOT NULL,
+            indicator_id INTEGER NOT NULL,
+            score INTEGER NOT NULL DEFAULT 1,
+            PRIMARY KEY (grade_id, indicator_id),
+            FOREIGN KEY (grade_id) REFERENCES grades(id),
+            FOREIGN KEY (indicator_id) REFERENCES fgos_indicators(id)
+        ) WITHOUT ROWID
+        ''', '''
+        SELECT grade_id, indicator_id, MAX(score) FROM grade_indicators
+        GROUP BY grade_id, indicator_id
+        ''', skip_indexes=('idx_grade_indicators_grade',))
+
+        cursor.execute(
+            f"DELETE FROM sqlite_sequence WHERE name IN ({', '.join('?' * len(COMPACT_TABLES))}, 'grade_indicators')",
+            COMPACT_TABLES
+        )
+
+    def _migrate_drop_specialty_text(self, cursor):
+        """удаление текстовых кодов специальности, код берется из справочника"""
+        # Ключи заполнены триггерами миграции №7, которые удаляются вместе
+        # с текстовыми столбцами
+        for table in SPECIALTY_TABLES:
+            cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+            create_sql = re.sub(r'\s*\bspecialty TEXT,', '', cursor.fetchone()[0])
+            create_sql = re.sub(rf'^CREATE TABLE( IF NOT EXISTS)?\s+"?{table}"?', f'CREATE TABLE {table}_new', create_sql)
+            cursor.execute(f"PRAGMA table_info({table})")
+            columns = ', '.join(row[1] for row in cursor.fetchall() if row[1] != 'specialty')
+            self._rebuild_table(cursor, table, create_sql, f"SELECT {columns} FROM {table}",
+                                skip_indexes=(f"{table}_specialty_insert", f"{table}_specialty_update"))
+
+    def _migrate_archive_registry(self, cursor):
+        """реестр архивов закрытых учебных лет"""
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS archives (
+            year INTEGER PRIMARY KEY,
+            path TEXT NOT NULL,
+            grades INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''')
+
+    def _migrate_grade_indicators_cascade(self, cursor):
+        """каскадное удаление индикаторов вместе с оценкой"""
+        # PRAGMA foreign_keys не включается: пакетная вставка пишет индикаторы
+        # раньше оценок, поэтому ON DELETE CASCADE заменен триггером
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS grades_cascade_delete AFTER DELETE ON grades
+        BEGIN
+            DELETE FROM grade_indicators WHERE grade_id = old.id;
+        END
+        ''')
+        cursor.execute("DELETE FROM grade_indicators WHERE grade_id NOT IN (SELECT id FROM grades)")
+        if cursor.rowcount:
+            print(f"✓ Удалено индикаторов удаленных оценок: {cursor.rowcount}")
+
+    def _migrate_indicator_bit_limit(self, cursor):
+        """ограничение номеров битов индикаторов размером маски"""
+        # 1 << 63 в SQLite дает отрицательное число, а в Python не помещается в
+        # INTEGER, поэтому номер бита (в том числе выданный триггером
+        # fgos_indicators_bit_insert, который обновляет bit_index) проверяется
+        # до записи
+        cursor.execute("SELECT competency_id, COUNT(*) FROM fgos_indicators WHERE bit_index >= ? GROUP BY competency_id",
+                       (MAX_INDICATOR_BITS,))
+        for competency_id, count in cursor.fetchall():
+            print(f"✗ Компетенция {competency_id}: {count} индикаторов сверх {MAX_INDICATOR_BITS} не входят в маски оценок")
+        for event in ('INSERT', 'UPDATE OF bit_index'):
+            cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS fgos_indicators_bit_limit_{event.split()[0].lower()}
+            BEFORE {event} ON fgos_indicators
+            WHEN new.bit_index NOT BETWEEN 0 AND {MAX_INDICATOR_BITS - 1}
+            BEGIN
+                SELECT RAISE(ABORT, 'В компетенции не может быть больше {MAX_INDICATOR_BITS} индикаторов');
+            END
+            ''')
+
+    # Миграции применяются по порядку, номер версии равен позиции в списке
+    MIGRATIONS = [
+        _migrate_fulltext_search,
+        _migrate_change_tracking,
+        _migrate_grade_indicators_index,
+        _migrate_mastery_indexes,
+        _migrate_indicator_bitmask,
+        _migrate_trend_index,
+        _migrate_specialty_keys,
+        _migrate_iso_dates,
+        _migrate_compact_storage,
+        _migrate_archive_registry,
+        _migrate_grade_indicators_cascade,
+        _migrate_drop_specialty_text,
+        _migrate_indicator_bit_limit,
+    ]
+
+    def execute_query(self, query, params=()):
+        """Выполнение SQL-запроса (INSERT, UPDATE, DELETE)"""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(query, params)
+            self.connection.commit()
+            return cursor
+        except Error as e:
+            print(f"Error executing query: {e}")
+            return None
+
+    def execute_select(self, query, params=()):
+        """Выполнение SELECT запроса (без коммита)"""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(query, params)
+            return cursor
+        except Error as e:
+            print(f"Error executing select: {e}")
+            return None
+
+    def fetch_all(self, query, params=()):
+        """Получение всех результатов запроса"""
+        cursor = self.execute_select(query, params)
+        if cursor:
+            return cursor.fetchall()
+        return []
+
+    def fetch_models(self, model, query, params=()):
+        """Получение результатов запроса в виде объектов модели"""
+        try:
+            cursor = self.connection.cursor()
+            cursor.row_factory = model_row_factory(model)
+            cursor.execute(query, params)
+            return cursor.fetchall()
+        except Error as e:
+            print(f"Error executing select: {e}")
+            return []
+
+    def fetch_one(self, query, params=()):
+        """Получение одного результата запроса"""
+        cursor = self.execute_select(query, params)
+        if cursor:
+            return cursor.fetchone()
+        return None
+
+    @contextmanager
+    def read_transaction(self):
+        """Согласованное чтение несколькими запросами в одной транзакции"""
+        own_transaction = not self.connection.in_transaction
+        if own_transaction:
+            self.connection.execute("BEGIN")
+        try:
+            yield self.connection
+        finally:
+            if own_transaction:
+                self.connection.commit()
+
+    def authenticate(self, username, password, role):
+        """Проверка логина, пароля и роли пользователя
+
+        Возвращает строку пользователя или None.
+        """
+        user_data = self.fetch_one(f"SELECT {USER_COLUMNS} FROM {USER_FROM} WHERE u.username = ? AND u.role = ?",
+                                   (username, role))
+        if user_data and verify_password(password, user_data[2]):
+            return user_data
+        return None
+
+    def get_user_passwords(self, usernames):
+        """Сохраненные пароли (хэши) существующих логинов {логин: пароль}"""
+        return dict(self._fetch_for_ids("SELECT username, password FROM users WHERE username IN ({ids})", (), usernames))
+
+    def upsert_users(self, users, update_credentials=False):
+        """Добавление или обновление пользователей одной транзакцией
+
+        users - последовательность кортежей (username, password, role,
+        full_name, код специальности, group_name); у существующих логинов
+        обновляются ФИО, специальность и группа, а пароль и роль - только при
+        update_credentials, чтобы повторный импорт списка не сбрасывал
+        измененные пароли. Новые коды специальностей добавляются в
+        справочник. При ошибке транзакция откатывается и исключение
+        передается дальше.
+        """
+        users = list(users)
+        credentials = 'password = excluded.password, role = excluded.role,' if update_credentials else ''
+        query = f"""
+        INSERT INTO users (username, password, role, full_name, specialty_id, group_name)
+        VALUES (?, ?, ?, ?, {SPECIALTY_ID_SQL}, ?)
+        ON CONFLICT(username) DO UPDATE SET {credentials}
+            full_name = excluded.full_name,
+            specialty_id = excluded.specialty_id,
+            group_name = excluded.group_name
+        """
+        try:
+            cursor = self.connection.cursor()
+            self._add_specialties(cursor, {user[4] for user in users})
+            cursor.executemany(query, users)
+            self.connection.commit()
+        except Error:
+            self.connection.rollback()
+            raise
+
+    def get_competencies_by_subject(self, subject_id):
+        """Получение компетенций для предмета"""
+        query = """
+        SELECT fc.id, fc.code, fc.name, fc.type
+        FROM subjects s
+        JOIN fgos_competencies fc ON fc.specialty_id = s.specialty_id
+        WHERE s.id = ?
+        ORDER BY fc.type, fc.code
+        """
+        return self.fetch_all(query, (subject_id,))
+
+    def get_indicators_by_competency(self, competency_id):
+        """Получение индикаторов для компетенции"""
+        query = """
+        SELECT id, code, description, weight, max_score
+        FROM fgos_indicators
+        WHERE competency_id = ?
+        ORDER BY code
+        """
+        return self.fetch_all(query, (competency_id,))
+
+    def add_grade_with_indicators(self, grade_data, selected_indicators):
+        """Добавление оценки с выбранными индикаторами"""
+        try:
+            cursor = self.connection.cursor()
+            
+            # Вставляем оценку
+            cursor.execute(
+                """INSERT INTO grades 
+                (student_id, teacher_id, subject_id, competency_id, grade_value, percentage, comment, date) 
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (grade_data['student_id'], grade_data['teacher_id'], grade_data['subject_id'],
+                 grade_data['competency_id'], grade_data['grade_value'], grade_data['percentage'],
+                 grade_data['comment'], normalize_date(grade_data['date']) or grade_data['date'])
+            )
+            
+            grade_id = cursor.lastrowid
+            
+            # Вставляем выбранные индикаторы
+            for indicator_id in selected_indicators:
+                cursor.execute(
+                    "INSERT INTO grade_indicators (grade_id, indicator_id, score) VALUES (?, ?, ?)",
+                    (grade_id, indicator_id, 1)
+                )
+            
+            self.connection.commit()
+            return True
+        except Error as e:
+            print(f"Error adding grade with indicators: {e}")
+            return False
+
+    def add_grades_bulk(self, grades, commit=True):
+        """Пакетное добавление оценок с индикаторами одной транзакцией
+
+        grades - список пар (кортеж student_id, teacher_id, subject_id,
+        competency_id, grade_value, percentage, comment, date; список id
+        индикаторов). Идентификаторы оценок выделяются заранее после MAX(id)
+        под блокировкой BEGIN IMMEDIATE, поэтому индикаторы и оценки пишутся
+        двумя вызовами executemany. При commit=False транзакция откатывается
+        (пробный прогон). При ошибке транзакция откатывается и исключение
+        передается дальше. Возвращает список id оценок.
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM grades")
+            last_id = cursor.fetchone()[0]
+
+            # Индикаторы записываются раньше оценок: тогда триггер вставки оценки
+            # индексирует их текст один раз, а не обновляет индекс на каждый индикатор
+            grade_ids = list(range(last_id + 1, last_id + 1 + len(grades)))
+            cursor.executemany(
+                "INSERT INTO grade_indicators (grade_id, indicator_id, score) VALUES (?, ?, 1)",
+                [(grade_id, indicator_id)
+                 for grade_id, (_, indicator_ids) in zip(grade_ids, grades)
+                 for indicator_id in dict.fromkeys(indicator_ids)]
+            )
+            # Маска индикаторов считается заранее, чтобы триггер не обновлял
+            # каждую только что вставленную оценку
+            cursor.execute("SELECT id, bit_index FROM fgos_indicators")
+            bits = {indicator_id: 1 << bit_index for indicator_id, bit_index in cursor.fetchall()}
+            cursor.executemany(
+                """INSERT INTO grades
+                (id, student_id, teacher_id, subject_id, competency_id, grade_value, percentage, comment, date,
+                 indicator_mask)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                [(grade_id,) + tuple(grade) + (sum({bits.get(indicator_id, 0) for indicator_id in indicator_ids}),)
+                 for grade_id, (grade, indicator_ids) in zip(grade_ids, grades)]
+            )
+        except Error:
+            self.connection.rollback()
+            raise
+        if commit:
+            self.connection.commit()
+        else:
+            self.connection.rollback()
+        return grade_ids
+
+    def _fetch(self, query, params, model=None):
+        """Выборка кортежами или, если передана модель, объектами модели"""
+        if model is None:
+            return self.fetch_all(query, params)
+        return self.fetch_models(model, query, params)
+
+    def _fetch_for_ids(self, query, params, ids, model=None):
+        """Выполнение запроса с условием IN ({ids}) порциями по ID_CHUNK_SIZE"""
+        ids = list(ids)
+        rows = []
+        for start in range(0, len(ids), ID_CHUNK_SIZE):
+            chunk = ids[start:start + ID_CHUNK_SIZE]
+            placeholders = ', '.join('?' * len(chunk))
+            rows.extend(self._fetch(query.format(ids=placeholders), tuple(params) + tuple(chunk), model))
+        return rows
+
+    def get_student_grades_with_details(self, student_id, grade_ids=None, as_models=False):
+        """Получение оценок студента с деталями по ФГОС
+
+        Если передан grade_ids, возвращаются только оценки из этого списка.
+        При as_models=True строки возвращаются объектами GradeWithDetails,
+        иначе кортежами (id, предмет, код компетенции, название компетенции,
+        оценка, процент, комментарий, дата, преподаватель, индикаторы, тип
+        компетенции).
+        """
+        model = GradeWithDetails if as_models else None
+        query = """
+        SELECT g.id as grade_id, s.name as subject_name, fc.code as competency_code,
+               fc.name as competency_name, g.grade_value, g.percentage, g.comment, g.date,
+               u.full_name as teacher_name,
+               COALESCE(GROUP_CONCAT(fi.description, '; '), '') as indicators,
+               fc.type as competency_type
+        FROM grades g
+        JOIN subjects s ON g.subject_id = s.id
+        JOIN fgos_competencies fc ON g.competency_id = fc.id
+        JOIN users u ON g.teacher_id = u.id
+        LEFT JOIN grade_indicators gi ON g.id = gi.grade_id
+        LEFT JOIN fgos_indicators fi ON gi.indicator_id = fi.id
+        WHERE g.student_id = ?{ids_condition}
+        GROUP BY g.id
+        ORDER BY g.date DESC
+        """
+        if grade_ids is None:
+            return self._fetch(query.format(ids_condition=''), (student_id,), model)
+        query = query.format(ids_condition=' AND g.id IN ({ids})')
+        return self._fetch_for_ids(query, (student_id,), grade_ids, model)
+
+    def get_teacher_journal(self, teacher_id, grade_ids=None, as_models=False):
+        """Получение журнала оценок преподавателя с индикаторами
+
+        Если передан grade_ids, возвращаются только оценки из этого списка.
+        При as_models=True строки возвращаются объектами JournalEntry.
+        """
+        model = JournalEntry if as_models else None
+        query = """
+        SELECT g.id as grade_id, u.full_name as student_name, s.name as subject_name,
+               fc.code as competency_code, g.grade_value, g.comment, g.date, g.percentage,
+               COALESCE(GROUP_CONCAT(fi.description, '; '), '') as indicators
+        FROM grades g
+        JOIN users u ON g.student_id = u.id
+        JOIN subjects s ON g.subject_id = s.id
+        JOIN fgos_competencies fc ON g.competency_id = fc.id
+        LEFT JOIN grade_indicators gi ON g.id = gi.grade_id
+        LEFT JOIN fgos_indicators fi ON gi.indicator_id = fi.id
+        WHERE g.teacher_id = ?{ids_condition}
+        GROUP BY g.id
+        ORDER BY g.date DESC
+        """
+        if grade_ids is None:
+            return self._fetch(query.format(ids_condition=''), (teacher_id,), model)
+        query = query.format(ids_condition=' AND g.id IN ({ids})')
+        return self._fetch_for_ids(query, (teacher_id,), grade_ids, model)
+
+    def get_grade_details(self, grade_ids):
+        """Получение полной информации о нескольких оценках одним запросом
+
+        Возвращает словарь {id оценки: (данные оценки, список индикаторов)}.
+        Данные оценки: (id, предмет, код компетенции, название компетенции,
+        описание компетенции, тип компетенции, оценка, процент, комментарий,
+        дата, преподаватель); индикатор: (код, описание, вес).
+        """
+        query = """
+        SELECT g.id, s.name, fc.code, fc.name, fc.description, fc.type,
+               g.grade_value, g.percentage, g.comment, g.date, u.full_name,
+               fi.code, fi.description, fi.weight
+        FROM grades g
+        JOIN subjects s ON g.subject_id = s.id
+        JOIN fgos_competencies fc ON g.competency_id = fc.id
+        JOIN users u ON g.teacher_id = u.id
+        LEFT JOIN grade_indicators gi ON g.id = gi.grade_id
+        LEFT JOIN fgos_indicators fi ON gi.indicator_id = fi.id
+        WHERE g.id IN ({ids})
+        ORDER BY g.id, fi.code
+        """
+        details = {}
+        for row in self._fetch_for_ids(query, (), grade_ids):
+            grade_info, indicator = row[:11], row[11:]
+            if row[0] not in details:
+                details[row[0]] = (grade_info, [])
+            if indicator[0] is not None:
+                details[row[0]][1].append(indicator)
+        return details
+
+    def get_teacher_bootstrap(self, teacher_id, as_models=False):
+        """Получение всех данных окна преподавателя одним согласованным снимком
+
+        Возвращает словарь с ключами:
+        change_seq - точка синхронизации журнала;
+        students - [(id, ФИО)];
+        subjects - [(id, название)];
+        competencies - {id предмета: [(id, код, название, тип)]};
+        indicators - {id компетенции: [(id, код, описание, вес, макс. балл)]};
+        journal - строки журнала в формате get_teacher_journal (as_models
+        передается в get_teacher_journal).
+        """
+        subjects_condition = "s.teacher_id = ? OR s.teacher_id IS NULL"
+        with self.read_transaction():
+            change_seq = self.get_change_seq()
+            students = self.fetch_all(
+                "SELECT id, full_name FROM users WHERE role = 'student' ORDER BY full_name"
+            )
+            subjects = self.fetch_all(
+                f"SELECT s.id, s.name FROM subjects s WHERE {subjects_condition} ORDER BY s.name",
+                (teacher_id,)
+            )
+            competency_rows = self.fetch_all(f"""
+                SELECT s.id, fc.id, fc.code, fc.name, fc.type
+                FROM subjects s
+                JOIN fgos_competencies fc ON fc.specialty_id = s.specialty_id
+                WHERE {subjects_condition}
+                ORDER BY s.id, fc.type, fc.code
+                """, (teacher_id,))
+            indicator_rows = self.fetch_all(f"""
+                SELECT fi.competency_id, fi.id, fi.code, fi.description, fi.weight, fi.max_score
+                FROM fgos_indicators fi
+                WHERE fi.competency_id IN (
+                    SELECT fc.id
+                    FROM subjects s
+                    JOIN fgos_competencies fc ON fc.specialty_id = s.specialty_id
+                    WHERE {subjects_condition}
+                )
+                ORDER BY fi.competency_id, fi.code
+                """, (teacher_id,))
+            journal = self.get_teacher_journal(teacher_id, as_models=as_models)
+
+        competencies = {subject_id: [] for subject_id, _ in subjects}
+        for subject_id, *competency in competency_rows:
+            competencies[subject_id].append(tuple(competency))
+
+        indicators = {}
+        for competency_id, *indicator in indicator_rows:
+            indicators.setdefault(competency_id, []).append(tuple(indicator))
+
+        return {
+            'change_seq': change_seq,
+            'students': students,
+            'subjects': subjects,
+            'competencies': competencies,
+            'indicators': indicators,
+            'journal': journal,
+        }
+
+    def get_change_seq(self):
+        """Получение номера последнего изменения оценок (точка синхронизации)"""
+        result = self.fetch_one("SELECT COALESCE(MAX(seq), 0) FROM grade_changes")
+        return result[0] if result else 0
+
+    def has_external_changes(self):
+        """Проверка, фиксировали ли другие подключения изменения с прошлой проверки
+
+        PRAGMA data_version не меняется от фиксаций собственного подключения,
+        поэтому собственные изменения не считаются внешними.
+        """
+        result = self.fetch_one("PRAGMA data_version")
+        if not result:
+            return False
+        changed = result[0] != self.data_version
+        self.data_version = result[0]
+        return changed
+
+    def get_grade_changes(self, since_seq):
+        """Получение оценок, измененных после точки синхронизации
+
+        Возвращает кортеж (новая точка синхронизации, список id оценок).
+        Оценка из списка, отсутствующая в выборке, была удалена.
+        """
+        rows = self.fetch_all(
+            "SELECT seq, grade_id FROM grade_changes WHERE seq > ? ORDER BY seq",
+            (since_seq,)
+        )
+        if not rows:
+            return since_seq, []
+        return rows[-1][0], [grade_id for _, grade_id in rows]
+
+    GRADE_FACTS_QUERY = """
+    SELECT g.id, g.student_id, g.competency_id, g.subject_id, g.teacher_id,
+           g.grade_value, g.percentage, g.date,
+           (SELECT COUNT(*) FROM grade_indicators gi WHERE gi.grade_id = g.id),
+           g.indicator_mask
+    FROM grades g
+    {condition}
+    ORDER BY g.id
+    """
+
+    def iter_grade_facts(self, chunk_size=ID_CHUNK_SIZE):
+        """Потоковое чтение числовых полей всех оценок для аналитики
+
+        Строки: (id, student_id, competency_id, subject_id, teacher_id,
+        оценка, процент, дата, количество выбранных индикаторов, маска
+        индикаторов).
+        """
+        cursor = self.connection.cursor()
+        cursor.execute(self.GRADE_FACTS_QUERY.format(condition=''))
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield from rows
+
+    def get_grade_facts(self, grade_ids):
+        """Числовые поля оценок из списка (формат iter_grade_facts)"""
+        return self._fetch_for_ids(self.GRADE_FACTS_QUERY.format(condition='WHERE g.id IN ({ids})'), (), grade_ids)
+
+    def get_indicator_bits(self, competency_id):
+        """Индикаторы компетенции с номерами битов в маске оценки
+
+        Возвращает [(id, код, описание, номер бита)] в порядке битов.
+        """
+        query = """
+        SELECT id, code, description, bit_index
+        FROM fgos_indicators
+        WHERE competency_id = ?
+        ORDER BY bit_index
+        """
+        return self.fetch_all(query, (competency_id,))
+
+    def iter_indicator_masks(self, competency_id, filters=None, chunk_size=ID_CHUNK_SIZE):
+        """Потоковое чтение масок индикаторов оценок по компетенции
+
+        filters - словарь фильтров (ключи GRADE_FILTER_CONDITIONS), без
+        фильтров читаются оценки всего колледжа. Строки: (id студента, маска).
+        """
+        conditions, params = grade_filter_sql(filters)
+        cursor = self.connection.cursor()
+        cursor.execute(
+            f"SELECT g.student_id, g.indicator_mask FROM grades g WHERE g.competency_id = ?{conditions}",
+            [competency_id] + params
+        )
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield from rows
+
+    def get_grade_trends(self, student_id, group_by='competency', window=3, last=10):
+        """Ряды динамики оценок студента, рассчитанные оконными функциями
+
+        group_by - ключ ряда: competency, subject или all. Для каждой оценки
+        считаются скользящее среднее по window последним оценкам ряда и
+        прирост скользящего среднего за window оценок. Возвращаются только
+        last последних оценок каждого ряда в виде строк (ключ ряда, подпись,
+        id оценки, дата, оценка, процент, скользящее среднее, прирост или
+        None), упорядоченных по подписи и дате.
+        """
+        if group_by not in TREND_GROUPS:
+            raise ValueError(f"Неизвестная группировка динамики: {group_by}")
+        key, label = TREND_GROUPS[group_by]
+        # Прирост считается по всей истории ряда и только затем отбираются
+        # последние оценки, поэтому прирост есть и у первых из них
+        query = f"""
+        SELECT series_key, label, id, date, grade_value, percentage, rolling_avg, improvement
+        FROM (
+            SELECT *, rolling_avg - LAG(rolling_avg, ?) OVER (
+                       PARTITION BY series_key ORDER BY date, id
+                   ) as improvement
+            FROM (
+                SELECT {key} as series_key, {label} as label, g.id, g.date,
+                       g.grade_value, g.percentage,
+                       AVG(g.grade_value) OVER (
+                           PARTITION BY {key} ORDER BY g.date, g.id
+                           ROWS BETWEEN ? PRECEDING AND CURRENT ROW
+                       ) as rolling_avg,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY {key} ORDER BY g.date DESC, g.id DESC
+                       ) as from_end
+                FROM grades g
+                JOIN subjects s ON g.subject_id = s.id
+                JOIN fgos_competencies fc ON g.competency_id = fc.id
+                WHERE g.student_id = ?
+            )
+        )
+        WHERE from_end <= ?
+        ORDER BY label, series_key, date, id
+        """
+        return self.fetch_all(query, (window, window - 1, student_id, last))
+
+    def get_student_grade_ids(self, student_id):
+        """Множество id оценок студента (читается только индекс)"""
+        rows = self.fetch_all("SELECT id FROM grades WHERE student_id = ?", (student_id,))
+        return {row[0] for row in rows}
+
+    def get_grade_students(self, grade_ids):
+        """Множество студентов, которым принадлежат оценки из списка"""
+        query = "SELECT DISTINCT student_id FROM grades WHERE id IN ({ids})"
+        return {row[0] for row in self._fetch_for_ids(query, (), grade_ids)}
+
+    def get_mastery_cells(self, group_name, mode='latest', competency_type=None, student_ids=None):
+        """Ячейки карты освоения компетенций студентами группы
+
+        Для каждой пары (студент, компетенция) выбирается одна оценка за
+        один проход оконной функцией: последняя (mode='latest') или лучшая
+        (mode='best'). Пары без оценок в результат не попадают.
+        Возвращает словарь {(id студента, id компетенции): (id оценки,
+        оценка, процент, дата)}. student_ids ограничивает выборку списком
+        студентов (для обновления части карты).
+        """
+        if mode not in MASTERY_ORDER:
+            raise ValueError(f"Неизвестный режим карты освоения: {mode}")
+        conditions = ""
+        params = [group_name]
+        if competency_type is not None:
+            conditions += " AND g.competency_id IN (SELECT id FROM fgos_competencies WHERE type = ?)"
+            params.append(competency_type)
+        query = f"""
+        SELECT student_id, competency_id, id, grade_value, percentage, date
+        FROM (
+            SELECT g.student_id, g.competency_id, g.id, g.grade_value, g.percentage, g.date,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY g.student_id, g.competency_id
+                       ORDER BY {MASTERY_ORDER[mode]}
+                   ) as position
+            FROM grades g
+            JOIN users u ON g.student_id = u.id
+            WHERE u.group_name = ?{conditions}{{ids_condition}}
+        )
+        WHERE position = 1
+        """
+        if student_ids is None:
+            rows = self.fetch_all(query.format(ids_condition=''), params)
+        else:
+            query = query.format(ids_condition=' AND g.student_id IN ({ids})')
+            rows = self._fetch_for_ids(query, params, student_ids)
+        return {(row[0], row[1]): tuple(row[2:]) for row in rows}
+
+    def get_mastery_matrix(self, group_name, mode='latest', competency_type=None):
+        """Карта освоения компетенций группой одним согласованным снимком
+
+        Возвращает словарь с ключами:
+        change_seq - точка синхронизации;
+        students - [(id, ФИО)] студентов группы (строки карты);
+        competencies - [(id, код, название, тип)] компетенций специальностей
+        группы и компетенций, по которым есть оценки (столбцы карты);
+        cells - разреженные ячейки в формате get_mastery_cells.
+        """
+        type_condition = " AND fc.type = ?" if competency_type is not None else ""
+        type_params = [competency_type] if competency_type is not None else []
+        with self.read_transaction():
+            change_seq = self.get_change_seq()
+            students = self.fetch_all(
+                "SELECT id, full_name FROM users WHERE role = 'student' AND group_name = ? ORDER BY full_name",
+                (group_name,)
+            )
+            competencies = self.fetch_all(f"""
+                SELECT fc.id, fc.code, fc.name, fc.type
+                FROM fgos_competencies fc
+                WHERE (fc.specialty_id IN (SELECT specialty_id FROM users WHERE group_name = ?)
+                       OR fc.id IN (SELECT g.competency_id FROM grades g
+                                    JOIN users u ON g.student_id = u.id
+                                    WHERE u.group_name = ?)){type_condition}
+                ORDER BY fc.type, fc.code
+                """, [group_name, group_name] + type_params)
+            cells = self.get_mastery_cells(group_name, mode, competency_type)
+
+        return {
+            'change_seq': change_seq,
+            'students': students,
+            'competencies': competencies,
+            'cells': cells,
+        }
+
+    def get_groups(self):
+        """Список учебных групп студентов"""
+        rows = self.fetch_all(
+            "SELECT DISTINCT group_name FROM users WHERE role = 'student' AND group_name IS NOT NULL ORDER BY group_name"
+        )
+        return [row[0] for row in rows]
+
+    def _search_sql(self, text, filters=None):
+        """Источник и условие полнотекстового поиска оценок
+
+        Возвращает (FROM без соединений, WHERE, параметры) или None, если в
+        тексте нет слов. Без FTS5 слова ищутся через LIKE полным просмотром.
+        """
+        words = re.findall(r'\w+', text or '')
+        if not words:
+            return None
+
+        conditions, params = grade_filter_sql(filters)
+        if self.fts_enabled:
+            # Каждое слово ищется как префикс, слова объединяются через AND
+            match = ' '.join(f'"{word}"*' for word in words)
+            return ("grades_fts JOIN grades g ON g.id = grades_fts.rowid",
+                    f"grades_fts MATCH ?{conditions}", [match] + params)
+
+        like_conditions = []
+        like_params = []
+        for word in words:
+            like_conditions.append(
+                " AND (g.comment LIKE ? OR EXISTS ("
+                "SELECT 1 FROM grade_indicators gi JOIN fgos_indicators fi ON gi.indicator_id = fi.id "
+                "WHERE gi.grade_id = g.id AND fi.description LIKE ?))"
+            )
+            like_params.extend([f'%{word}%', f'%{word}%'])
+        return "grades g", f"1 = 1{''.join(like_conditions)}{conditions}", like_params + params
+
+    def search_grades(self, text, filters=None, limit=100):
+        """Полнотекстовый поиск оценок по комментариям и описаниям индикаторов
+
+        filters - словарь фильтров (ключи GRADE_FILTER_CONDITIONS).
+        Возвращает строки (id, студент, предмет, код компетенции, оценка, дата,
+        фрагмент с подсветкой, ранг), наиболее релевантные первыми.
+        """
+        search = self._search_sql(text, filters)
+        if search is None:
+            return []
+        source, where, params = search
+        limit_sql = "LIMIT ?" if limit else ""
+        limit_params = [limit] if limit else []
+
+        if self.fts_enabled:
+            fragment = "snippet(grades_fts, -1, '<b>', '</b>', '...', 12) as fragment, bm25(grades_fts) as rank"
+            order = 'rank'
+        else:
+            fragment = "SUBSTR(g.comment, 1, 120) as fragment, 0 as rank"
+            order = 'g.date DESC'
+        query = f"""
+        SELECT g.id, u.full_name, s.name, fc.code, g.grade_value, g.date,
+               {fragment}
+        FROM {source}
+        JOIN users u ON g.student_id = u.id
+        JOIN subjects s ON g.subject_id = s.id
+        JOIN fgos_competencies fc ON g.competency_id = fc.id
+        WHERE {where}
+        ORDER BY {order}
+        {limit_sql}
+        """
+        return self.fetch_all(query, params + limit_params)
+
+    def search_grade_ids(self, text, filters=None):
+        """Множество id всех оценок, найденных search_grades, без ограничения и фрагментов"""
+        search = self._search_sql(text, filters)
+        if search is None:
+            return set()
+        source, where, params = search
+        return {row[0] for row in self.fetch_all(f"SELECT g.id FROM {source} WHERE {where}", params)}
+
+    def calculate_grade_from_indicators(self, selected_indicators, competency_id):
+        """Расчет оценки на основе выбранных индикаторов с новой логикой"""
+        if not selected_indicators:
+            return 2, 0  # Если ничего не выбрано - не сформировано
+        
+        # Получаем все индикаторы для компетенции
+        query = "SELECT id FROM fgos_indicators WHERE competency_id = ?"
+        all_indicators = self.fetch_all(query, (competency_id,))
+        
+        if not all_indicators:
+            return 2, 0
+        
+        total_indicators = len(all_indicators)
+        selected_count = len(selected_indicators)
+        
+        # Рассчитываем процент освоения
+        percentage = (selected_count / total_indicators) * 100 if total_indicators > 0 else 0
+        
+        # Новая логика оценки по количеству выбранных пунктов
+        # Для 8 индикаторов: 5 (6-8 пунктов), 4 (5 пунктов), 3 (4 пункта), 2 (0-3 пункта)
+        # Для 6 индикаторов: 5 (5-6 пунктов), 4 (4 пункта), 3 (3 пункта), 2 (0-2 пункта)
+        
+        if total_indicators >= 8:
+            # Для компетенций с 8+ пунктами
+            if selected_count >= 6:  # 6-8 пунктов из 8 = 75-100%
+                return 5, percentage
+            elif selected_count >= 5:  # 5 пунктов из 8 = 62.5%
+                return 4, percentage
+            elif selected_count >= 4:  # 4 пункта из 8 = 50%
+                return 3, percentage
+            else:
+                return 2, percentage
+        elif total_indicators >= 6:
+            # Для компетенций с 6 пунктами
+            if selected_count >= 5:  # 5-6 пунктов из 6 = 83-100%
+                return 5, percentage
+            elif selected_count >= 4:  # 4 пункта из 6 = 67%
+                return 4, percentage
+            elif selected_count >= 3:  # 3 пункта из 6 = 50%
+                return 3, percentage
+            else:
+                return 2, percentage
+        else:
+            # Старая логика для других случаев
+            if percentage >= 86:
+                return 5, percentage
+            elif percentage >= 67:
+                return 4, percentage
+            elif percentage >= 48:
+                return 3, percentage
+            else:
+                return 2, percentage
+
+    def get_competency_stats(self, competency_id):
+        """Получение статистики по компетенции"""
+        query = """
+        SELECT 
+            COUNT(DISTINCT fi.id) as total_indicators,
+            AVG(g.percentage) as avg_percentage,
+            COUNT(DISTINCT g.id) as total_grades
+        FROM fgos_indicators fi
+        LEFT JOIN grade_indicators gi ON fi.id = gi.indicator_id
+        LEFT JOIN grades g ON gi.grade_id = g.id
+        WHERE fi.competency_id = ?
+        """
+        return self.fetch_one(query, (competency_id,))
+
+    def get_archives(self):
+        """Архивы закрытых учебных лет [(год, путь к файлу, количество оценок)]"""
+        return self.fetch_all("SELECT year, path, grades FROM archives ORDER BY year")
+
+    def _archive_file(self, path):
+        """Полный путь к файлу архива (относительный путь - от каталога базы)"""
+        return os.path.join(os.path.dirname(os.path.abspath(self.db_path)), path)
+
+    def archive_academic_year(self, year, path=None):
+        """Перенос оценок закрытого учебного года в отдельный файл SQLite
+
+        Оценки с датами с 1 сентября year по 31 августа следующего года и их
+        индикаторы копируются в новый файл path (по умолчанию рядом с базой,
+        {имя базы}_{year}-{year + 1}.db) и удаляются из основного файла в той
+        же транзакции, архив регистрируется в таблице archives. Справочники
+        остаются в основном файле. Возвращает количество перенесенных оценок.
+        """
+        date_from, date_to = academic_year_range(year)
+        if date_to >= date.today().isoformat():
+            raise ValueError(f"Учебный год {year}/{year + 1} еще не закончился")
+        if self.fetch_one("SELECT 1 FROM archives WHERE year = ?", (year,)):
+            raise ValueError(f"Учебный год {year}/{year + 1} уже перенесен в архив")
+
+        archived_max, remaining_max = self.fetch_one(
+            """SELECT MAX(CASE WHEN date BETWEEN ?1 AND ?2 THEN id END),
+                      MAX(CASE WHEN date NOT BETWEEN ?1 AND ?2 THEN id END)
+            FROM grades""",
+            (date_from, date_to)
+        )
+        if archived_max is None:
+            return 0
+        # Без AUTOINCREMENT новая оценка получает MAX(id) + 1, поэтому в основном
+        # файле должна остаться более поздняя оценка, иначе id архивных оценок
+        # будут выданы повторно
+        if remaining_max is None or remaining_max < archived_max:
+            raise ValueError(f"В основном файле не останется оценок новее учебного года {year}/{year + 1}")
+
+        if path is None:
+            stem = os.path.splitext(os.path.basename(self.db_path))[0]
+            path = f"{stem}_{year}-{year + 1}.db"
+        archive_file = self._archive_file(path)
+        if os.path.exists(archive_file):
+            raise ValueError(f"Файл архива уже существует: {archive_file}")
+
+        archive = sqlite3.connect(archive_file)
+        try:
+            for sql in ARCHIVE_SCHEMA:
+                archive.execute(sql)
+            archive.commit()
+        finally:
+            archive.close()
+
+        # ATTACH нельзя выполнить внутри транзакции
+        self.connection.commit()
+        self.connection.execute("ATTACH DATABASE ? AS archive_target", (archive_file,))
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            for table, columns in ARCHIVE_COLUMNS.items():
+                condition = 'date BETWEEN ? AND ?' if table == 'grades' else 'grade_id IN (SELECT id FROM archive_target.grades)'
+                cursor.execute(
+                    f"INSERT INTO archive_target.{table} ({columns}) SELECT {columns} FROM main.{table} WHERE {condition}",
+                    (date_from, date_to) if table == 'grades' else ()
+                )
+            cursor.execute("SELECT COUNT(*) FROM archive_target.grades")
+            count = cursor.fetchone()[0]
+            # Индикаторы перенесенных оценок удаляет триггер grades_cascade_delete
+            cursor.execute("DELETE FROM main.grades WHERE date BETWEEN ? AND ?", (date_from, date_to))
+            cursor.execute("INSERT INTO archives (year, path, grades) VALUES (?, ?, ?)", (year, path, count))
+            self.connection.commit()
+        except Error:
+            self.connection.rollback()
+            self.connection.execute("DETACH DATABASE archive_target")
+            os.remove(archive_file)
+            raise
+        self.connection.execute("DETACH DATABASE archive_target")
+        print(f"✓ Учебный год {year}/{year + 1} перенесен в архив {archive_file}: {count} оценок")
+        return count
+
+    def attach_archives(self, years=None):
+        """Подключение архивов только для чтения и объединяющих представлений
+
+        Архивы (все или из списка years) подключаются как схемы archive_{год},
+        после чего временные представления grades_all и grade_indicators_all
+        объединяют основной файл и архивы через UNION ALL. Остальные запросы
+        Database по-прежнему читают только основной файл. Возвращает список
+        подключенных лет.
+        """
+        if self.connection.in_transaction:
+            # ATTACH нельзя выполнить внутри транзакции
+            self.connection.commit()
+        for year, path, _ in self.get_archives():
+            if year in self.attached_archives or (years is not None and year not in years):
+                continue
+            schema = f"archive_{year}"
+            uri = Path(self._archive_file(path)).as_uri() + '?mode=ro'
+            try:
+                self.connection.execute(f"ATTACH DATABASE ? AS {schema}", (uri,))
+                self.attached_archives[year] = schema
+            except Error as e:
+                print(f"✗ Не удалось подключить архив {year}/{year + 1} ({path}): {e}")
+
+        for table, columns in ARCHIVE_COLUMNS.items():
+            parts = [f"SELECT {columns} FROM main.{table}"]
+            parts += [f"SELECT {columns} FROM {schema}.{table}" for schema in self.attached_archives.values()]
+            self.connection.execute(f"DROP VIEW IF EXISTS temp.{table}_all")
+            self.connection.execute(f"CREATE TEMP VIEW {table}_all AS {' UNION ALL '.join(parts)}")
+        self.archive_views = True
+        return sorted(self.attached_archives)
+
+    def detach_archives(self):
+        """Отключение архивов и удаление объединяющих представлений"""
+        if self.connection.in_transaction:
+            self.connection.commit()
+        for table in ARCHIVE_COLUMNS:
+            self.connection.execute(f"DROP VIEW IF EXISTS temp.{table}_all")
+        for schema in self.attached_archives.values():
+            self.connection.execute(f"DETACH DATABASE {schema}")
+        self.attached_archives = {}
+        self.archive_views = False
+
+    def get_student_history(self, student_id, year=None):
+        """Оценки студента за все годы или за учебный год year
+
+        Запрос за год, не перенесенный в архив, выполняется только по
+        основному файлу; за архивный год и за все годы - по представлению
+        grades_all (архивы переподключаются при обращении, если список
+        архивов изменился). Возвращает кортежи (id, предмет, код
+        компетенции, оценка, процент, дата).
+        """
+        archived = {row[0] for row in self.get_archives()}
+        table = 'grades'
+        if year is None or year in archived:
+            if self.attached_archives.keys() - archived:
+                # Архив удален при очистке по сроку хранения (maintenance.purge_archives)
+                self.detach_archives()
+            if not self.archive_views or archived - self.attached_archives.keys():
+                self.attach_archives()
+            table = 'grades_all'
+
+        conditions = ['g.student_id = ?']
+        params = [student_id]
+        if year is not None:
+            conditions.append('g.date BETWEEN ? AND ?')
+            params.extend(academic_year_range(year))
+        return self.fetch_all(f"""
+        SELECT g.id, s.name, fc.code, g.grade_value, g.percentage, g.date
+        FROM {table} g
+        JOIN subjects s ON g.subject_id = s.id
+        JOIN fgos_competencies fc ON g.competency_id = fc.id
+        WHERE {' AND '.join(conditions)}
+        ORDER BY g.date DESC, g.id DESC
+        """, params)
+
+    def close(self):
+        """Закрытие соединения с базой данных"""
+        if self.connection:
+            self.connection.close()
+            print("Database connection closed")
+
+
+# Пример использования
+if __name__ == "__main__":
+    # Создаем базу данных по указанному пути
+    db = Database()
+    
+    # Проверяем соединение
+    if db.connection:
+        # Пример запроса
+        users = db.fetch_all("SELECT * FROM users")
+        print(f"Всего пользователей: {len(users)}")
+        
+        # Пример получения предметов
+        subjects = db.fetch_all("SELECT * FROM subjects")
+        print(f"Всего предметов: {len(subjects)}")
+        
+        # Пример получения компетенций
+        competencies = db.fetch_all("SELECT * FROM fgos_competencies")
+        print(f"Всего компетенций: {len(competencies)}")
+        
+        # Проверяем индикаторы для ПК 2.2
+        cursor = db.connection.cursor()
+        cursor.execute("SELECT id FROM fgos_competencies WHERE code = 'ПК 2.2'")
+        pk_2_2_id = cursor.fetchone()[0]
+        indicators = db.get_indicators_by_competency(pk_2_2_id)
+        print(f"Всего индикаторов для ПК 2.2: {len(indicators)}")
+        
+        # Закрываем соединение
+        db.close()
\ No newline at end of file
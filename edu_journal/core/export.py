@@ -0,0 +1,195 @@
+import csv
+import os
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+from .database import FTS_INDICATORS_SQL, connect_readonly, grade_filter_sql
+
+
+EXPORT_CHUNK_SIZE = 1000  # Количество строк, читаемых из базы за один fetchmany
+
+JOURNAL_COLUMNS = [
+    'Студент', 'Группа', 'Предмет', 'Компетенция', 'Оценка', 'Процент',
+    'Индикаторы освоения', 'Комментарий', 'Дата', 'Преподаватель'
+]
+
+JOURNAL_QUERY = """
+SELECT st.full_name, st.group_name, s.name, fc.code, g.grade_value, g.percentage,
+       {indicators}, g.comment, g.date, t.full_name
+FROM grades g
+JOIN users st ON g.student_id = st.id
+JOIN users t ON g.teacher_id = t.id
+JOIN subjects s ON g.subject_id = s.id
+JOIN fgos_competencies fc ON g.competency_id = fc.id
+WHERE 1 = 1{conditions}
+ORDER BY st.group_name, st.full_name, g.date
+"""
+
+# Минимальный набор частей книги XLSX (один лист со строками inlineStr)
+XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Журнал" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+XLSX_SHEET_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+XLSX_SHEET_FOOTER = '</sheetData></worksheet>'
+
+# Управляющие символы, недопустимые в XML
+XML_INVALID_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def count_journal_rows(connection, filters=None):
+    """Подсчет строк журнала для отображения прогресса"""
+    conditions, params = grade_filter_sql(filters)
+    query = f"SELECT COUNT(*) FROM grades g WHERE 1 = 1{conditions}"
+    return connection.execute(query, params).fetchone()[0]
+
+
+def iter_journal_rows(connection, filters=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Потоковое чтение строк журнала порциями fetchmany
+
+    В памяти одновременно находится не больше chunk_size строк.
+    """
+    conditions, params = grade_filter_sql(filters)
+    query = JOURNAL_QUERY.format(
+        indicators=FTS_INDICATORS_SQL.format(grade_id='g.id'),
+        conditions=conditions
+    )
+    cursor = connection.cursor()
+    try:
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        cursor.close()
+
+
+def write_csv(rows, path, progress=None):
+    """Запись строк журнала в CSV (разделитель ';', кодировка для Excel)"""
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8-sig') as file:
+        writer = csv.writer(file, delimiter=';')
+        writer.writerow(JOURNAL_COLUMNS)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+            if progress and count % EXPORT_CHUNK_SIZE == 0:
+                progress(count)
+    if progress:
+        progress(count)
+    return count
+
+
+def _xlsx_column_name(index):
+    """Буквенное обозначение столбца XLSX по номеру (0 -> A)"""
+    name = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        name = chr(ord('A') + remainder) + name
+    return name
+
+
+def _xlsx_row(row_number, values, column_names):
+    """Разметка одной строки листа XLSX"""
+    cells = []
+    for column_name, value in zip(column_names, values):
+        reference = f'{column_name}{row_number}'
+        if value is None:
+            continue
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            cells.append(f'<c r="{reference}"><v>{value}</v></c>')
+        else:
+            text = escape(XML_INVALID_CHARS.sub('', str(value)))
+            cells.append(f'<c r="{reference}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    return f'<row r="{row_number}">{"".join(cells)}</row>'
+
+
+def write_xlsx(rows, path, progress=None):
+    """Потоковая запись строк журнала в XLSX без сторонних библиотек
+
+    Лист пишется в архив по мере чтения строк, поэтому объем памяти
+    не зависит от количества строк.
+    """
+    column_names = [_xlsx_column_name(index) for index in range(len(JOURNAL_COLUMNS))]
+    count = 0
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', XLSX_CONTENT_TYPES)
+        archive.writestr('_rels/.rels', XLSX_ROOT_RELS)
+        archive.writestr('xl/workbook.xml', XLSX_WORKBOOK)
+        archive.writestr('xl/_rels/workbook.xml.rels', XLSX_WORKBOOK_RELS)
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write(XLSX_SHEET_HEADER.encode('utf-8'))
+            sheet.write(_xlsx_row(1, JOURNAL_COLUMNS, column_names).encode('utf-8'))
+            for row in rows:
+                count += 1
+                sheet.write(_xlsx_row(count + 1, row, column_names).encode('utf-8'))
+                if progress and count % EXPORT_CHUNK_SIZE == 0:
+                    progress(count)
+            sheet.write(XLSX_SHEET_FOOTER.encode('utf-8'))
+    if progress:
+        progress(count)
+    return count
+
+
+EXPORT_WRITERS = {
+    '.csv': write_csv,
+    '.xlsx': write_xlsx,
+}
+
+
+def export_journal(db_path, path, filters=None, progress=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Экспорт журнала в CSV или XLSX (формат определяется по расширению файла)
+
+    Использует отдельное подключение только для чтения, поэтому может
+    выполняться в фоновом потоке. progress(выгружено, всего) вызывается
+    после каждой порции строк. Возвращает количество выгруженных строк.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXPORT_WRITERS:
+        raise ValueError(f"Неподдерживаемый формат экспорта: {extension or path}")
+
+    connection = connect_readonly(db_path)
+    try:
+        total = count_journal_rows(connection, filters)
+        report = (lambda done: progress(done, total)) if progress else None
+        rows = iter_journal_rows(connection, filters, chunk_size)
+        return EXPORT_WRITERS[extension](rows, path, report)
+    finally:
+        connection.close()
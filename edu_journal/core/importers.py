@@ -0,0 +1,323 @@
+import csv
+import re
+import sqlite3
+import time
+from itertools import islice
+
+from .passwords import hash_passwords
+from .validators import (
+    calculate_grade_by_count, validate_comments_batch,
+    validate_dates_batch, validate_indicators_batch
+)
+
+
+IMPORT_CHUNK_SIZE = 1000  # Количество строк в одной транзакции импорта
+CSV_DELIMITERS = ';,\t'
+SNIFF_SIZE = 64 * 1024  # Объем начала файла для определения разделителя
+
+ROSTER_FIELDS = ['username', 'password', 'role', 'full_name', 'specialty', 'group_name']
+ROSTER_REQUIRED_FIELDS = ['username', 'password', 'role', 'full_name']
+USER_ROLES = ('teacher', 'student')
+
+GRADE_FIELDS = ['student', 'teacher', 'subject', 'competency', 'indicators', 'comment', 'date']
+INDICATOR_SEPARATORS = re.compile(r'\s*[;,]\s*')
+
+
+class ImportReport:
+    """Итоги импорта: количество строк, ошибки по строкам и скорость"""
+
+    def __init__(self):
+        self.imported = 0
+        self.errors = []  # Список (номер строки файла, сообщение)
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        total = self.imported + len(self.errors)
+        return total / self.elapsed if self.elapsed > 0 else 0.0
+
+    def add_error(self, line_number, message):
+        self.errors.append((line_number, message))
+
+    def __repr__(self):
+        return (f"ImportReport(imported={self.imported}, errors={len(self.errors)}, "
+                f"rows_per_second={self.rows_per_second:.0f})")
+
+
+def iter_csv_rows(path):
+    """Потоковое чтение CSV с автоматическим определением разделителя
+
+    Возвращает пары (номер строки файла, словарь значений). Имена столбцов
+    приводятся к нижнему регистру, значения очищаются от пробелов по краям.
+    """
+    with open(path, newline='', encoding='utf-8-sig') as file:
+        sample = file.read(SNIFF_SIZE)
+        file.seek(0)
+        try:
+            delimiter = csv.Sniffer().sniff(sample, delimiters=CSV_DELIMITERS).delimiter
+        except csv.Error:
+            delimiter = ';'
+        reader = csv.reader(file, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        header = [name.strip().lower() for name in header]
+        for row in reader:
+            if not any(value.strip() for value in row):
+                continue
+            values = {name: value.strip() for name, value in zip(header, row)}
+            yield reader.line_num, values
+
+
+def iter_chunks(rows, chunk_size):
+    """Разбиение потока строк на списки фиксированного размера"""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def validate_roster_rows(rows):
+    """Пакетная проверка строк списка пользователей
+
+    rows - список пар (номер строки, словарь значений). Возвращает список
+    пар (номер строки, кортеж значений в порядке ROSTER_FIELDS) и список
+    ошибок (номер строки, сообщение).
+    """
+    valid = []
+    errors = []
+    for line_number, values in rows:
+        missing = [field for field in ROSTER_REQUIRED_FIELDS if not values.get(field)]
+        if missing:
+            errors.append((line_number, f"Не заполнены поля: {', '.join(missing)}"))
+            continue
+        if values['role'] not in USER_ROLES:
+            errors.append((line_number, f"Неизвестная роль: {values['role']}"))
+            continue
+        valid.append((line_number, tuple(values.get(field) or None for field in ROSTER_FIELDS)))
+    return valid, errors
+
+
+def _upsert_chunk(db, rows, report, update_credentials=False):
+    """Запись порции пользователей; при ошибке строки записываются по одной"""
+    try:
+        db.upsert_users([user for _, user in rows], update_credentials)
+        report.imported += len(rows)
+        return
+    except sqlite3.Error:
+        pass
+    # Поиск строк, из-за которых не прошла вся порция
+    for line_number, user in rows:
+        try:
+            db.upsert_users([user], update_credentials)
+            report.imported += 1
+        except sqlite3.Error as e:
+            report.add_error(line_number, str(e))
+
+
+def import_roster(db, path, chunk_size=IMPORT_CHUNK_SIZE, workers=None, progress=None, update_credentials=False):
+    """Импорт студентов и преподавателей из CSV
+
+    Файл читается потоком и записывается порциями по chunk_size строк,
+    каждая порция - отдельная транзакция INSERT ... ON CONFLICT(username).
+    Пароль и роль существующих логинов заменяются только при
+    update_credentials (см. Database.upsert_users), поэтому без него
+    хэшируются (параллельно) только пароли новых пользователей. Ошибочные
+    строки попадают в отчет и не прерывают импорт. Повторяющиеся логины в
+    файле - ошибка для всех вхождений, кроме первого. progress(обработано
+    строк) вызывается после каждой порции.
+    """
+    report = ImportReport()
+    started = time.perf_counter()
+    seen_usernames = set()
+    processed = 0
+
+    for chunk in iter_chunks(iter_csv_rows(path), chunk_size):
+        valid, errors = validate_roster_rows(chunk)
+        for error in errors:
+            report.add_error(*error)
+
+        unique = []
+        for line_number, user in valid:
+            if user[0] in seen_usernames:
+                report.add_error(line_number, f"Повторяющийся логин: {user[0]}")
+                continue
+            seen_usernames.add(user[0])
+            unique.append((line_number, user))
+
+        # Пароль существующего логина при upsert не меняется; в строку
+        # подставляется сохраненный хэш вместо расчета PBKDF2
+        existing = {} if update_credentials else db.get_user_passwords([user[0] for _, user in unique])
+        new_users = [user for _, user in unique if user[0] not in existing]
+        hashes = dict(zip((user[0] for user in new_users),
+                          hash_passwords([user[1] for user in new_users], workers)))
+        rows = [(line_number, (user[0], existing[user[0]] if user[0] in existing else hashes[user[0]]) + user[2:])
+                for line_number, user in unique]
+        _upsert_chunk(db, rows, report, update_credentials)
+
+        processed += len(chunk)
+        if progress:
+            progress(processed)
+
+    report.elapsed = time.perf_counter() - started
+    print(f"✓ Импортировано пользователей: {report.imported}, ошибок: {len(report.errors)} "
+          f"({report.rows_per_second:.0f} строк/с)")
+    return report
+
+
+def load_grade_lookups(db):
+    """Справочники для сопоставления кодов из файла с id в базе
+
+    Загружаются один раз на весь импорт: логины студентов и преподавателей,
+    коды предметов, компетенций и индикаторов, количество индикаторов
+    каждой компетенции.
+    """
+    users = db.fetch_all("SELECT username, id, role FROM users")
+    indicators = db.fetch_all("SELECT code, id, competency_id FROM fgos_indicators")
+    totals = {}
+    for _, _, competency_id in indicators:
+        totals[competency_id] = totals.get(competency_id, 0) + 1
+    return {
+        'students': {username: user_id for username, user_id, role in users if role == 'student'},
+        'teachers': {username: user_id for username, user_id, role in users if role == 'teacher'},
+        'subjects': dict(db.fetch_all("SELECT code, id FROM subjects WHERE code IS NOT NULL")),
+        'competencies': dict(db.fetch_all("SELECT code, id FROM fgos_competencies")),
+        'indicators': {code: (indicator_id, competency_id) for code, indicator_id, competency_id in indicators},
+        'indicator_totals': totals,
+    }
+
+
+def resolve_grade_row(values, lookups):
+    """Сопоставление кодов одной строки с id
+
+    Возвращает (данные оценки, ошибка); данные - словарь с id и списком
+    id индикаторов.
+    """
+    missing = [field for field in GRADE_FIELDS if not values.get(field)]
+    if missing:
+        return None, f"Не заполнены поля: {', '.join(missing)}"
+
+    references = [
+        ('students', 'student', 'Студент не найден'),
+        ('teachers', 'teacher', 'Преподаватель не найден'),
+        ('subjects', 'subject', 'Предмет не найден'),
+        ('competencies', 'competency', 'Компетенция не найдена'),
+    ]
+    resolved = {}
+    for lookup, field, message in references:
+        resolved[field] = lookups[lookup].get(values[field])
+        if resolved[field] is None:
+            return None, f"{message}: {values[field]}"
+
+    indicator_ids = []
+    for code in INDICATOR_SEPARATORS.split(values['indicators']):
+        indicator = lookups['indicators'].get(code)
+        if indicator is None:
+            return None, f"Индикатор не найден: {code}"
+        if indicator[1] != resolved['competency']:
+            return None, f"Индикатор {code} не относится к компетенции {values['competency']}"
+        if indicator[0] not in indicator_ids:
+            indicator_ids.append(indicator[0])
+
+    resolved['indicator_ids'] = indicator_ids
+    resolved['comment'] = values['comment']
+    resolved['date'] = values['date']
+    resolved['grade'] = values.get('grade')
+    return resolved, None
+
+
+def validate_grade_rows(rows, lookups):
+    """Пакетная проверка строк оценок
+
+    Коды сопоставляются со справочниками построчно, а комментарии, даты и
+    количество индикаторов проверяются целыми столбцами. Возвращает список
+    пар (номер строки, (кортеж оценки, список id индикаторов)) и список
+    ошибок (номер строки, сообщение).
+    """
+    resolved_rows = []
+    errors = []
+    for line_number, values in rows:
+        resolved, error = resolve_grade_row(values, lookups)
+        if error:
+            errors.append((line_number, error))
+        else:
+            resolved_rows.append((line_number, resolved))
+
+    totals = [lookups['indicator_totals'][row['competency']] for _, row in resolved_rows]
+    column_errors = {}
+    for index, message in (
+        validate_comments_batch([row['comment'] for _, row in resolved_rows])
+        + validate_dates_batch([row['date'] for _, row in resolved_rows])
+        + validate_indicators_batch([len(row['indicator_ids']) for _, row in resolved_rows], totals)
+    ):
+        column_errors.setdefault(index, message)
+
+    valid = []
+    for index, ((line_number, row), total) in enumerate(zip(resolved_rows, totals)):
+        if index in column_errors:
+            errors.append((line_number, column_errors[index]))
+            continue
+        grade_value, percentage = calculate_grade_by_count(len(row['indicator_ids']), total)
+        if row['grade'] and row['grade'] != str(grade_value):
+            errors.append((line_number,
+                           f"Оценка {row['grade']} не соответствует индикаторам (расчетная {grade_value})"))
+            continue
+        grade = (row['student'], row['teacher'], row['subject'], row['competency'],
+                 grade_value, percentage, row['comment'], row['date'])
+        valid.append((line_number, (grade, row['indicator_ids'])))
+
+    errors.sort()
+    return valid, errors
+
+
+def _insert_grades_chunk(db, rows, report, dry_run):
+    """Запись порции оценок; при ошибке строки записываются по одной"""
+    try:
+        db.add_grades_bulk([grade for _, grade in rows], commit=not dry_run)
+        report.imported += len(rows)
+        return
+    except sqlite3.Error:
+        pass
+    # Поиск строк, из-за которых не прошла вся порция
+    for line_number, grade in rows:
+        try:
+            db.add_grades_bulk([grade], commit=not dry_run)
+            report.imported += 1
+        except sqlite3.Error as e:
+            report.add_error(line_number, str(e))
+
+
+def import_grades(db, path, chunk_size=IMPORT_CHUNK_SIZE, dry_run=False, progress=None):
+    """Импорт оценок из CSV
+
+    Столбцы: student и teacher (логины), subject (код предмета), competency
+    (код компетенции), indicators (коды индикаторов через ';' или ','),
+    comment, date (ГГГГ-ММ-ДД) и необязательный grade для сверки с
+    расчетной оценкой. Оценка и процент рассчитываются по индикаторам так
+    же, как в окне преподавателя. Каждая порция - отдельная транзакция.
+    В режиме dry_run строки проверяются и записываются, но транзакции
+    откатываются, так что отчет учитывает и ограничения базы данных.
+    """
+    report = ImportReport()
+    started = time.perf_counter()
+    lookups = load_grade_lookups(db)
+    processed = 0
+
+    for chunk in iter_chunks(iter_csv_rows(path), chunk_size):
+        valid, errors = validate_grade_rows(chunk, lookups)
+        for error in errors:
+            report.add_error(*error)
+        if valid:
+            _insert_grades_chunk(db, valid, report, dry_run)
+
+        processed += len(chunk)
+        if progress:
+            progress(processed)
+
+    report.elapsed = time.perf_counter() - started
+    mode = 'Проверено' if dry_run else 'Импортировано'
+    print(f"✓ {mode} оценок: {report.imported}, ошибок: {len(report.errors)} "
+          f"({report.rows_per_second:.0f} строк/с)")
+    return report
@@ -0,0 +1,328 @@
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from datetime import date
+
+from .database import academic_year, academic_year_range
+
+
+MAINTENANCE_TASKS = ('optimize', 'vacuum', 'integrity')  # По умолчанию; purge удаляет данные и задается явно
+MAINTENANCE_INTERVAL = 24 * 60 * 60  # Период обслуживания, секунды
+IDLE_SECONDS = 10 * 60  # Обслуживание начинается после стольких секунд без записи в базу
+POLL_INTERVAL = 30.0  # Период проверки активности, секунды
+ANALYSIS_LIMIT = 1000  # Строк индекса, просматриваемых PRAGMA optimize (0 - без ограничения)
+VACUUM_STEP_PAGES = 500  # Страниц, освобождаемых одной транзакцией incremental_vacuum
+AUTO_VACUUM_INCREMENTAL = 2  # Значение PRAGMA auto_vacuum для режима INCREMENTAL
+RETENTION_YEARS = 5  # Полных учебных лет, оценки которых хранятся кроме текущего
+PURGE_BATCH_IDS = 2000  # Ширина диапазона id, удаляемого одной транзакцией
+PURGE_PAUSE = 0.01  # Пауза между транзакциями удаления, секунды
+
+
+def database_stats(connection):
+    """Размер базы: page_count, freelist_count (свободные страницы) и page_size"""
+    return {
+        name: connection.execute(f"PRAGMA {name}").fetchone()[0]
+        for name in ('page_count', 'freelist_count', 'page_size')
+    }
+
+
+def _optimize(connection, is_idle):
+    connection.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+    connection.execute("PRAGMA optimize")
+    return 'ok'
+
+
+def _analyze(connection, is_idle):
+    connection.execute("ANALYZE")
+    return 'ok'
+
+
+def _vacuum(connection, is_idle):
+    """Освобождение свободных страниц короткими транзакциями по VACUUM_STEP_PAGES"""
+    if connection.execute("PRAGMA auto_vacuum").fetchone()[0] != AUTO_VACUUM_INCREMENTAL:
+        return 'пропущено: auto_vacuum не в режиме INCREMENTAL'
+    steps = 0
+    while connection.execute("PRAGMA freelist_count").fetchone()[0]:
+        if not is_idle():
+            return f'прервано после {steps} шагов: база используется'
+        # execute() выполняет один шаг прагмы и освобождает одну страницу,
+        # executescript() доводит ее до конца
+        connection.executescript(f"PRAGMA incremental_vacuum({VACUUM_STEP_PAGES})")
+        steps += 1
+    return f'ok, шагов: {steps}'
+
+
+def _integrity(connection, is_idle):
+    messages = [row[0] for row in connection.execute("PRAGMA integrity_check")]
+    return 'ok' if messages == ['ok'] else '; '.join(messages)
+
+
+def retention_cutoff(years=RETENTION_YEARS, today=None):
+    """Первая сохраняемая дата: начало учебного года years лет назад"""
+    return academic_year_range(academic_year(today or date.today()) - years)[0]
+
+
+def _delete_by_ranges(connection, table, key, condition, params, batch_ids, pause):
+    """Удаление строк непустыми диапазонами ключа key шириной batch_ids
+
+    Каждый диапазон удаляется отдельной короткой транзакцией, между
+    транзакциями делается пауза, чтобы другие подключения могли писать.
+    Возвращает (удалено строк, транзакций).
+    """
+    deleted = batches = 0
+    start = connection.execute(f"SELECT MIN({key}) FROM {table}").fetchone()[0]
+    while start is not None:
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = connection.execute(
+                f"DELETE FROM {table} WHERE {key} >= ? AND {key} < ? AND {condition}",
+                (start, start + batch_ids) + tuple(params)
+            )
+            connection.execute("COMMIT")
+        except sqlite3.Error:
+            connection.execute("ROLLBACK")
+            raise
+        deleted += cursor.rowcount
+        batches += 1
+        # Следующий диапазон начинается с ближайшего ключа, пропуская пустые промежутки
+        start = connection.execute(f"SELECT MIN({key}) FROM {table} WHERE {key} >= ?", (start + batch_ids,)).fetchone()[0]
+        if pause and start is not None:
+            time.sleep(pause)
+    return deleted, batches
+
+
+def purge_grades(connection, cutoff, batch_ids=PURGE_BATCH_IDS, pause=PURGE_PAUSE):
+    """Удаление оценок с датой раньше cutoff и индикаторов без оценок
+
+    Оценки удаляются диапазонами id (их индикаторы - триггером
+    grades_cascade_delete), затем удаляются оставшиеся индикаторы
+    удаленных ранее оценок и архивы учебных лет, закончившихся до cutoff
+    (см. purge_archives). connection должен работать без неявных
+    транзакций (isolation_level=None). Возвращает словарь: grades,
+    indicators, batches, archives (удаленные учебные годы), elapsed
+    (секунды) и rate (удалено строк в секунду).
+    """
+    started = time.perf_counter()
+    before = connection.execute("SELECT COUNT(*) FROM grade_indicators").fetchone()[0]
+    grades, grade_batches = _delete_by_ranges(connection, 'grades', 'id', 'date < ?', (cutoff,), batch_ids, pause)
+    cascaded = before - connection.execute("SELECT COUNT(*) FROM grade_indicators").fetchone()[0]
+    orphans, orphan_batches = purge_orphan_indicators(connection, batch_ids, pause)
+    archives = purge_archives(connection, cutoff)
+    elapsed = time.perf_counter() - started
+    return {
+        'grades': grades,
+        'indicators': cascaded + orphans,
+        'batches': grade_batches + orphan_batches,
+        'archives': archives,
+        'elapsed': elapsed,
+        'rate': (grades + cascaded + orphans) / elapsed if elapsed else 0.0,
+    }
+
+
+def purge_orphan_indicators(connection, batch_ids=PURGE_BATCH_IDS, pause=PURGE_PAUSE):
+    """Удаление индикаторов, оценки которых не существуют, возвращает (удалено, транзакций)"""
+    return _delete_by_ranges(
+        connection, 'grade_indicators', 'grade_id',
+        'NOT EXISTS (SELECT 1 FROM grades g WHERE g.id = grade_indicators.grade_id)', (), batch_ids, pause
+    )
+
+
+def purge_archives(connection, cutoff):
+    """Удаление архивов учебных лет, закончившихся раньше cutoff
+
+    Архив, подключенный к connection, сначала отключается, затем удаляются
+    его файл и запись в таблице archives. Если файл удалить не удалось
+    (например, он открыт другим процессом), запись остается до следующего
+    запуска. Возвращает список удаленных учебных лет.
+    """
+    databases = {row[1]: row[2] for row in connection.execute("PRAGMA database_list")}
+    directory = os.path.dirname(databases['main'])
+    removed = []
+    rows = connection.execute(
+        "SELECT year, path FROM archives WHERE year < ? ORDER BY year", (academic_year(cutoff),)
+    ).fetchall()
+    for year, path in rows:
+        schema = f"archive_{year}"
+        if schema in databases:
+            connection.execute(f"DETACH DATABASE {schema}")
+        # Относительный путь архива задан от каталога базы (Database._archive_file)
+        archive_file = os.path.join(directory, path)
+        try:
+            os.remove(archive_file)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"✗ Не удалось удалить архив {year}/{year + 1} ({archive_file}): {e}")
+            continue
+        connection.execute("DELETE FROM archives WHERE year = ?", (year,))
+        removed.append(year)
+    return removed
+
+
+def _purge(connection, is_idle):
+    result = purge_grades(connection, retention_cutoff())
+    return (f"оценок {result['grades']}, индикаторов {result['indicators']}, "
+            f"архивов {len(result['archives'])}, транзакций {result['batches']}, {result['rate']:.0f} строк/с")
+
+
+# Задачи обслуживания: функция (подключение, is_idle) -> итог
+TASK_FUNCTIONS = {
+    'optimize': _optimize,
+    'analyze': _analyze,
+    'vacuum': _vacuum,
+    'integrity': _integrity,
+    'purge': _purge,
+}
+
+
+def _check_tasks(tasks):
+    unknown = set(tasks) - TASK_FUNCTIONS.keys()
+    if unknown:
+        raise ValueError(f"Неизвестные задачи обслуживания: {', '.join(sorted(unknown))}")
+
+
+def run_maintenance(db_path, tasks=MAINTENANCE_TASKS, is_idle=None):
+    """Выполнение задач обслуживания базы отдельным подключением
+
+    tasks - имена из TASK_FUNCTIONS: optimize (PRAGMA optimize с
+    ограничением analysis_limit), analyze (полный ANALYZE), vacuum
+    (incremental_vacuum, прерывается, когда is_idle() возвращает False) и
+    integrity (integrity_check) и purge (удаление оценок и архивов старше
+    RETENTION_YEARS учебных лет, см. purge_grades). Для каждой задачи печатается и
+    возвращается словарь: task, result, elapsed (секунды), before и after
+    (database_stats до и после).
+    """
+    _check_tasks(tasks)
+    is_idle = is_idle or (lambda: True)
+
+    connection = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        return _run_tasks(connection, tasks, is_idle)
+    finally:
+        connection.close()
+
+
+def _run_tasks(connection, tasks, is_idle):
+    report = []
+    for task in tasks:
+        before = database_stats(connection)
+        started = time.perf_counter()
+        result = TASK_FUNCTIONS[task](connection, is_idle)
+        elapsed = time.perf_counter() - started
+        after = database_stats(connection)
+        report.append({'task': task, 'result': result, 'elapsed': elapsed, 'before': before, 'after': after})
+        print(f"✓ Обслуживание {task}: {result}, {elapsed:.2f} с, страниц {before['page_count']} -> "
+              f"{after['page_count']}, свободных {before['freelist_count']} -> {after['freelist_count']}")
+    return report
+
+
+def enable_incremental_vacuum(db_path):
+    """Перевод существующей базы в режим auto_vacuum = INCREMENTAL
+
+    Режим новой базы задает Database при создании файла; для старой базы
+    требуется полный VACUUM, который блокирует ее на время перестройки,
+    поэтому выполняется отдельной командой. Возвращает True, если режим
+    был изменен.
+    """
+    connection = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        if connection.execute("PRAGMA auto_vacuum").fetchone()[0] == AUTO_VACUUM_INCREMENTAL:
+            return False
+        connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        connection.execute("VACUUM")
+        return True
+    finally:
+        connection.close()
+
+
+class MaintenanceScheduler:
+    """Фоновое обслуживание базы в периоды простоя
+
+    Поток с собственным подключением каждые poll_interval секунд проверяет
+    PRAGMA data_version. Обслуживание запускается, когда с прошлого запуска
+    прошло interval секунд, а другие подключения ничего не записывали
+    idle_seconds секунд; освобождение страниц прерывается при первой же
+    записи, чтобы не мешать работе преподавателей.
+    """
+
+    def __init__(self, db_path, interval=MAINTENANCE_INTERVAL, idle_seconds=IDLE_SECONDS,
+                 poll_interval=POLL_INTERVAL, tasks=MAINTENANCE_TASKS):
+        self.db_path = db_path
+        self.interval = interval
+        self.idle_seconds = idle_seconds
+        self.poll_interval = poll_interval
+        _check_tasks(tasks)
+        self.tasks = tasks
+        self.last_report = None
+        self._last_run = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Запуск фонового обслуживания"""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='MaintenanceScheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Остановка фонового обслуживания (текущая задача завершается)"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def is_running(self):
+        """Проверка, выполняется ли обслуживание"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        """Цикл проверки простоя, выполняется в фоновом потоке"""
+        try:
+            # Задачи выполняются этим же подключением: его собственная запись
+            # не меняет data_version и не считается активностью
+            connection = sqlite3.connect(self.db_path, isolation_level=None)
+        except sqlite3.Error as e:
+            print(f"✗ Обслуживание базы данных не запущено: {e}")
+            return
+
+        state = {'version': None, 'changed_at': time.monotonic()}
+
+        def is_idle():
+            # Запись другим подключением меняет data_version этого подключения
+            version = connection.execute("PRAGMA data_version").fetchone()[0]
+            if version != state['version']:
+                state['version'] = version
+                state['changed_at'] = time.monotonic()
+            return time.monotonic() - state['changed_at'] >= self.idle_seconds and not self._stop_event.is_set()
+
+        try:
+            while not self._stop_event.wait(self.poll_interval):
+                try:
+                    due = self._last_run is None or time.monotonic() - self._last_run >= self.interval
+                    if is_idle() and due:
+                        self.last_report = _run_tasks(connection, self.tasks, is_idle)
+                        self._last_run = time.monotonic()
+                except sqlite3.Error as e:
+                    # База может быть временно заблокирована - повторим на следующем шаге
+                    print(f"✗ Ошибка обслуживания базы данных: {e}")
+        finally:
+            connection.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Обслуживание базы данных журнала')
+    parser.add_argument('db_path', help='Путь к файлу базы данных')
+    parser.add_argument('tasks', nargs='*', default=list(MAINTENANCE_TASKS), choices=sorted(TASK_FUNCTIONS),
+                        help='Задачи обслуживания (по умолчанию: %(default)s)')
+    parser.add_argument('--enable-incremental-vacuum', action='store_true',
+                        help='Перевести базу в режим auto_vacuum = INCREMENTAL (полный VACUUM)')
+    args = parser.parse_args()
+
+    if args.enable_incremental_vacuum and enable_incremental_vacuum(args.db_path):
+        print("✓ База переведена в режим auto_vacuum = INCREMENTAL")
+    run_maintenance(args.db_path, args.tasks)
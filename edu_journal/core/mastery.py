@@ -0,0 +1,106 @@
+MASTERY_THRESHOLD = 3  # Минимальная оценка, при которой компетенция считается освоенной
+
+
+class MasteryMatrix:
+    """Разреженная карта освоения компетенций: студенты группы × компетенции
+
+    Хранятся только ячейки, по которым есть оценки, в словаре
+    {(id студента, id компетенции): (id оценки, оценка, процент, дата)},
+    поэтому память и время заполнения зависят от количества оценок, а не
+    от произведения студентов на компетенции. refresh() пересчитывает
+    ячейки только студентов, чьи оценки изменились с прошлой синхронизации.
+    """
+
+    def __init__(self, db, group_name, mode='latest', competency_type=None):
+        self.db = db
+        self.group_name = group_name
+        self.mode = mode
+        self.competency_type = competency_type
+        self.students = []
+        self.competencies = []
+        self.cells = {}
+        self.student_rows = {}  # Номер строки по id студента
+        self.competency_columns = {}  # Номер столбца по id компетенции
+        self.grade_cells = {}  # Ячейка по id выбранной в нее оценки
+        self.change_seq = None
+
+    def load(self):
+        """Полная загрузка карты одним снимком"""
+        data = self.db.get_mastery_matrix(self.group_name, self.mode, self.competency_type)
+        self.students = data['students']
+        self.competencies = data['competencies']
+        self.student_rows = {student_id: row for row, (student_id, _) in enumerate(self.students)}
+        self.competency_columns = {competency[0]: column for column, competency in enumerate(self.competencies)}
+        self.cells = {}
+        self.grade_cells = {}
+        self._set_cells(data['cells'])
+        self.change_seq = data['change_seq']
+
+    def _set_cells(self, cells):
+        for key, cell in cells.items():
+            self.cells[key] = cell
+            self.grade_cells[cell[0]] = key
+
+    def _remove_student(self, student_id):
+        """Удаление ячеек студента, возвращает их ключи"""
+        keys = [key for key in self.cells if key[0] == student_id]
+        for key in keys:
+            del self.grade_cells[self.cells.pop(key)[0]]
+        return keys
+
+    def refresh(self):
+        """Применение изменений оценок с прошлой синхронизации
+
+        Возвращает множество ключей (id студента, id компетенции) ячеек,
+        которые могли измениться, или None, если карта перезагружена целиком.
+        """
+        if self.change_seq is None:
+            self.load()
+            return None
+
+        last_seq, changed_ids = self.db.get_grade_changes(self.change_seq)
+        if not changed_ids:
+            return set()
+
+        # Студенты новых и измененных оценок, а также студенты ячеек,
+        # в которые была выбрана удаленная или переданная оценка
+        student_ids = self.db.get_grade_students(changed_ids)
+        student_ids.update(self.grade_cells[grade_id][0] for grade_id in changed_ids
+                           if grade_id in self.grade_cells)
+        student_ids &= self.student_rows.keys()
+
+        changed = set()
+        for student_id in student_ids:
+            changed.update(self._remove_student(student_id))
+        cells = self.db.get_mastery_cells(self.group_name, self.mode, self.competency_type, student_ids) if student_ids else {}
+        if any(key[1] not in self.competency_columns for key in cells):
+            # Оценка по компетенции, которой еще нет среди столбцов
+            self.load()
+            return None
+        self._set_cells(cells)
+        changed.update(cells)
+        self.change_seq = last_seq
+        return changed
+
+    def cell(self, row, column):
+        """Ячейка по номерам строки и столбца или None"""
+        return self.cells.get((self.students[row][0], self.competencies[column][0]))
+
+    def position(self, key):
+        """Номера строки и столбца ячейки по ключу"""
+        return self.student_rows[key[0]], self.competency_columns[key[1]]
+
+    def is_mastered(self, student_id, competency_id):
+        """Освоена ли компетенция студентом"""
+        cell = self.cells.get((student_id, competency_id))
+        return cell is not None and cell[1] >= MASTERY_THRESHOLD
+
+    def coverage(self):
+        """Доля студентов группы, освоивших каждую компетенцию {id компетенции: доля}"""
+        if not self.students:
+            return {}
+        mastered = dict.fromkeys(self.competency_columns, 0)
+        for (_, competency_id), cell in self.cells.items():
+            if cell[1] >= MASTERY_THRESHOLD:
+                mastered[competency_id] += 1
+        return {competency_id: count / len(self.students) for competency_id, count in mastered.items()}
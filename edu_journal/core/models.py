@@ -0,0 +1,162 @@
+class FrozenModel:
+    """Базовый класс неизменяемых моделей со слотами
+
+    Поля перечисляются в __slots__ наследника и задаются только в __init__
+    через _set. Экземпляры без __dict__ занимают меньше памяти, сравниваются
+    по значениям полей и могут быть ключами словарей.
+    """
+    __slots__ = ()
+
+    def _set(self, **values):
+        """Установка полей при создании объекта"""
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} нельзя изменять, используйте _replace()")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} нельзя изменять")
+
+    def _values(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def _replace(self, **changes):
+        """Копия объекта с измененными полями"""
+        copy = object.__new__(type(self))
+        for name in self.__slots__:
+            object.__setattr__(copy, name, changes.pop(name, getattr(self, name)))
+        if changes:
+            raise AttributeError(f"Неизвестные поля {type(self).__name__}: {', '.join(changes)}")
+        return copy
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __hash__(self):
+        return hash((type(self), self._values()))
+
+class User(FrozenModel):
+    __slots__ = ('id', 'username', 'password', 'role', 'full_name', 'specialty', 'group_name', 'created_at')
+
+    def __init__(self, user_id, username, password, role, full_name, specialty=None, group_name=None, created_at=None):
+        self._set(id=user_id, username=username, password=password, role=role, full_name=full_name,
+                  specialty=specialty, group_name=group_name, created_at=created_at)
+
+    def __repr__(self):
+        return f"User(id={self.id}, username='{self.username}', role='{self.role}', name='{self.full_name}')"
+
+class Subject(FrozenModel):
+    __slots__ = ('id', 'name', 'code', 'specialty', 'teacher_id')
+
+    def __init__(self, subject_id, name, code, specialty, teacher_id=None):
+        self._set(id=subject_id, name=name, code=code, specialty=specialty, teacher_id=teacher_id)
+
+    def __repr__(self):
+        return f"Subject(id={self.id}, name='{self.name}', code='{self.code}')"
+
+class FgosCompetency(FrozenModel):
+    """Модель компетенции ФГОС"""
+    __slots__ = ('id', 'code', 'name', 'description', 'specialty', 'type', 'total_indicators')
+
+    def __init__(self, competency_id, code, name, description, specialty, type, total_indicators=0):
+        self._set(id=competency_id, code=code, name=name, description=description,
+                  specialty=specialty,
+                  type=type,  # ПК, ОПК, УК
+                  total_indicators=total_indicators)
+
+    def __repr__(self):
+        return f"FgosCompetency(id={self.id}, code='{self.code}', type='{self.type}')"
+
+class FgosIndicator(FrozenModel):
+    """Модель индикатора освоения ФГОС"""
+    __slots__ = ('id', 'competency_id', 'code', 'description', 'weight', 'max_score')
+
+    def __init__(self, indicator_id, competency_id, code, description, weight=1, max_score=1):
+        self._set(id=indicator_id, competency_id=competency_id, code=code, description=description,
+                  weight=weight, max_score=max_score)
+
+    def __repr__(self):
+        return f"FgosIndicator(id={self.id}, code='{self.code}', weight={self.weight})"
+
+class Grade(FrozenModel):
+    """Модель оценки с привязкой к ФГОС"""
+    __slots__ = ('id', 'student_id', 'teacher_id', 'subject_id', 'competency_id',
+                 'grade_value', 'percentage', 'comment', 'date', 'selected_indicators')
+
+    def __init__(self, grade_id, student_id, teacher_id, subject_id, competency_id,
+                 grade_value, percentage, comment, date, selected_indicators=()):
+        self._set(id=grade_id, student_id=student_id, teacher_id=teacher_id, subject_id=subject_id,
+                  competency_id=competency_id, grade_value=grade_value, percentage=percentage,
+                  comment=comment, date=date,
+                  selected_indicators=tuple(selected_indicators))  # Выбранные индикаторы
+
+    def add_indicator(self, indicator_id):
+        """Копия оценки с добавленным индикатором"""
+        return self._replace(selected_indicators=self.selected_indicators + (indicator_id,))
+
+    def __repr__(self):
+        return f"Grade(id={self.id}, student={self.student_id}, grade={self.grade_value}, date='{self.date}')"
+
+class GradeWithDetails(FrozenModel):
+    """Модель оценки с деталями для отображения"""
+    __slots__ = ('id', 'subject_name', 'competency_code', 'competency_name', 'competency_type',
+                 'grade_value', 'percentage', 'indicators', 'comment', 'date', 'teacher_name')
+
+    def __init__(self, grade_id, subject_name, competency_code, competency_name,
+                 competency_type, grade_value, percentage, indicators, comment,
+                 date, teacher_name):
+        self._set(id=grade_id, subject_name=subject_name, competency_code=competency_code,
+                  competency_name=competency_name, competency_type=competency_type,
+                  grade_value=grade_value, percentage=percentage, indicators=indicators,
+                  comment=comment, date=date, teacher_name=teacher_name)
+
+    def get_grade_description(self):
+        """Получение текстового описания оценки"""
+        if self.grade_value == 5:
+            return "Высокий уровень (75-100%)"
+        elif self.grade_value == 4:
+            return "Повышенный уровень (60-74%)"
+        elif self.grade_value == 3:
+            return "Базовый уровень (50-59%)"
+        else:
+            return "Не сформировано (0-49%)"
+
+    def __repr__(self):
+        return f"GradeWithDetails(id={self.id}, subject='{self.subject_name}', grade={self.grade_value})"
+
+class JournalEntry(FrozenModel):
+    """Модель строки журнала преподавателя"""
+    __slots__ = ('id', 'student_name', 'subject_name', 'competency_code', 'grade_value',
+                 'comment', 'date', 'percentage', 'indicators')
+
+    def __init__(self, grade_id, student_name, subject_name, competency_code, grade_value,
+                 comment, date, percentage, indicators):
+        self._set(id=grade_id, student_name=student_name, subject_name=subject_name,
+                  competency_code=competency_code, grade_value=grade_value, comment=comment,
+                  date=date, percentage=percentage, indicators=indicators)
+
+    def __repr__(self):
+        return f"JournalEntry(id={self.id}, student='{self.student_name}', grade={self.grade_value})"
+
+class CompetencyWithIndicators(FrozenModel):
+    """Модель компетенции с индикаторами"""
+    __slots__ = ('competency', 'indicators', 'total_indicators')
+
+    def __init__(self, competency, indicators):
+        indicators = tuple(indicators)
+        self._set(competency=competency, indicators=indicators, total_indicators=len(indicators))
+
+    def get_requirements_text(self):
+        """Получение текста требований для оценок"""
+        if self.total_indicators >= 8:
+            return f"Требования: 5 (6-8 из 8), 4 (5 из 8), 3 (4 из 8), 2 (0-3 из 8)"
+        elif self.total_indicators >= 6:
+            return f"Требования: 5 (5-6 из 6), 4 (4 из 6), 3 (3 из 6), 2 (0-2 из 6)"
+        else:
+            return f"Требования: 5 (86-100%), 4 (67-85%), 3 (48-66%), 2 (0-47%)"
+
+    def __repr__(self):
+        return f"CompetencyWithIndicators(competency={self.competency.code}, indicators={len(self.indicators)})"
@@ -0,0 +1,54 @@
+import hashlib
+import hmac
+import os
+
+
+HASH_ALGORITHM = 'pbkdf2_sha256'
+HASH_ITERATIONS = 200000  # Количество итераций PBKDF2
+SALT_SIZE = 16  # Размер соли, байт
+
+
+def hash_password(password, salt=None, iterations=HASH_ITERATIONS):
+    """Хэширование пароля PBKDF2-SHA256
+
+    Результат хранится в виде строки алгоритм$итерации$соль$хэш.
+    """
+    if salt is None:
+        salt = os.urandom(SALT_SIZE)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations)
+    return f"{HASH_ALGORITHM}${iterations}${salt.hex()}${digest.hex()}"
+
+
+def is_password_hash(stored):
+    """Проверка, что в базе хранится хэш, а не пароль в открытом виде"""
+    return stored.startswith(HASH_ALGORITHM + '$')
+
+
+def verify_password(password, stored):
+    """Проверка пароля по сохраненному значению
+
+    Пароли старых записей, хранящиеся в открытом виде, тоже принимаются.
+    """
+    if not is_password_hash(stored):
+        return hmac.compare_digest(password.encode('utf-8'), stored.encode('utf-8'))
+    try:
+        _, iterations, salt, expected = stored.split('$')
+        salt = bytes.fromhex(salt)
+        iterations = int(iterations)
+    except ValueError:
+        return False
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations)
+    return hmac.compare_digest(digest.hex(), expected)
+
+
+def hash_passwords(passwords, workers=None, iterations=HASH_ITERATIONS):
+    """Параллельное хэширование списка паролей
+
+    hashlib освобождает GIL на время вычисления PBKDF2, поэтому пул потоков
+    загружает все ядра без накладных расходов на запуск процессов.
+    """
+    # Пул нужен только при импорте, поэтому не загружается вместе с Database
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda password: hash_password(password, iterations=iterations), passwords))
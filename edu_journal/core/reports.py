@@ -0,0 +1,218 @@
+import argparse
+import html
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .database import connect_readonly
+from .validators import get_grade_interpretation
+
+
+REPORT_CHUNK_SIZE = 20  # Количество студентов, передаваемых процессу за один раз
+
+STUDENT_QUERY = """
+SELECT u.id, u.username, u.full_name, sp.code, u.group_name
+FROM users u
+LEFT JOIN specialties sp ON u.specialty_id = sp.id
+WHERE u.id = ? AND u.role = 'student'
+"""
+
+GRADES_QUERY = """
+SELECT s.name, fc.code, fc.name, g.grade_value, g.percentage, g.date, u.full_name, g.comment
+FROM grades g
+JOIN subjects s ON g.subject_id = s.id
+JOIN fgos_competencies fc ON g.competency_id = fc.id
+JOIN users u ON g.teacher_id = u.id
+WHERE g.student_id = ?
+ORDER BY s.name, g.date
+"""
+
+# Лучший результат по каждой компетенции специальности студента
+COVERAGE_QUERY = """
+SELECT fc.code, fc.name, MAX(g.grade_value), MAX(g.percentage), COUNT(g.id)
+FROM fgos_competencies fc
+LEFT JOIN grades g ON g.competency_id = fc.id AND g.student_id = ?
+WHERE fc.specialty_id = (SELECT specialty_id FROM users WHERE id = ?)
+GROUP BY fc.id
+ORDER BY fc.code
+"""
+
+REPORT_STYLE = """
+body { font-family: Arial, sans-serif; margin: 30px; color: #2c3e50; }
+h1 { font-size: 20px; margin-bottom: 4px; }
+table { border-collapse: collapse; width: 100%; margin: 10px 0 20px; }
+th, td { border: 1px solid #bdc3c7; padding: 5px 8px; font-size: 12px; text-align: left; }
+th { background-color: #ecf0f1; }
+.missing { color: #95a5a6; }
+.interpretation { padding: 8px; margin: 4px 0; border-left: 4px solid #3498db; background: #f8f9fa; }
+"""
+
+# Подключение текущего процесса пула, открывается инициализатором
+_worker_connection = None
+
+
+def collect_report_card(connection, student_id):
+    """Сбор данных табеля студента: оценки и покрытие компетенций ФГОС
+
+    Возвращает None, если студент не найден.
+    """
+    student = connection.execute(STUDENT_QUERY, (student_id,)).fetchone()
+    if student is None:
+        return None
+    grades = connection.execute(GRADES_QUERY, (student_id,)).fetchall()
+    coverage = connection.execute(COVERAGE_QUERY, (student_id, student_id)).fetchall()
+    return {'student': student, 'grades': grades, 'coverage': coverage}
+
+
+def render_report_card(card):
+    """Формирование HTML-табеля по данным collect_report_card"""
+    _, _, full_name, specialty, group_name = card['student']
+    e = html.escape
+
+    grade_rows = []
+    for subject, code, name, grade_value, percentage, date, teacher, _ in card['grades']:
+        grade_rows.append(
+            f"<tr><td>{e(subject)}</td><td>{e(code)} {e(name)}</td><td>{grade_value}</td>"
+            f"<td>{percentage:.1f}%</td><td>{e(str(date))}</td><td>{e(teacher)}</td></tr>"
+        )
+
+    coverage_rows = []
+    covered = 0
+    for code, name, best_grade, best_percentage, grades_count in card['coverage']:
+        if grades_count:
+            covered += 1
+            title, _ = get_grade_interpretation(best_grade)
+            coverage_rows.append(
+                f"<tr><td>{e(code)}</td><td>{e(name)}</td><td>{best_grade}</td>"
+                f"<td>{best_percentage:.1f}%</td><td>{e(title)}</td></tr>"
+            )
+        else:
+            coverage_rows.append(
+                f"<tr class='missing'><td>{e(code)}</td><td>{e(name)}</td>"
+                f"<td>-</td><td>-</td><td>Не оценивалась</td></tr>"
+            )
+
+    grade_values = [grade[3] for grade in card['grades']]
+    average = sum(grade_values) / len(grade_values) if grade_values else 0
+    total = len(card['coverage'])
+    coverage_percent = covered / total * 100 if total else 0
+
+    interpretations = []
+    for grade_value in sorted(set(grade_values), reverse=True):
+        title, text = get_grade_interpretation(grade_value)
+        interpretations.append(f"<div class='interpretation'><b>{e(title)}</b><br>{e(text)}</div>")
+
+    return f"""<!DOCTYPE html>
+<html lang="ru">
+<head>
+<meta charset="utf-8">
+<title>Табель освоения компетенций - {e(full_name)}</title>
+<style>{REPORT_STYLE}</style>
+</head>
+<body>
+<h1>Табель освоения компетенций ФГОС</h1>
+<p><b>Студент:</b> {e(full_name)}<br>
+<b>Группа:</b> {e(group_name or '')}<br>
+<b>Специальность:</b> {e(specialty or '')}</p>
+<p><b>Средний балл:</b> {average:.2f}<br>
+<b>Оценено компетенций:</b> {covered} из {total} ({coverage_percent:.1f}%)</p>
+<h2>Оценки</h2>
+<table>
+<tr><th>Предмет</th><th>Компетенция</th><th>Оценка</th><th>Процент</th><th>Дата</th><th>Преподаватель</th></tr>
+{''.join(grade_rows)}
+</table>
+<h2>Покрытие компетенций</h2>
+<table>
+<tr><th>Код</th><th>Компетенция</th><th>Лучшая оценка</th><th>Процент</th><th>Уровень</th></tr>
+{''.join(coverage_rows)}
+</table>
+<h2>Интерпретация результатов</h2>
+{''.join(interpretations)}
+</body>
+</html>
+"""
+
+
+def write_report_card(connection, student_id, output_dir):
+    """Сбор, оформление и сохранение табеля одного студента
+
+    Возвращает путь к файлу или None, если студент не найден.
+    """
+    card = collect_report_card(connection, student_id)
+    if card is None:
+        return None
+    path = os.path.join(output_dir, f"report_{student_id}.html")
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(render_report_card(card))
+    return path
+
+
+def _init_worker(db_path):
+    """Открытие подключения только для чтения в процессе пула"""
+    global _worker_connection
+    _worker_connection = connect_readonly(db_path)
+
+
+def _generate_in_worker(task):
+    """Формирование табеля в процессе пула: (id студента, путь, ошибка)"""
+    student_id, output_dir = task
+    try:
+        return student_id, write_report_card(_worker_connection, student_id, output_dir), None
+    except (sqlite3.Error, OSError) as e:
+        return student_id, None, str(e)
+
+
+def get_student_ids(db_path):
+    """Список id всех студентов"""
+    connection = connect_readonly(db_path)
+    try:
+        rows = connection.execute("SELECT id FROM users WHERE role = 'student' ORDER BY id").fetchall()
+    finally:
+        connection.close()
+    return [row[0] for row in rows]
+
+
+def generate_report_cards(db_path, output_dir, student_ids=None, workers=None, progress=None):
+    """Пакетное формирование табелей в пуле процессов
+
+    Каждый процесс пула работает со своим подключением только для чтения.
+    Ошибка по одному студенту не прерывает пакет. progress(готово, всего)
+    вызывается после каждого табеля. Возвращает словарь со списком файлов,
+    ошибками по студентам и временем работы.
+    """
+    started = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    if student_ids is None:
+        student_ids = get_student_ids(db_path)
+
+    paths = []
+    errors = {}
+    tasks = [(student_id, output_dir) for student_id in student_ids]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(db_path,)) as executor:
+        results = executor.map(_generate_in_worker, tasks, chunksize=REPORT_CHUNK_SIZE)
+        for done, (student_id, path, error) in enumerate(results, 1):
+            if error is not None:
+                errors[student_id] = error
+            elif path is None:
+                errors[student_id] = "Студент не найден"
+            else:
+                paths.append(path)
+            if progress:
+                progress(done, len(tasks))
+
+    return {'paths': paths, 'errors': errors, 'elapsed': time.perf_counter() - started}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Пакетное формирование табелей освоения компетенций')
+    parser.add_argument('db_path', help='Путь к файлу базы данных')
+    parser.add_argument('output_dir', help='Каталог для HTML-табелей')
+    parser.add_argument('--workers', type=int, default=None, help='Количество процессов')
+    args = parser.parse_args()
+
+    result = generate_report_cards(args.db_path, args.output_dir, workers=args.workers)
+    print(f"✓ Сформировано табелей: {len(result['paths'])} за {result['elapsed']:.1f} с")
+    for student_id, error in result['errors'].items():
+        print(f"✗ Студент {student_id}: {error}")
@@ -0,0 +1,122 @@
+import random
+import time
+from datetime import date, timedelta
+
+from .passwords import hash_password
+from .validators import calculate_grade_by_count
+
+
+SYNTHETIC_PASSWORD = 'synthetic'
+GENERATE_CHUNK_SIZE = 5000  # Количество оценок в одной транзакции генерации
+STUDENTS_PER_GROUP = 25
+GROUPS_PER_TEACHER = 4
+
+LAST_NAMES = ['Иванов', 'Петров', 'Сидоров', 'Смирнов', 'Кузнецов', 'Попов', 'Васильев',
+              'Соколов', 'Михайлов', 'Новиков', 'Федоров', 'Морозов', 'Волков', 'Алексеев']
+FIRST_NAMES = ['Александр', 'Дмитрий', 'Максим', 'Сергей', 'Андрей', 'Алексей', 'Артем',
+               'Илья', 'Кирилл', 'Михаил', 'Никита', 'Матвей', 'Роман', 'Егор']
+MIDDLE_NAMES = ['Александрович', 'Дмитриевич', 'Сергеевич', 'Андреевич', 'Алексеевич',
+                'Иванович', 'Петрович', 'Михайлович', 'Николаевич', 'Владимирович']
+
+COMMENT_PHRASES = [
+    'Студент выполнил практическое задание по компетенции {code} в установленный срок.',
+    'Показал умение применять теоретические знания при решении профессиональных задач.',
+    'Работа оформлена в соответствии с требованиями, расчеты выполнены без ошибок.',
+    'Требуется дополнительная практика при работе с нестандартными ситуациями.',
+    'Проявил самостоятельность и инициативу, аргументированно защитил принятые решения.',
+    'Допущены отдельные неточности, исправленные после замечаний преподавателя.',
+]
+
+# Доля выбранных индикаторов: большинство оценок - уверенное освоение
+SELECTION_SHARES = [0.25, 0.4, 0.5, 0.6, 0.7, 0.75, 0.8, 0.9, 1.0]
+SELECTION_WEIGHTS = [1, 2, 4, 6, 8, 8, 7, 5, 3]
+
+
+def _full_name(rng):
+    """Случайное ФИО"""
+    return f"{rng.choice(LAST_NAMES)} {rng.choice(FIRST_NAMES)} {rng.choice(MIDDLE_NAMES)}"
+
+
+def _comment(rng, code):
+    """Комментарий длиной не менее 100 символов из типовых фраз"""
+    phrases = rng.sample(COMMENT_PHRASES, 3)
+    return ' '.join(phrases).format(code=code)
+
+
+def generate_users(db, students, rng):
+    """Создание групп, студентов и преподавателей
+
+    Возвращает (список id студентов, список id преподавателей).
+    """
+    password = hash_password(SYNTHETIC_PASSWORD, salt=b'synthetic-salt', iterations=1000)
+    groups = max(1, -(-students // STUDENTS_PER_GROUP))
+    teachers = max(1, -(-groups // GROUPS_PER_TEACHER))
+    specialty = db.fetch_one("""
+        SELECT sp.code FROM fgos_competencies fc JOIN specialties sp ON fc.specialty_id = sp.id LIMIT 1
+    """)[0]
+
+    users = [(f'syn_teacher{number}', password, 'teacher', _full_name(rng), specialty, 'Преподаватель')
+             for number in range(1, teachers + 1)]
+    users.extend(
+        (f'syn_student{number}', password, 'student', _full_name(rng), specialty,
+         f'Группа С-{(number - 1) // STUDENTS_PER_GROUP + 1}')
+        for number in range(1, students + 1)
+    )
+    db.upsert_users(users)
+
+    rows = db.fetch_all("SELECT id, role FROM users WHERE username LIKE 'syn\\_%' ESCAPE '\\' ORDER BY id")
+    return ([user_id for user_id, role in rows if role == 'student'],
+            [user_id for user_id, role in rows if role == 'teacher'])
+
+
+def iter_synthetic_grades(rng, grades, student_ids, teacher_ids, subject_ids, competencies, indicators):
+    """Генерация оценок с правдоподобным выбором индикаторов
+
+    competencies - список (id, код), indicators - {id компетенции: [id индикаторов]}.
+    """
+    start = date(2024, 1, 9)
+    for number in range(grades):
+        student_index = number % len(student_ids)
+        student_id = student_ids[student_index]
+        teacher_id = teacher_ids[(student_index // STUDENTS_PER_GROUP) // GROUPS_PER_TEACHER % len(teacher_ids)]
+        competency_id, code = rng.choice(competencies)
+        available = indicators[competency_id]
+        share = rng.choices(SELECTION_SHARES, SELECTION_WEIGHTS)[0]
+        selected = sorted(rng.sample(available, max(1, round(len(available) * share))))
+        grade_value, percentage = calculate_grade_by_count(len(selected), len(available))
+        grade_date = (start + timedelta(days=rng.randrange(0, 150))).isoformat()
+        grade = (student_id, teacher_id, rng.choice(subject_ids), competency_id,
+                 grade_value, percentage, _comment(rng, code), grade_date)
+        yield grade, selected
+
+
+def generate_dataset(db, students=100, grades=1000, seed=0, chunk_size=GENERATE_CHUNK_SIZE):
+    """Заполнение базы синтетическими студентами и оценками
+
+    При одинаковых seed и размерах данные совпадают. Использует справочники
+    предметов, компетенций и индикаторов, созданные init_database.
+    Возвращает словарь со списками id и временем генерации.
+    """
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    student_ids, teacher_ids = generate_users(db, students, rng)
+
+    subject_ids = [row[0] for row in db.fetch_all("SELECT id FROM subjects ORDER BY id")]
+    indicators = {}
+    for indicator_id, competency_id in db.fetch_all(
+            "SELECT id, competency_id FROM fgos_indicators ORDER BY id"):
+        indicators.setdefault(competency_id, []).append(indicator_id)
+    competencies = [(competency_id, code) for competency_id, code in db.fetch_all(
+        "SELECT id, code FROM fgos_competencies ORDER BY id") if competency_id in indicators]
+
+    generated = iter_synthetic_grades(rng, grades, student_ids, teacher_ids,
+                                      subject_ids, competencies, indicators)
+    while True:
+        chunk = [grade for _, grade in zip(range(chunk_size), generated)]
+        if not chunk:
+            break
+        db.add_grades_bulk(chunk)
+
+    elapsed = time.perf_counter() - started
+    print(f"✓ Сгенерировано студентов: {len(student_ids)}, оценок: {grades} за {elapsed:.1f} с")
+    return {'student_ids': student_ids, 'teacher_ids': teacher_ids, 'elapsed': elapsed}
@@ -0,0 +1,74 @@
+from .cache import LRUCache
+
+
+DEFAULT_WINDOW = 3  # Количество оценок в скользящем среднем
+DEFAULT_LAST = 10  # Количество последних оценок в ряду
+TRENDS_CACHE_SIZE = 64  # Количество рядов динамики в кэше
+
+
+def build_series(rows):
+    """Группировка строк get_grade_trends в ряды динамики
+
+    Возвращает список словарей: key, label, points - [(id оценки, дата,
+    оценка, процент, скользящее среднее)], rolling_avg - последнее
+    скользящее среднее, improvement - его прирост за окно (None, если
+    оценок в ряду меньше окна).
+    """
+    series = []
+    for series_key, label, grade_id, date, grade_value, percentage, rolling_avg, improvement in rows:
+        if not series or series[-1]['key'] != series_key:
+            series.append({'key': series_key, 'label': label, 'points': []})
+        current = series[-1]
+        current['points'].append((grade_id, date, grade_value, percentage, rolling_avg))
+        current['rolling_avg'] = rolling_avg
+        current['improvement'] = improvement
+    return series
+
+
+class TrendAnalyzer:
+    """Ряды динамики оценок студентов с кэшированием результатов
+
+    Рассчитанные ряды хранятся в LRU-кэше вместе с точкой синхронизации и
+    множеством оценок студента. При повторном запросе по журналу
+    grade_changes проверяется, затронули ли изменения этого студента;
+    если нет, ряды возвращаются из кэша без повторного просмотра истории.
+    """
+
+    def __init__(self, db, cache_size=TRENDS_CACHE_SIZE):
+        self.db = db
+        self.cache = LRUCache(cache_size)
+
+    def trends(self, student_id, group_by='competency', window=DEFAULT_WINDOW, last=DEFAULT_LAST):
+        """Ряды динамики студента (формат build_series)"""
+        key = (student_id, group_by, window, last)
+        entry = self.cache.get(key)
+        if entry is not None and not self._is_stale(entry, student_id):
+            return entry['series']
+
+        with self.db.read_transaction():
+            change_seq = self.db.get_change_seq()
+            rows = self.db.get_grade_trends(student_id, group_by, window, last)
+            grade_ids = self.db.get_student_grade_ids(student_id)
+        series = build_series(rows)
+        self.cache.put(key, {'change_seq': change_seq, 'grade_ids': grade_ids, 'series': series})
+        return series
+
+    def _is_stale(self, entry, student_id):
+        """Проверка, менялись ли оценки студента после расчета рядов"""
+        last_seq, changed_ids = self.db.get_grade_changes(entry['change_seq'])
+        if not changed_ids:
+            return False
+        # Удаленные оценки ищутся среди известных, новые и измененные - в базе
+        if entry['grade_ids'].intersection(changed_ids) or student_id in self.db.get_grade_students(changed_ids):
+            return True
+        entry['change_seq'] = last_seq
+        return False
+
+    def invalidate(self, student_id=None):
+        """Сброс кэша студента или всего кэша"""
+        if student_id is None:
+            self.cache.clear()
+            return
+        for key in self.cache.keys():
+            if key[0] == student_id:
+                self.cache.invalidate(key)
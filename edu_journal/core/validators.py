@@ -1,9 +1,4 @@
-import pytest
-import sys
-import os
-
-# Добавляем путь к исходному коду
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from datetime import datetime
 
 def validate_comment(comment, min_length=100):
     """Валидация комментария"""
@@ -14,22 +9,65 @@ def validate_comment(comment, min_length=100):
     # Преподаватель может писать комментарии без указания кодов
     return True, "OK"
 
-def validate_indicators(selected_indicators, total_indicators):
-    """Валидация выбранных индикаторов"""
-    if not selected_indicators:
-        return False, "Выберите хотя бы один индикатор освоения"
-    
-    selected_count = len(selected_indicators)
-    percentage = (selected_count / total_indicators) * 100 if total_indicators > 0 else 0
+def _indicators_count_error(selected_count, total_indicators):
+    """Текст ошибки по количеству выбранных индикаторов или None"""
+    if selected_count == 0:
+        return "Выберите хотя бы один индикатор освоения"
     
     # Проверка минимального количества для оценки 3
     if total_indicators >= 8 and selected_count < 4:
-        return False, f"Для получения оценки 3 необходимо выбрать минимум 4 индикатора из {total_indicators}"
+        return f"Для получения оценки 3 необходимо выбрать минимум 4 индикатора из {total_indicators}"
     elif total_indicators >= 6 and selected_count < 3:
-        return False, f"Для получения оценки 3 необходимо выбрать минимум 3 индикатора из {total_indicators}"
+        return f"Для получения оценки 3 необходимо выбрать минимум 3 индикатора из {total_indicators}"
+    return None
+
+def validate_indicators(selected_indicators, total_indicators):
+    """Валидация выбранных индикаторов"""
+    selected_count = len(selected_indicators) if selected_indicators else 0
+    error = _indicators_count_error(selected_count, total_indicators)
+    if error:
+        return False, error
     
+    percentage = (selected_count / total_indicators) * 100 if total_indicators > 0 else 0
     return True, f"Выбрано {selected_count} из {total_indicators} индикаторов ({percentage:.1f}%)"
 
+def validate_comments_batch(comments, min_length=100):
+    """Пакетная валидация комментариев
+
+    Возвращает список (индекс, сообщение) только для ошибочных значений.
+    """
+    message = f"Комментарий должен быть не менее {min_length} символов"
+    return [(index, message) for index, comment in enumerate(comments)
+            if comment is None or len(comment) < min_length]
+
+def validate_indicators_batch(selected_counts, total_counts):
+    """Пакетная валидация количества выбранных индикаторов
+
+    Возвращает список (индекс, сообщение) только для ошибочных значений.
+    """
+    errors = []
+    for index, (selected_count, total_indicators) in enumerate(zip(selected_counts, total_counts)):
+        error = _indicators_count_error(selected_count, total_indicators)
+        if error:
+            errors.append((index, error))
+    return errors
+
+def validate_dates_batch(dates):
+    """Пакетная валидация дат в формате ГГГГ-ММ-ДД
+
+    Возвращает список (индекс, сообщение) только для ошибочных значений.
+    """
+    errors = []
+    for index, value in enumerate(dates):
+        try:
+            # strptime допускает 2024-1-5, в базе хранится только 2024-01-05
+            valid = datetime.strptime(value or '', '%Y-%m-%d').strftime('%Y-%m-%d') == value
+        except ValueError:
+            valid = False
+        if not valid:
+            errors.append((index, f"Неверная дата: {value!r}, ожидается ГГГГ-ММ-ДД"))
+    return errors
+
 def calculate_grade_from_percentage(percentage):
     """Расчет оценки из процента освоения"""
     if percentage >= 86:
@@ -51,6 +89,25 @@ def get_grade_description(grade_value):
     }
     return descriptions.get(grade_value, "Не определена")
 
+GRADE_INTERPRETATIONS = {
+    5: ("Высокий уровень освоения (86-100%)",
+        "Студент демонстрирует полное понимание компетенции, способен творчески применять знания "
+        "в новых ситуациях, проявляет инициативу и самостоятельность."),
+    4: ("Повышенный уровень освоения (67-85%)",
+        "Студент уверенно применяет компетенцию в типовых ситуациях, понимает основные принципы, "
+        "но может испытывать затруднения в нестандартных условиях."),
+    3: ("Базовый уровень освоения (48-66%)",
+        "Студент освоил основные элементы компетенции, но требуется дополнительная практика "
+        "и поддержка для уверенного применения."),
+    2: ("Компетенция не сформирована (0-47%)",
+        "Требуется дополнительное обучение и практика. Рекомендуется индивидуальная работа "
+        "с преподавателем и дополнительные задания."),
+}
+
+def get_grade_interpretation(grade_value):
+    """Получение интерпретации оценки: (заголовок, пояснение)"""
+    return GRADE_INTERPRETATIONS.get(grade_value, GRADE_INTERPRETATIONS[2])
+
 def validate_competency_data(competency_code, competency_name):
     """Валидация данных компетенции"""
     if not competency_code:
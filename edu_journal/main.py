@@ -1,6 +1,9 @@
+import os
 import sys
 from PyQt5.QtWidgets import QApplication
-from database import Database
+from core.backup import BackupService
+from core.database import Database
+from core.maintenance import MaintenanceScheduler
 from ui.login_window import LoginWindow
 from ui.student_window import StudentWindow
 from ui.teacher_window import TeacherWindow
@@ -10,6 +13,11 @@ class EduJournalApp:
     def __init__(self):
         self.app = QApplication(sys.argv)
         self.db = Database()
+        # Резервные копии и контрольные точки WAL в фоне, снимки рядом с базой
+        backup_dir = os.path.join(os.path.dirname(os.path.abspath(self.db.db_path)), 'backups')
+        self.backup_service = BackupService(self.db.db_path, backup_dir)
+        # Статистика планировщика и свободные страницы - в периоды простоя
+        self.maintenance = MaintenanceScheduler(self.db.db_path)
         self.login_window = None
         self.main_window = None
         
@@ -30,7 +38,13 @@ class EduJournalApp:
     def run(self):
         """Запуск приложения"""
         self.show_login()
-        return self.app.exec_()
+        self.backup_service.start()
+        self.maintenance.start()
+        try:
+            return self.app.exec_()
+        finally:
+            self.maintenance.stop()
+            self.backup_service.stop()
 
 
 if __name__ == '__main__':
@@ -8,9 +8,9 @@ from pathlib import Path
 # Добавляем путь к исходному коду
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from database import Database
-from models import User, Subject, FgosCompetency, FgosIndicator, Grade, GradeWithDetails, CompetencyWithIndicators
-import validators
+from core.database import Database
+from core.models import User, Subject, FgosCompetency, FgosIndicator, Grade, GradeWithDetails, CompetencyWithIndicators
+from core import validators
 
 
 @pytest.fixture
@@ -3,19 +3,41 @@ import sqlite3
 import os
 import tempfile
 import sys
+import subprocess
+import threading
+import csv
+import zipfile
+from datetime import date, datetime
 from pathlib import Path
 
 # Добавляем путь к исходному коду
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 # Импорт моделей и классов
-from database import Database
-from models import User, Subject, FgosCompetency, FgosIndicator, Grade, GradeWithDetails, CompetencyWithIndicators
-from validators import (
+from core.database import (
+    MAX_INDICATOR_BITS, Database, academic_year, academic_year_range, grade_filter_sql, normalize_date, semester_range
+)
+from core.backup import BackupService, backup_database, checkpoint, checkpoint_mode, list_snapshots, rotate_snapshots, snapshot_path
+from core.cache import LRUCache
+from cli import main as cli_main, recompute_grades
+from core.change_watcher import ChangeWatcher
+from core.reports import collect_report_card, generate_report_cards, render_report_card
+from core.importers import import_grades, import_roster
+from core.maintenance import MaintenanceScheduler, enable_incremental_vacuum, purge_grades, retention_cutoff, run_maintenance
+from core.passwords import hash_password, verify_password
+from core.synthetic import generate_dataset
+from core import analytics, importers
+from core.analytics import GradeStore, indicator_gaps
+from core.mastery import MasteryMatrix
+from core.trends import TrendAnalyzer, build_series
+from core.export import JOURNAL_COLUMNS, count_journal_rows, export_journal, iter_journal_rows
+from core.models import User, Subject, FgosCompetency, FgosIndicator, Grade, GradeWithDetails, CompetencyWithIndicators, JournalEntry
+from core.validators import (
     validate_comment, validate_indicators, validate_competency_data,
     validate_indicator_data, calculate_percentage_from_indicators,
     calculate_grade_by_count, calculate_grade_from_percentage,
-    get_grade_requirements, get_grade_description
+    get_grade_requirements, get_grade_description, get_grade_interpretation,
+    validate_comments_batch, validate_indicators_batch, validate_dates_batch
 )
 
 # ============================================================================
@@ -147,31 +169,35 @@ def sample_data(db):
     cursor.execute("DELETE FROM subjects")
     cursor.execute("DELETE FROM users")
     
+    # Специальность из справочника
+    cursor.execute("SELECT id FROM specialties WHERE code = '15.02.01'")
+    specialty_id = cursor.fetchone()[0]
+    
     # Добавляем тестовых пользователей
     cursor.execute("""
-    INSERT INTO users (username, password, role, full_name, specialty, group_name) 
+    INSERT INTO users (username, password, role, full_name, specialty_id, group_name) 
     VALUES 
-        ('test_teacher', 'pass123', 'teacher', 'Иванов И.И.', '15.02.01', NULL),
-        ('test_student1', 'pass123', 'student', 'Петров П.П.', '15.02.01', 'Группа 101'),
-        ('test_student2', 'pass123', 'student', 'Сидоров С.С.', '15.02.01', 'Группа 101')
-    """)
+        ('test_teacher', 'pass123', 'teacher', 'Иванов И.И.', ?1, NULL),
+        ('test_student1', 'pass123', 'student', 'Петров П.П.', ?1, 'Группа 101'),
+        ('test_student2', 'pass123', 'student', 'Сидоров С.С.', ?1, 'Группа 101')
+    """, (specialty_id,))
     
     # Добавляем предметы
     cursor.execute("""
-    INSERT INTO subjects (name, code, specialty, teacher_id) 
+    INSERT INTO subjects (name, code, specialty_id, teacher_id) 
     VALUES 
-        ('Математика', 'МАТ-101', '15.02.01', 1),
-        ('Программирование', 'ПРОГ-102', '15.02.01', 1)
-    """)
+        ('Математика', 'МАТ-101', ?1, 1),
+        ('Программирование', 'ПРОГ-102', ?1, 1)
+    """, (specialty_id,))
     
     # Добавляем компетенции
     cursor.execute("""
-    INSERT INTO fgos_competencies (code, name, description, specialty, type) 
+    INSERT INTO fgos_competencies (code, name, description, specialty_id, type) 
     VALUES 
-        ('ПК 1.1', 'Компетенция 1.1', 'Описание ПК 1.1', '15.02.01', 'ПК'),
-        ('ОПК 2.1', 'Компетенция 2.1', 'Описание ОПК 2.1', '15.02.01', 'ОПК'),
-        ('УК 3.1', 'Компетенция 3.1', 'Описание УК 3.1', '15.02.01', 'УК')
-    """)
+        ('ПК 1.1', 'Компетенция 1.1', 'Описание ПК 1.1', ?1, 'ПК'),
+        ('ОПК 2.1', 'Компетенция 2.1', 'Описание ОПК 2.1', ?1, 'ОПК'),
+        ('УК 3.1', 'Компетенция 3.1', 'Описание УК 3.1', ?1, 'УК')
+    """, (specialty_id,))
     
     # Добавляем индикаторы для каждой компетенции
     # Получаем ID компетенций
@@ -233,9 +259,7 @@ def sample_indicator():
 @pytest.fixture
 def sample_grade():
     """Фикстура для создания тестовой оценки"""
-    grade = Grade(1, 2, 1, 1, 1, 5, 88, 'Комментарий' * 10, '2024-01-01')
-    grade.selected_indicators = [1, 2, 3]
-    return grade
+    return Grade(1, 2, 1, 1, 1, 5, 88, 'Комментарий' * 10, '2024-01-01', selected_indicators=[1, 2, 3])
 
 
 @pytest.fixture
@@ -401,6 +425,39 @@ class TestCompetencyWithIndicatorsModel:
         assert len(competency_with_indicators.indicators) == 1
         assert competency_with_indicators.total_indicators == 1
 
+
+class TestFrozenModels:
+    """Тесты неизменяемых моделей и их создания из строк базы данных"""
+    
+    def test_immutable(self, sample_grade, sample_user):
+        """Тест запрета изменения полей"""
+        with pytest.raises(AttributeError):
+            sample_user.role = 'student'
+        with pytest.raises(AttributeError):
+            sample_user.extra = 1
+        assert not hasattr(sample_user, '__dict__')
+        
+        updated = sample_grade.add_indicator(4)
+        assert updated.selected_indicators == (1, 2, 3, 4)
+        assert sample_grade.selected_indicators == (1, 2, 3)
+        assert sample_grade._replace(selected_indicators=(1, 2, 3)) == sample_grade
+    
+    def test_models_from_rows(self, db):
+        """Тест построения моделей по именам столбцов"""
+        rows = db.get_student_grades_with_details(2)
+        grades = db.get_student_grades_with_details(2, as_models=True)
+        
+        assert len(grades) == len(rows)
+        assert all(isinstance(grade, GradeWithDetails) for grade in grades)
+        assert [grade.id for grade in grades] == [row[0] for row in rows]
+        assert grades[0].teacher_name == rows[0][8]
+        assert grades[0].indicators == rows[0][9]
+        assert grades[0].competency_type in ('ПК', 'ОПК', 'УК')
+        
+        journal = db.get_teacher_journal(1, as_models=True)
+        assert isinstance(journal[0], JournalEntry)
+        assert journal[0].student_name == db.get_teacher_journal(1)[0][1]
+
 # ============================================================================
 # ТЕСТЫ ВАЛИДАТОРОВ
 # ============================================================================
@@ -571,8 +628,8 @@ class TestDatabaseCRUDOperations:
         cursor = db.connection.cursor()
         
         cursor.execute("""
-        INSERT INTO users (username, password, role, full_name, specialty, group_name)
-        VALUES (?, ?, ?, ?, ?, ?)
+        INSERT INTO users (username, password, role, full_name, specialty_id, group_name)
+        VALUES (?, ?, ?, ?, (SELECT id FROM specialties WHERE code = ?), ?)
         """, ('new_user', 'password123', 'student', 'Новый Пользователь', '15.02.01', 'Группа 101'))
         
         db.connection.commit()
@@ -594,6 +651,1183 @@ class TestDatabaseCRUDOperations:
         assert len(students) == 2
         assert len(teachers) == 1
 
+
+class TestFullTextSearch:
+    """Тесты полнотекстового поиска оценок"""
+    
+    def test_search_by_comment_and_indicator(self, db):
+        """Тест поиска по комментарию и по описанию индикатора"""
+        results = db.search_grades('команде')
+        assert len(results) == 1
+        assert '<b>команде</b>' in results[0][6]
+        
+        results = db.search_grades('самообразования')
+        assert [result[0] for result in results] == [3]
+    
+    def test_search_index_follows_changes(self, db):
+        """Тест синхронизации индекса с изменениями оценок и индикаторов"""
+        db.execute_query("UPDATE fgos_indicators SET description = 'Изучил литературу' WHERE code = 'УК 3.1.1'")
+        assert [result[0] for result in db.search_grades('литературу')] == [3]
+        
+        db.execute_query("DELETE FROM grades WHERE id = 3")
+        assert db.search_grades('литературу') == []
+    
+    def test_search_with_filters(self, db):
+        """Тест поиска с фильтром по студенту"""
+        cursor = db.connection.cursor()
+        cursor.execute("SELECT id FROM users WHERE username = 'student2'")
+        student2_id = cursor.fetchone()[0]
+        
+        assert db.search_grades('студент', {'student_id': student2_id})[0][1] == 'Сидорова Анна Сергеевна'
+        with pytest.raises(ValueError):
+            db.search_grades('студент', {'college': 1})
+    
+    @pytest.mark.parametrize('fts_enabled', [True, False])
+    def test_search_ids_not_limited(self, db, fts_enabled):
+        """Тест полного набора найденных оценок при ограниченном списке результатов"""
+        generate_dataset(db, students=10, grades=200)
+        db.fts_enabled = fts_enabled
+        expected = {row[0] for row in db.search_grades('компетенции', limit=None)}
+        assert len(expected) > 50
+        assert len(db.search_grades('компетенции', limit=50)) == 50
+        assert db.search_grade_ids('компетенции') == expected
+        assert db.search_grade_ids('компетенции', {'student_id': 2}) == {
+            row[0] for row in db.search_grades('компетенции', {'student_id': 2}, limit=None)}
+        assert db.search_grade_ids('   ') == set()
+
+class TestChangeTracking:
+    """Тесты журнала изменений для инкрементального обновления"""
+    
+    def test_changes_since_sync_point(self, db):
+        """Тест получения только измененных оценок"""
+        sync_seq = db.get_change_seq()
+        assert db.get_grade_changes(sync_seq) == (sync_seq, [])
+        
+        db.execute_query("UPDATE grades SET grade_value = 4 WHERE id = 1")
+        db.execute_query("DELETE FROM grades WHERE id = 2")
+        last_seq, changed_ids = db.get_grade_changes(sync_seq)
+        
+        assert last_seq > sync_seq
+        assert changed_ids == [1, 2]
+        assert db.get_grade_changes(last_seq) == (last_seq, [])
+    
+    def test_journal_for_changed_ids(self, db):
+        """Тест выборки журнала по списку измененных оценок"""
+        db.execute_query("DELETE FROM grades WHERE id = 2")
+        
+        journal = db.get_teacher_journal(1, [1, 2])
+        assert [grade[0] for grade in journal] == [1]
+        assert 'Выполнил расчеты прочности деталей' in journal[0][8]
+        assert len(db.get_teacher_journal(1)) == 2
+
+class TestExternalChanges:
+    """Тесты отслеживания изменений из других подключений"""
+    
+    def test_has_external_changes(self, db, temp_db_path):
+        """Тест: собственные фиксации не считаются внешними"""
+        db.has_external_changes()
+        db.execute_query("UPDATE grades SET grade_value = 4 WHERE id = 1")
+        assert not db.has_external_changes()
+        
+        other = sqlite3.connect(temp_db_path)
+        other.execute("UPDATE grades SET grade_value = 3 WHERE id = 1")
+        other.commit()
+        other.close()
+        assert db.has_external_changes()
+        assert not db.has_external_changes()
+    
+    def test_watcher_fires_on_commit(self, db, temp_db_path):
+        """Тест вызова обработчика после фиксации в другом подключении"""
+        changed = threading.Event()
+        watcher = ChangeWatcher(temp_db_path, changed.set, interval=0.05)
+        watcher.start()
+        try:
+            assert not changed.wait(0.2)
+            db.execute_query("UPDATE grades SET grade_value = 4 WHERE id = 1")
+            assert changed.wait(2)
+        finally:
+            watcher.stop()
+        assert not watcher.is_running()
+
+class TestGradeDetailsCache:
+    """Тесты кэша и пакетной загрузки деталей оценок"""
+    
+    def test_lru_cache_eviction(self):
+        """Тест вытеснения давно не использованных записей"""
+        cache = LRUCache(max_size=2)
+        cache.put(1, 'a')
+        cache.put(2, 'b')
+        assert cache.get(1) == 'a'
+        cache.put(3, 'c')
+        
+        assert 2 not in cache
+        assert cache.get(1) == 'a' and cache.get(3) == 'c'
+        cache.invalidate(1)
+        assert cache.get(1) is None
+        assert len(cache) == 1
+    
+    def test_get_grade_details_batch(self, db):
+        """Тест загрузки деталей нескольких оценок одним запросом"""
+        details = db.get_grade_details([1, 3, 999])
+        
+        assert set(details) == {1, 3}
+        grade_info, indicators = details[1]
+        assert grade_info[2] == 'ПК 2.2'
+        assert len(indicators) == 6
+        assert indicators[0][0] == 'ПК 2.2.1'
+        assert len(details[3][1]) == 3
+
+class TestTeacherBootstrap:
+    """Тесты загрузки данных окна преподавателя одним снимком"""
+    
+    def test_bootstrap_payload(self, db):
+        """Тест состава данных для окна преподавателя"""
+        data = db.get_teacher_bootstrap(1)
+        
+        assert len(data['students']) == 4
+        assert len(data['subjects']) == 7
+        assert data['change_seq'] == db.get_change_seq()
+        assert len(data['journal']) == 3
+        
+        subject_id = data['subjects'][0][0]
+        assert data['competencies'][subject_id] == db.get_competencies_by_subject(subject_id)
+        competency_id = data['competencies'][subject_id][0][0]
+        assert data['indicators'][competency_id] == db.get_indicators_by_competency(competency_id)
+        assert not db.connection.in_transaction
+
+
+class TestJournalExport:
+    """Тесты потокового экспорта журнала"""
+    
+    def test_export_csv(self, db, tmp_path):
+        """Тест экспорта журнала преподавателя в CSV"""
+        path = str(tmp_path / 'journal.csv')
+        progress = []
+        count = export_journal(db.db_path, path, {'teacher_id': 1},
+                               lambda done, total: progress.append((done, total)))
+        
+        with open(path, encoding='utf-8-sig', newline='') as file:
+            rows = list(csv.reader(file, delimiter=';'))
+        assert count == 3
+        assert rows[0] == JOURNAL_COLUMNS
+        assert len(rows) == 4
+        assert progress[-1] == (3, 3)
+    
+    def test_iter_rows_in_chunks(self, db):
+        """Тест чтения строк порциями меньше общего количества"""
+        rows = list(iter_journal_rows(db.connection, chunk_size=1))
+        assert len(rows) == count_journal_rows(db.connection)
+        assert all(len(row) == len(JOURNAL_COLUMNS) for row in rows)
+    
+    def test_export_xlsx(self, db, tmp_path):
+        """Тест экспорта журнала в XLSX"""
+        path = str(tmp_path / 'journal.xlsx')
+        count = export_journal(db.db_path, path, {'group_name': 'Группа 101'})
+        
+        with zipfile.ZipFile(path) as archive:
+            sheet = archive.read('xl/worksheets/sheet1.xml').decode('utf-8')
+            assert '[Content_Types].xml' in archive.namelist()
+        assert count > 0
+        assert sheet.count('<row ') == count + 1
+        assert 'Группа 101' in sheet
+    
+    def test_unsupported_format(self, db, tmp_path):
+        """Тест отказа при неизвестном формате файла"""
+        with pytest.raises(ValueError):
+            export_journal(db.db_path, str(tmp_path / 'journal.pdf'))
+
+
+class TestReportCards:
+    """Тесты пакетного формирования табелей"""
+    
+    def test_interpretation(self):
+        """Тест интерпретации оценок"""
+        title, text = get_grade_interpretation(5)
+        assert 'Высокий уровень' in title
+        assert get_grade_interpretation(1) == get_grade_interpretation(2)
+    
+    def test_collect_and_render(self, db):
+        """Тест сбора данных и оформления табеля одного студента"""
+        db.execute_query("UPDATE grades SET percentage = ? WHERE id = 1", (4 / 6 * 100,))
+        card = collect_report_card(db.connection, 2)
+        assert card['student'][2] == 'Петров Петр Петрович'
+        assert len(card['grades']) == 2
+        
+        html_text = render_report_card(card)
+        assert 'Петров Петр Петрович' in html_text
+        assert 'Оценено компетенций:</b> 2 из' in html_text
+        assert '<td>66.7%</td>' in html_text and '66.666' not in html_text
+        assert collect_report_card(db.connection, 1) is None  # Преподаватель
+    
+    def test_generate_in_pool(self, db, tmp_path):
+        """Тест формирования табелей в пуле процессов"""
+        result = generate_report_cards(db.db_path, str(tmp_path), [2, 3, 999], workers=2)
+        
+        assert len(result['paths']) == 2
+        assert all(os.path.exists(path) for path in result['paths'])
+        assert list(result['errors']) == [999]
+
+
+class TestRosterImport:
+    """Тесты импорта списка пользователей"""
+    
+    def test_password_hashing(self):
+        """Тест хэширования и проверки паролей"""
+        stored = hash_password('secret', iterations=1000)
+        assert stored != 'secret'
+        assert verify_password('secret', stored)
+        assert not verify_password('wrong', stored)
+        assert verify_password('123456', '123456')  # Старые записи без хэша
+    
+    def test_import_with_errors(self, db, tmp_path):
+        """Тест импорта с ошибочными строками и обновлением существующих"""
+        path = tmp_path / 'roster.csv'
+        path.write_text(
+            'username,password,role,full_name,specialty,group_name\n'
+            'new1,pw1,student,Новиков Олег,15.02.01,Группа 103\n'
+            'new2,pw2,admin,Неверная Роль,15.02.01,Группа 103\n'
+            'new3,,student,Без Пароля,15.02.01,Группа 103\n'
+            'student1,pw4,student,Петров Петр Петрович,15.02.01,Группа 104\n'
+            'new1,pw5,student,Повтор Логина,15.02.01,Группа 103\n',
+            encoding='utf-8'
+        )
+        report = import_roster(db, str(path), chunk_size=2)
+        
+        assert report.imported == 2
+        assert [line for line, _ in report.errors] == [3, 4, 6]
+        assert db.fetch_one("SELECT group_name FROM users WHERE username = 'student1'")[0] == 'Группа 104'
+        assert db.authenticate('new1', 'pw1', 'student') is not None
+        assert db.authenticate('new1', 'pw2', 'student') is None
+        assert db.authenticate('teacher1', '123456', 'teacher') is not None
+    
+    def test_reimport_keeps_credentials(self, db, tmp_path, monkeypatch):
+        """Тест сохранения измененного пароля и роли при повторном импорте"""
+        path = tmp_path / 'roster.csv'
+        path.write_text(
+            'username,password,role,full_name,specialty,group_name\n'
+            'new1,pw1,student,Новиков Олег,15.02.01,Группа 103\n',
+            encoding='utf-8'
+        )
+        import_roster(db, str(path))
+        db.execute_query("UPDATE users SET password = ? WHERE username = 'new1'",
+                         (hash_password('changed', iterations=1000),))
+        path.write_text(
+            'username,password,role,full_name,specialty,group_name\n'
+            'new1,pw1,teacher,Новиков Олег Петрович,15.02.01,Группа 104\n',
+            encoding='utf-8'
+        )
+        
+        hashed = []
+        
+        def fast_hash(passwords, workers=None):
+            hashed.extend(passwords)
+            return [hash_password(password, iterations=1000) for password in passwords]
+        
+        monkeypatch.setattr(importers, 'hash_passwords', fast_hash)
+        assert import_roster(db, str(path)).imported == 1
+        assert hashed == []  # Пароль существующего логина не хэшируется
+        assert db.authenticate('new1', 'changed', 'student') is not None
+        assert db.authenticate('new1', 'pw1', 'student') is None
+        assert db.fetch_one("SELECT full_name, group_name FROM users WHERE username = 'new1'") == (
+            'Новиков Олег Петрович', 'Группа 104')
+        
+        import_roster(db, str(path), update_credentials=True)
+        assert hashed == ['pw1']
+        assert db.authenticate('new1', 'pw1', 'teacher') is not None
+
+
+class TestGradeImport:
+    """Тесты импорта оценок"""
+    
+    COMMENT = 'Студент выполнил все практические задания по компетенции, показал уверенное владение материалом и самостоятельность.'
+    
+    def write_grades_file(self, tmp_path):
+        """Файл с одной правильной и несколькими ошибочными строками"""
+        indicators = ';'.join(f'ПК 1.1.{number}' for number in range(1, 7))
+        path = tmp_path / 'grades.csv'
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.writer(file, delimiter=';')
+            writer.writerow(['student', 'teacher', 'subject', 'competency', 'indicators', 'comment', 'date', 'grade'])
+            writer.writerow(['student1', 'teacher1', 'МАТ-101', 'ПК 1.1', indicators, self.COMMENT, '2024-03-01', '5'])
+            writer.writerow(['student1', 'teacher1', 'МАТ-101', 'ПК 1.1', indicators, 'Коротко', '2024-03-01', ''])
+            writer.writerow(['nobody', 'teacher1', 'МАТ-101', 'ПК 1.1', indicators, self.COMMENT, '2024-03-01', ''])
+            writer.writerow(['student2', 'teacher1', 'МАТ-101', 'ПК 1.1', indicators, self.COMMENT, '2024-03-01', '3'])
+            writer.writerow(['student2', 'teacher1', 'МАТ-101', 'ПК 1.2', indicators, self.COMMENT, '2024-03-01', ''])
+            writer.writerow(['student2', 'teacher1', 'МАТ-101', 'ПК 1.1', indicators, self.COMMENT, '01.03.2024', ''])
+        return str(path)
+    
+    def test_batch_validators(self):
+        """Тест пакетных валидаторов"""
+        assert validate_comments_batch(['a' * 100, 'short', None]) == [
+            (1, 'Комментарий должен быть не менее 100 символов'),
+            (2, 'Комментарий должен быть не менее 100 символов'),
+        ]
+        assert [index for index, _ in validate_indicators_batch([4, 3, 0], [8, 8, 5])] == [1, 2]
+        assert [index for index, _ in validate_dates_batch(['2024-01-31', '2024-02-30', ''])] == [1, 2]
+    
+    def test_dry_run(self, db, tmp_path):
+        """Тест пробного прогона без записи в базу"""
+        grades_before = db.fetch_one("SELECT COUNT(*) FROM grades")[0]
+        report = import_grades(db, self.write_grades_file(tmp_path), dry_run=True)
+        
+        assert report.imported == 1
+        assert [line for line, _ in report.errors] == [3, 4, 5, 6, 7]
+        assert db.fetch_one("SELECT COUNT(*) FROM grades")[0] == grades_before
+    
+    def test_import(self, db, tmp_path):
+        """Тест записи оценок с индикаторами"""
+        report = import_grades(db, self.write_grades_file(tmp_path), chunk_size=2)
+        
+        assert report.imported == 1
+        grade = db.fetch_one("SELECT id, grade_value, percentage FROM grades WHERE date = '2024-03-01'")
+        assert grade[1:] == (5, 75)
+        assert db.fetch_one("SELECT COUNT(*) FROM grade_indicators WHERE grade_id = ?", (grade[0],))[0] == 6
+        changed_ids = db.get_grade_changes(0)[1]
+        assert grade[0] in changed_ids
+
+
+class TestSyntheticData:
+    """Тесты генератора синтетических данных"""
+    
+    def grades_snapshot(self, db):
+        """Содержимое оценок без системных полей"""
+        return db.fetch_all("""
+            SELECT g.student_id, g.competency_id, g.grade_value, g.percentage, g.comment, g.date,
+                   (SELECT COUNT(*) FROM grade_indicators gi WHERE gi.grade_id = g.id)
+            FROM grades g ORDER BY g.id
+        """)
+    
+    def test_generate_dataset(self, db):
+        """Тест объема и согласованности сгенерированных оценок"""
+        grades_before = db.fetch_one("SELECT COUNT(*) FROM grades")[0]
+        dataset = generate_dataset(db, students=30, grades=200, chunk_size=64)
+        
+        assert len(dataset['student_ids']) == 30
+        assert len(dataset['teacher_ids']) == 1
+        assert db.fetch_one("SELECT COUNT(*) FROM grades")[0] == grades_before + 200
+        indicators = db.fetch_one("""
+            SELECT COUNT(*) FROM grade_indicators gi
+            JOIN grades g ON gi.grade_id = g.id
+            JOIN fgos_indicators fi ON gi.indicator_id = fi.id
+            WHERE fi.competency_id != g.competency_id
+        """)[0]
+        assert indicators == 0
+    
+    def test_deterministic(self, temp_db_path, tmp_path):
+        """Тест совпадения данных при одинаковом seed"""
+        snapshots = []
+        for path in (temp_db_path, str(tmp_path / 'second.db')):
+            database = Database(db_path=path)
+            generate_dataset(database, students=10, grades=50, seed=7)
+            snapshots.append(self.grades_snapshot(database))
+            database.close()
+        assert snapshots[0] == snapshots[1]
+
+
+class TestGradeStore:
+    """Тесты столбцового хранилища оценок"""
+    
+    def test_aggregates_match_sql(self, db):
+        """Тест совпадения группировок с расчетом в SQL"""
+        generate_dataset(db, students=20, grades=300)
+        store = GradeStore(db)
+        assert store.load() == db.fetch_one("SELECT COUNT(*) FROM grades")[0]
+        
+        expected = dict(db.fetch_all("SELECT student_id, AVG(grade_value) FROM grades GROUP BY student_id"))
+        averages = store.group_by('student_id', 'grade_value', 'mean')
+        assert averages.keys() == expected.keys()
+        assert all(abs(averages[key] - expected[key]) < 1e-9 for key in expected)
+        
+        counts = dict(db.fetch_all("SELECT grade_value, COUNT(*) FROM grades GROUP BY grade_value"))
+        assert store.value_counts('grade_value') == counts
+        assert sum(store.histogram('percentage', [0, 48, 67, 86, 100])) == len(store)
+        assert store.group_by('competency_id', 'percentage', 'max') == dict(
+            db.fetch_all("SELECT competency_id, MAX(percentage) FROM grades GROUP BY competency_id"))
+    
+    def test_percentile(self, db):
+        """Тест перцентилей с интерполяцией"""
+        store = GradeStore(db)
+        store.load()
+        percentages = sorted(row[0] for row in db.fetch_all("SELECT percentage FROM grades"))
+        assert store.percentile('percentage', 0) == percentages[0]
+        assert store.percentile('percentage', 100) == percentages[-1]
+        assert store.percentile('percentage', 50, {'student_id': 999}) is None
+    
+    def test_incremental_refresh(self, db):
+        """Тест обновления по журналу изменений без полной перезагрузки"""
+        store = GradeStore(db)
+        store.load()
+        assert store.refresh() == 0
+        
+        db.execute_query("UPDATE grades SET grade_value = 2, percentage = 40 WHERE id = 1")
+        db.execute_query("DELETE FROM grades WHERE id = 2")
+        generate_dataset(db, students=2, grades=5)
+        
+        assert store.refresh() == 7
+        assert len(store) == db.fetch_one("SELECT COUNT(*) FROM grades")[0]
+        assert 2 not in store.positions
+        assert store.values('grade_value', {'id': 1}) == [2]
+        assert store.competency_stats(6) == db.fetch_one(
+            "SELECT AVG(percentage), COUNT(*) FROM grades WHERE competency_id = 6")
+    
+    @pytest.mark.parametrize('use_numpy', [True, False])
+    def test_fractional_percentage(self, db, monkeypatch, use_numpy):
+        """Тест дробного процента освоения (5 из 8 индикаторов) с NumPy и без него"""
+        if not use_numpy:
+            monkeypatch.setattr(analytics, 'np', None)
+        elif analytics.np is None:
+            pytest.skip("NumPy не установлен")
+        db.execute_query("UPDATE grades SET percentage = 62.5 WHERE id = 1")
+        store = GradeStore(db)
+        assert store.load() == 3
+        assert list(store.values('percentage', {'id': 1})) == [62.5]
+        assert store.competency_stats(6) == (62.5, 1)
+        assert store.percentile('percentage', 100, {'id': 1}) == 62.5
+        assert store.group_by('competency_id', 'percentage', 'max')[6] == 62.5
+
+
+class TestMasteryMatrix:
+    """Тесты карты освоения компетенций группой"""
+    
+    GROUP = 'Группа С-1'
+    
+    def expected_cells(self, db, mode):
+        """Ячейки карты, рассчитанные перебором оценок в Python"""
+        rows = db.fetch_all("""
+            SELECT g.student_id, g.competency_id, g.id, g.grade_value, g.percentage, g.date
+            FROM grades g JOIN users u ON g.student_id = u.id
+            WHERE u.group_name = ?
+        """, (self.GROUP,))
+        if mode == 'latest':
+            key = lambda row: (row[5], row[2])
+        else:
+            key = lambda row: (row[3], row[4], row[5], row[2])
+        cells = {}
+        for row in rows:
+            current = cells.get(row[:2])
+            if current is None or key(row) > key(current):
+                cells[row[:2]] = row
+        return {pair: tuple(row[2:]) for pair, row in cells.items()}
+    
+    def test_cells_match_brute_force(self, db):
+        """Тест совпадения последней и лучшей оценки с перебором"""
+        generate_dataset(db, students=20, grades=400)
+        for mode in ('latest', 'best'):
+            matrix = MasteryMatrix(db, self.GROUP, mode)
+            matrix.load()
+            assert matrix.cells == self.expected_cells(db, mode)
+            assert len(matrix.students) == 20
+            assert all(key[1] in matrix.competency_columns for key in matrix.cells)
+        
+        with pytest.raises(ValueError):
+            db.get_mastery_cells(self.GROUP, 'average')
+    
+    def test_competency_type_filter(self, db):
+        """Тест фильтра по типу компетенций"""
+        generate_dataset(db, students=5, grades=100)
+        matrix = MasteryMatrix(db, self.GROUP, competency_type='ПК')
+        matrix.load()
+        assert matrix.competencies
+        assert all(competency[3] == 'ПК' for competency in matrix.competencies)
+        assert all(key[1] in matrix.competency_columns for key in matrix.cells)
+    
+    def test_incremental_refresh(self, db):
+        """Тест обновления ячеек только измененных студентов"""
+        generate_dataset(db, students=10, grades=200)
+        matrix = MasteryMatrix(db, self.GROUP, 'best')
+        matrix.load()
+        assert matrix.refresh() == set()
+        
+        key, cell = next(iter(matrix.cells.items()))
+        db.execute_query("DELETE FROM grades WHERE id = ?", (cell[0],))
+        other_key, other_cell = list(matrix.cells.items())[-1]
+        db.execute_query("UPDATE grades SET grade_value = 5, percentage = 100 WHERE id = ?", (other_cell[0],))
+        
+        changed = matrix.refresh()
+        assert key in changed and other_key in changed
+        assert matrix.cells == self.expected_cells(db, 'best')
+        assert matrix.cells[other_key][1:3] == (5, 100)
+        assert all(grade_id == cell[0] for grade_id, cell in
+                   ((grade_id, matrix.cells[key]) for grade_id, key in matrix.grade_cells.items()))
+        assert matrix.is_mastered(*other_key)
+        assert 0 < matrix.coverage()[other_key[1]] <= 1
+
+
+class TestIndicatorBitmask:
+    """Тесты битовых масок индикаторов и анализа пробелов"""
+    
+    def expected_masks(self, db):
+        """Маски оценок, собранные по таблице grade_indicators"""
+        masks = {grade_id: 0 for (grade_id,) in db.fetch_all("SELECT id FROM grades")}
+        for grade_id, bit_index in db.fetch_all("""
+            SELECT gi.grade_id, fi.bit_index FROM grade_indicators gi
+            JOIN fgos_indicators fi ON gi.indicator_id = fi.id
+        """):
+            if grade_id in masks:
+                masks[grade_id] |= 1 << bit_index
+        return masks
+    
+    def test_bit_indexes_unique(self, db):
+        """Тест уникальности номеров битов внутри компетенции"""
+        rows = db.fetch_all("SELECT competency_id, bit_index FROM fgos_indicators")
+        assert all(bit_index is not None for _, bit_index in rows)
+        assert len(set(rows)) == len(rows)
+        
+        db.execute_query(
+            "INSERT INTO fgos_indicators (competency_id, code, description) VALUES (1, 'ПК 1.1.99', 'Новый индикатор')"
+        )
+        bits = [row[3] for row in db.get_indicator_bits(1)]
+        assert bits == sorted(set(bits)) and bits[-1] == len(bits) - 1
+    
+    def test_bit_index_limit(self, db):
+        """Тест границы номера бита: последний бит маски и отказ сверх лимита"""
+        db.execute_query("INSERT INTO fgos_competencies (code, name, type) VALUES ('ПК 9.9', 'Предельная', 'ПК')")
+        competency_id = db.fetch_one("SELECT id FROM fgos_competencies WHERE code = 'ПК 9.9'")[0]
+        insert = "INSERT INTO fgos_indicators (competency_id, code, description, bit_index) VALUES (?, ?, 'Индикатор', ?)"
+        for number in range(MAX_INDICATOR_BITS):
+            db.connection.execute(insert, (competency_id, f'ПК 9.9.{number}', None))
+        db.connection.commit()
+        assert [row[3] for row in db.get_indicator_bits(competency_id)] == list(range(MAX_INDICATOR_BITS))
+        
+        with pytest.raises(sqlite3.IntegrityError):
+            db.connection.execute(insert, (competency_id, 'ПК 9.9.63', None))
+        with pytest.raises(sqlite3.IntegrityError):
+            db.connection.execute(insert, (competency_id, 'ПК 9.9.64', MAX_INDICATOR_BITS))
+        with pytest.raises(sqlite3.IntegrityError):
+            db.connection.execute("UPDATE fgos_indicators SET bit_index = -1 WHERE competency_id = ?", (competency_id,))
+        db.connection.rollback()
+        assert db.fetch_one("SELECT COUNT(*) FROM fgos_indicators WHERE competency_id = ?", (competency_id,))[0] == MAX_INDICATOR_BITS
+        
+        # Старший допустимый бит попадает в маску и при пакетной вставке, и в триггерах
+        last_id = db.get_indicator_bits(competency_id)[-1][0]
+        grade_id, = db.add_grades_bulk([((2, 1, 1, competency_id, 2, 1.6, 'А' * 120, '2024-05-01'), [last_id])])
+        assert db.fetch_one("SELECT indicator_mask FROM grades WHERE id = ?", (grade_id,))[0] == 1 << (MAX_INDICATOR_BITS - 1)
+        db.execute_query("DELETE FROM grade_indicators WHERE grade_id = ?", (grade_id,))
+        db.execute_query("INSERT INTO grade_indicators (grade_id, indicator_id) VALUES (?, ?)", (grade_id, last_id))
+        assert db.fetch_one("SELECT indicator_mask FROM grades WHERE id = ?", (grade_id,))[0] == 1 << (MAX_INDICATOR_BITS - 1)
+    
+    def test_masks_follow_grade_indicators(self, db):
+        """Тест синхронизации масок при вставке, пакетной вставке и удалении"""
+        dataset = generate_dataset(db, students=5, grades=100)
+        competency_id, subject_id = db.fetch_one("SELECT competency_id, subject_id FROM grades LIMIT 1")
+        indicator_ids = [row[0] for row in db.get_indicators_by_competency(competency_id)[:2]]
+        db.add_grade_with_indicators({
+            'student_id': dataset['student_ids'][0], 'teacher_id': dataset['teacher_ids'][0],
+            'subject_id': subject_id, 'competency_id': competency_id,
+            'grade_value': 3, 'percentage': 50, 'comment': 'А' * 120, 'date': '2024-05-01',
+        }, indicator_ids)
+        assert dict(db.fetch_all("SELECT id, indicator_mask FROM grades")) == self.expected_masks(db)
+        
+        db.execute_query("""
+            DELETE FROM grade_indicators WHERE (grade_id, indicator_id) IN (
+                SELECT grade_id, MIN(indicator_id) FROM grade_indicators GROUP BY grade_id)
+        """)
+        assert dict(db.fetch_all("SELECT id, indicator_mask FROM grades")) == self.expected_masks(db)
+    
+    def test_indicator_gaps(self, db):
+        """Тест долей индикаторов по сравнению с соединением таблиц"""
+        generate_dataset(db, students=20, grades=400)
+        competency_id = db.fetch_one(
+            "SELECT competency_id FROM grades GROUP BY competency_id ORDER BY COUNT(*) DESC LIMIT 1")[0]
+        student_id = db.fetch_one("SELECT student_id FROM grades WHERE competency_id = ?", (competency_id,))[0]
+        
+        for filters, condition, params in [
+            (None, '', ()),
+            ({'student_id': student_id}, ' AND g.student_id = ?', (student_id,)),
+        ]:
+            gaps = indicator_gaps(db, competency_id, filters)
+            grades = db.fetch_one(f"SELECT COUNT(*) FROM grades g WHERE g.competency_id = ?{condition}",
+                                  (competency_id,) + params)[0]
+            passed = dict(db.fetch_all(f"""
+                SELECT gi.indicator_id, COUNT(DISTINCT g.id) FROM grades g
+                JOIN grade_indicators gi ON gi.grade_id = g.id
+                WHERE g.competency_id = ?{condition} GROUP BY gi.indicator_id
+            """, (competency_id,) + params))
+            assert gaps['grades'] == grades
+            assert {item['id']: item['passed'] for item in gaps['indicators']} == {
+                indicator_id: passed.get(indicator_id, 0) for indicator_id, *_ in db.get_indicator_bits(competency_id)}
+            rates = [item['pass_rate'] for item in gaps['indicators']]
+            assert rates == sorted(rates)
+            assert all(item['students_consistent'] + item['students_missing'] <= gaps['students']
+                       for item in gaps['indicators'])
+        
+        assert indicator_gaps(db, competency_id, {'student_id': 999999})['grades'] == 0
+
+
+class TestTrends:
+    """Тесты рядов динамики оценок и их кэширования"""
+    
+    def expected_series(self, db, student_id, window, last):
+        """Ряды по предметам, рассчитанные в Python по всей истории"""
+        rows = db.fetch_all(
+            "SELECT subject_id, id, grade_value FROM grades WHERE student_id = ? ORDER BY date, id",
+            (student_id,)
+        )
+        history = {}
+        for subject_id, grade_id, grade_value in rows:
+            history.setdefault(subject_id, []).append((grade_id, grade_value))
+        expected = {}
+        for subject_id, grades in history.items():
+            averages = []
+            for position in range(len(grades)):
+                values = [value for _, value in grades[max(0, position - window + 1):position + 1]]
+                averages.append(sum(values) / len(values))
+            improvement = averages[-1] - averages[-1 - window] if len(averages) > window else None
+            expected[subject_id] = ([grade_id for grade_id, _ in grades[-last:]], averages[-1], improvement)
+        return expected
+    
+    def test_rolling_average_and_improvement(self, db):
+        """Тест скользящего среднего, последних оценок и прироста"""
+        dataset = generate_dataset(db, students=3, grades=150)
+        student_id = dataset['student_ids'][0]
+        series = build_series(db.get_grade_trends(student_id, 'subject', window=3, last=4))
+        expected = self.expected_series(db, student_id, 3, 4)
+        
+        assert {item['key'] for item in series} == expected.keys()
+        for item in series:
+            grade_ids, rolling_avg, improvement = expected[item['key']]
+            assert [point[0] for point in item['points']] == grade_ids
+            assert abs(item['rolling_avg'] - rolling_avg) < 1e-9
+            if improvement is None:
+                assert item['improvement'] is None
+            else:
+                assert abs(item['improvement'] - improvement) < 1e-9
+        
+        overall = build_series(db.get_grade_trends(student_id, 'all', last=100))
+        assert len(overall) == 1
+        assert len(overall[0]['points']) == len(db.get_student_grade_ids(student_id))
+        
+        with pytest.raises(ValueError):
+            db.get_grade_trends(student_id, 'teacher')
+    
+    def test_cache_invalidation(self, db, monkeypatch):
+        """Тест повторного расчета только после изменения оценок студента"""
+        dataset = generate_dataset(db, students=3, grades=60)
+        student_id, other_id = dataset['student_ids'][:2]
+        analyzer = TrendAnalyzer(db)
+        
+        calls = []
+        original = db.get_grade_trends
+        monkeypatch.setattr(db, 'get_grade_trends', lambda *args: calls.append(args) or original(*args))
+        
+        first = analyzer.trends(student_id)
+        assert analyzer.trends(student_id) is first
+        
+        # Изменение оценки другого студента не сбрасывает кэш
+        db.execute_query("UPDATE grades SET grade_value = 2 WHERE id = (SELECT MIN(id) FROM grades WHERE student_id = ?)",
+                         (other_id,))
+        assert analyzer.trends(student_id) is first
+        assert len(calls) == 1
+        
+        # Удаление собственной оценки пересчитывает ряды
+        grade_id = first[0]['points'][-1][0]
+        db.execute_query("DELETE FROM grades WHERE id = ?", (grade_id,))
+        second = analyzer.trends(student_id)
+        assert len(calls) == 2
+        assert grade_id not in {point[0] for item in second for point in item['points']}
+        
+        analyzer.invalidate(student_id)
+        analyzer.trends(student_id)
+        assert len(calls) == 3
+
+
+class TestSpecialtyKeys:
+    """Тесты справочника специальностей и целочисленных ключей"""
+    
+    def test_text_columns_dropped(self, db):
+        """Тест хранения только ключа специальности и сопоставления кода при upsert"""
+        for table in ('users', 'subjects', 'fgos_competencies'):
+            columns = [row[1] for row in db.fetch_all(f"PRAGMA table_info({table})")]
+            assert 'specialty' not in columns and 'specialty_id' in columns
+            assert db.fetch_one(f"SELECT COUNT(*) FROM {table} WHERE specialty_id IS NULL")[0] == 0
+        assert db.fetch_one("SELECT COUNT(*) FROM sqlite_master WHERE name LIKE '%specialty_insert'")[0] == 0
+        
+        db.upsert_users([
+            ('spec_user', 'pw', 'student', 'Новый Студент', '09.02.07', 'Группа 201'),
+            ('student1', 'pw', 'student', 'Петров Петр Петрович', '09.02.07', 'Группа 201'),
+        ])
+        rows = db.fetch_all("""
+            SELECT sp.code FROM users u JOIN specialties sp ON u.specialty_id = sp.id
+            WHERE u.username IN ('spec_user', 'student1')
+        """)
+        assert rows == [('09.02.07',), ('09.02.07',)]
+        assert db.fetch_one("SELECT COUNT(*) FROM specialties WHERE code = '09.02.07'")[0] == 1
+    
+    def test_migration_keeps_codes(self, temp_db_path):
+        """Тест сохранения кодов специальности при удалении текстовых столбцов"""
+        class LegacyDatabase(Database):
+            MIGRATIONS = Database.MIGRATIONS[:Database.MIGRATIONS.index(Database._migrate_drop_specialty_text)]
+        
+        db = LegacyDatabase(db_path=temp_db_path)
+        db.execute_query("UPDATE users SET specialty = CASE username WHEN 'student2' THEN '09.02.07' ELSE '15.02.01' END")
+        users = db.fetch_all("SELECT id, username, specialty, group_name FROM users ORDER BY id")
+        db.close()
+        
+        db = Database(db_path=temp_db_path)
+        assert db.fetch_all("""
+            SELECT u.id, u.username, sp.code, u.group_name
+            FROM users u LEFT JOIN specialties sp ON u.specialty_id = sp.id ORDER BY u.id
+        """) == users
+        assert User(*db.authenticate('student2', '123456', 'student')).specialty == '09.02.07'
+        assert 'idx_users_specialty' in {row[0] for row in db.fetch_all("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert db.fetch_all("PRAGMA integrity_check") == [('ok',)]
+        db.close()
+    
+    def test_competencies_by_subject(self, db):
+        """Тест совпадения выборки по ключам с соединением по коду специальности"""
+        for (subject_id,) in db.fetch_all("SELECT id FROM subjects"):
+            expected = db.fetch_all("""
+                SELECT DISTINCT fc.id, fc.code, fc.name, fc.type
+                FROM fgos_competencies fc
+                JOIN specialties a ON fc.specialty_id = a.id
+                JOIN specialties b ON a.code = b.code
+                JOIN subjects s ON s.specialty_id = b.id
+                WHERE s.id = ? ORDER BY fc.type, fc.code
+            """, (subject_id,))
+            assert db.get_competencies_by_subject(subject_id) == expected
+        
+        plan = ' '.join(row[3] for row in db.fetch_all(
+            "EXPLAIN QUERY PLAN SELECT id FROM fgos_competencies WHERE specialty_id = 1"))
+        assert 'idx_fgos_competencies_specialty' in plan
+    
+    def test_authenticate_returns_user_columns(self, db):
+        """Тест создания модели пользователя по строке авторизации"""
+        user = User(*db.authenticate('student1', '123456', 'student'))
+        assert user.username == 'student1'
+        assert user.specialty is not None
+
+
+class TestIsoDates:
+    """Тесты хранения дат оценок в формате ГГГГ-ММ-ДД"""
+    
+    def test_normalize_date(self):
+        """Тест приведения дат к формату ГГГГ-ММ-ДД"""
+        assert normalize_date('2024-02-15') == '2024-02-15'
+        assert normalize_date('15.02.2024') == '2024-02-15'
+        assert normalize_date('2024-02-15 10:30:00') == '2024-02-15'
+        assert normalize_date(date(2024, 2, 5)) == '2024-02-05'
+        assert normalize_date('2024-02-30') is None
+        assert normalize_date('') is None
+        assert semester_range(2023, 1) == ('2023-09-01', '2024-01-31')
+        assert semester_range(2023, 2) == ('2024-02-01', '2024-08-31')
+        with pytest.raises(ValueError):
+            semester_range(2023, 3)
+    
+    def test_trigger_rejects_other_formats(self, db):
+        """Тест запрета записи даты в другом формате"""
+        grade_id = db.fetch_one("SELECT MIN(id) FROM grades")[0]
+        with pytest.raises(sqlite3.IntegrityError):
+            db.connection.execute("UPDATE grades SET date = '15.02.2024' WHERE id = ?", (grade_id,))
+        with pytest.raises(sqlite3.IntegrityError):
+            db.connection.execute("UPDATE grades SET date = '2024-02-30' WHERE id = ?", (grade_id,))
+        db.connection.rollback()
+        
+        db.execute_query("UPDATE grades SET date = '2024-03-05' WHERE id = ?", (grade_id,))
+        assert db.fetch_one("SELECT date FROM grades WHERE id = ?", (grade_id,))[0] == '2024-03-05'
+    
+    def test_migration_converts_dates(self, temp_db_path):
+        """Тест перевода дат старых записей при миграции"""
+        db = Database(db_path=temp_db_path)
+        connection = db.connection
+        connection.execute("DROP TRIGGER grades_date_update")
+        ids = [row[0] for row in connection.execute("SELECT id FROM grades ORDER BY id")]
+        connection.execute("UPDATE grades SET date = '20.02.2024' WHERE id = ?", (ids[0],))
+        connection.execute("UPDATE grades SET date = '2024-02-21 09:15:00' WHERE id = ?", (ids[1],))
+        connection.execute("PRAGMA user_version = 7")
+        connection.commit()
+        db.close()
+        
+        db = Database(db_path=temp_db_path)
+        dates = dict(db.fetch_all("SELECT id, date FROM grades"))
+        assert dates[ids[0]] == '2024-02-20'
+        assert dates[ids[1]] == '2024-02-21'
+        assert db.fetch_one("SELECT COUNT(*) FROM grades WHERE date IS NOT date(date, '+0 days')")[0] == 0
+        db.close()
+    
+    def test_date_range_uses_index(self, db):
+        """Тест выборки оценок преподавателя за семестр по индексу"""
+        generate_dataset(db, students=5, grades=100)
+        date_from, date_to = semester_range(2023, 2)
+        conditions, params = grade_filter_sql({'teacher_id': 1, 'date_from': date_from, 'date_to': date_to})
+        query = f"SELECT g.id FROM grades g WHERE 1 = 1{conditions}"
+        
+        plan = ' '.join(row[3] for row in db.fetch_all(f"EXPLAIN QUERY PLAN {query}", params))
+        assert 'idx_grades_teacher_date' in plan
+        assert len(db.fetch_all(query, params)) == db.fetch_one(
+            "SELECT COUNT(*) FROM grades WHERE teacher_id = 1 AND date BETWEEN ? AND ?", (date_from, date_to))[0]
+
+
+class TestCompactStorage:
+    """Тесты миграции компактного хранения"""
+    
+    def test_schema(self, db):
+        """Тест схемы без AUTOINCREMENT и с индикаторами WITHOUT ROWID"""
+        tables = dict(db.fetch_all("SELECT name, sql FROM sqlite_master WHERE type = 'table'"))
+        assert [name for name, sql in tables.items() if 'AUTOINCREMENT' in sql.upper()] == ['grade_changes']
+        assert 'WITHOUT ROWID' in tables['grade_indicators']
+        assert db.fetch_one("SELECT COUNT(*) FROM sqlite_master WHERE name = 'idx_grade_indicators_grade'")[0] == 0
+        
+        grade_id, indicator_id = db.fetch_one("SELECT grade_id, indicator_id FROM grade_indicators LIMIT 1")
+        with pytest.raises(sqlite3.IntegrityError):
+            db.connection.execute("INSERT INTO grade_indicators (grade_id, indicator_id) VALUES (?, ?)",
+                                  (grade_id, indicator_id))
+        db.connection.rollback()
+    
+    def test_triggers_survive_rebuild(self, db):
+        """Тест работы триггеров пересозданных таблиц"""
+        grade_id = db.fetch_one("SELECT MIN(id) FROM grades")[0]
+        seq = db.get_change_seq()
+        db.execute_query("DELETE FROM grade_indicators WHERE grade_id = ?", (grade_id,))
+        assert db.fetch_one("SELECT indicator_mask FROM grades WHERE id = ?", (grade_id,))[0] == 0
+        assert db.get_grade_changes(seq)[1] == [grade_id]
+        
+        db.execute_query("INSERT INTO grade_indicators (grade_id, indicator_id) SELECT ?, id FROM fgos_indicators "
+                         "WHERE competency_id = (SELECT competency_id FROM grades WHERE id = ?)", (grade_id, grade_id))
+        description = db.fetch_one("""
+            SELECT fi.description FROM grade_indicators gi JOIN fgos_indicators fi ON gi.indicator_id = fi.id
+            WHERE gi.grade_id = ? LIMIT 1
+        """, (grade_id,))[0]
+        assert grade_id in [row[0] for row in db.search_grades(description.split()[0])]
+    
+    def test_migration_preserves_data(self, temp_db_path):
+        """Тест переноса данных и удаления повторов индикаторов"""
+        class LegacyDatabase(Database):
+            MIGRATIONS = Database.MIGRATIONS[:Database.MIGRATIONS.index(Database._migrate_compact_storage)]
+        
+        db = LegacyDatabase(db_path=temp_db_path)
+        generate_dataset(db, students=3, grades=50)
+        db.execute_query("INSERT INTO grade_indicators (grade_id, indicator_id) "
+                         "SELECT grade_id, indicator_id FROM grade_indicators LIMIT 1")
+        grades = db.fetch_all("SELECT * FROM grades ORDER BY id")
+        pairs = set(db.fetch_all("SELECT grade_id, indicator_id FROM grade_indicators"))
+        db.close()
+        
+        db = Database(db_path=temp_db_path)
+        assert db.fetch_all("SELECT * FROM grades ORDER BY id") == grades
+        assert db.fetch_all("SELECT grade_id, indicator_id FROM grade_indicators ORDER BY 1, 2") == sorted(pairs)
+        assert db.fetch_all("PRAGMA integrity_check") == [('ok',)]
+        db.close()
+
+
+class TestArchive:
+    """Тесты переноса закрытых учебных лет в архивные файлы"""
+    
+    @staticmethod
+    def add_current_grade(db):
+        """Оценка текущего учебного года, остающаяся в основном файле"""
+        row = db.fetch_one("SELECT student_id, teacher_id, subject_id, competency_id FROM grades LIMIT 1")
+        db.add_grade_with_indicators({
+            'student_id': row[0], 'teacher_id': row[1], 'subject_id': row[2], 'competency_id': row[3],
+            'grade_value': 5, 'percentage': 100, 'comment': 'Оценка текущего учебного года. ' * 5,
+            'date': '2024-10-01',
+        }, [])
+        return row[0]
+    
+    def test_academic_year(self):
+        """Тест границ учебного года"""
+        assert academic_year_range(2023) == ('2023-09-01', '2024-08-31')
+        assert academic_year('2024-08-31') == 2023
+        assert academic_year('2024-09-01') == 2024
+    
+    def test_archive_year(self, db, tmp_path):
+        """Тест переноса оценок и индикаторов в архив"""
+        student_id = self.add_current_grade(db)
+        history = db.get_student_history(student_id)
+        archived = db.fetch_one("SELECT COUNT(*) FROM grades WHERE date BETWEEN '2023-09-01' AND '2024-08-31'")[0]
+        indicators = db.fetch_one("SELECT COUNT(*) FROM grade_indicators")[0]
+        
+        path = str(tmp_path / 'archive_2023.db')
+        assert db.archive_academic_year(2023, path) == archived
+        assert db.get_archives() == [(2023, path, archived)]
+        assert db.fetch_all("SELECT date FROM grades") == [('2024-10-01',)]
+        assert db.fetch_one("SELECT COUNT(*) FROM grade_indicators")[0] == 0
+        assert db.fetch_one("SELECT COUNT(*) FROM grades_fts")[0] == 1
+        
+        # Исторические запросы видят архив, запросы текущего года - только основной файл
+        assert db.get_student_history(student_id) == history
+        assert len(db.get_student_history(student_id, 2024)) == 1
+        assert db.fetch_one("SELECT COUNT(*) FROM grade_indicators_all")[0] == indicators
+        assert db.attach_archives() == [2023]
+        
+        with pytest.raises(sqlite3.OperationalError):
+            db.connection.execute("DELETE FROM archive_2023.grades")
+        db.detach_archives()
+        with pytest.raises(sqlite3.OperationalError):
+            db.connection.execute("SELECT COUNT(*) FROM archive_2023.grades")
+        with pytest.raises(sqlite3.OperationalError):
+            db.connection.execute("SELECT COUNT(*) FROM grades_all")
+    
+    def test_archive_rejected(self, db, tmp_path):
+        """Тест отказа переноса незакрытого года и последних оценок"""
+        with pytest.raises(ValueError):
+            db.archive_academic_year(date.today().year, str(tmp_path / 'current.db'))
+        with pytest.raises(ValueError):
+            db.archive_academic_year(2023, str(tmp_path / 'archive.db'))
+        assert not (tmp_path / 'archive.db').exists()
+        assert db.archive_academic_year(2020, str(tmp_path / 'empty.db')) == 0
+        assert db.get_archives() == []
+
+
+class TestBackup:
+    """Тесты резервного копирования и контрольных точек WAL"""
+    
+    def test_backup_database(self, db, tmp_path):
+        """Тест пошаговой онлайн-копии базы"""
+        target = str(tmp_path / 'copy.db')
+        page_count = db.fetch_one("PRAGMA page_count")[0]
+        backup = backup_database(db.db_path, target, pages=2, sleep=0)
+        assert backup['path'] == target and not os.path.exists(target + '.part')
+        assert backup['pages'] == backup['total'] == page_count
+        assert backup['steps'] == (page_count + 1) // 2
+        assert backup['elapsed'] >= 0
+        
+        copy = sqlite3.connect(target)
+        assert copy.execute("PRAGMA integrity_check").fetchone() == ('ok',)
+        assert copy.execute("SELECT COUNT(*) FROM grades").fetchone() == db.fetch_one("SELECT COUNT(*) FROM grades")
+        copy.close()
+    
+    def test_rotate_snapshots(self, temp_db_path, tmp_path):
+        """Тест удаления старых снимков сверх заданного количества"""
+        paths = [snapshot_path(temp_db_path, str(tmp_path), datetime(2024, 1, day)) for day in range(1, 6)]
+        for path in paths:
+            Path(path).touch()
+        (tmp_path / 'other.db').touch()
+        
+        assert rotate_snapshots(temp_db_path, str(tmp_path), keep=2) == paths[:3]
+        assert list_snapshots(temp_db_path, str(tmp_path)) == paths[3:]
+        assert (tmp_path / 'other.db').exists()
+    
+    def test_checkpoint(self, db):
+        """Тест режима WAL и выбора режима контрольной точки"""
+        assert db.fetch_one("PRAGMA journal_mode")[0] == 'wal'
+        assert checkpoint_mode(datetime(2024, 1, 1, 3)) == 'TRUNCATE'
+        assert checkpoint_mode(datetime(2024, 1, 1, 12)) == 'PASSIVE'
+        assert checkpoint(db.connection, 'TRUNCATE') == (0, 0, 0)
+        with pytest.raises(ValueError):
+            checkpoint(db.connection, 'NOW')
+    
+    def test_service(self, db, tmp_path):
+        """Тест фонового копирования и контрольных точек"""
+        backups = threading.Event()
+        service = BackupService(db.db_path, str(tmp_path), checkpoint_interval=0.01, on_backup=lambda result: backups.set())
+        service.start()
+        try:
+            assert backups.wait(5)
+            for _ in range(100):
+                if service.last_checkpoint is not None:
+                    break
+                threading.Event().wait(0.01)
+        finally:
+            service.stop()
+        
+        assert not service.is_running()
+        assert len(service.history) == 1
+        assert list_snapshots(db.db_path, str(tmp_path)) == [service.history[0]['path']]
+        assert service.last_checkpoint[0] in ('PASSIVE', 'TRUNCATE')
+        
+        # Свежий снимок уже есть, поэтому повторный запуск не копирует базу сразу
+        service.start()
+        service.stop()
+        assert len(service.history) == 1
+
+
+class TestMaintenance:
+    """Тесты обслуживания базы данных"""
+    
+    @staticmethod
+    def free_pages(db):
+        """Удаление части оценок, освобождающее страницы"""
+        generate_dataset(db, students=10, grades=1000)
+        db.execute_query("DELETE FROM grades WHERE id % 2 = 0")
+        return db.fetch_one("PRAGMA freelist_count")[0]
+    
+    def test_run_maintenance(self, db):
+        """Тест статистики, освобождения страниц и проверки целостности"""
+        assert db.fetch_one("PRAGMA auto_vacuum")[0] == 2
+        assert self.free_pages(db) > 0
+        
+        report = run_maintenance(db.db_path, ['analyze', 'vacuum', 'integrity'])
+        assert [item['task'] for item in report] == ['analyze', 'vacuum', 'integrity']
+        vacuum = report[1]
+        assert vacuum['after']['freelist_count'] == 0
+        assert vacuum['after']['page_count'] < vacuum['before']['page_count']
+        assert report[2]['result'] == 'ok'
+        assert all(item['elapsed'] >= 0 for item in report)
+        assert db.fetch_one("SELECT COUNT(*) FROM sqlite_stat1 WHERE tbl = 'grades'")[0] > 0
+    
+    def test_vacuum_interrupted(self, db):
+        """Тест прерывания освобождения страниц при работе с базой"""
+        free = self.free_pages(db)
+        report = run_maintenance(db.db_path, ['vacuum'], is_idle=lambda: False)
+        assert report[0]['result'].startswith('прервано')
+        assert report[0]['after']['freelist_count'] == free
+        with pytest.raises(ValueError):
+            run_maintenance(db.db_path, ['defragment'])
+    
+    def test_enable_incremental_vacuum(self, tmp_path):
+        """Тест перевода существующей базы в режим INCREMENTAL"""
+        path = str(tmp_path / 'legacy.db')
+        connection = sqlite3.connect(path)
+        connection.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+        connection.close()
+        
+        assert enable_incremental_vacuum(path)
+        assert not enable_incremental_vacuum(path)
+    
+    def test_scheduler(self, db):
+        """Тест запуска обслуживания в период простоя"""
+        scheduler = MaintenanceScheduler(db.db_path, idle_seconds=0, poll_interval=0.01, tasks=('integrity',))
+        scheduler.start()
+        try:
+            for _ in range(500):
+                if scheduler.last_report is not None:
+                    break
+                threading.Event().wait(0.01)
+        finally:
+            scheduler.stop()
+        assert not scheduler.is_running()
+        assert scheduler.last_report[0]['result'] == 'ok'
+
+
+class TestRetentionPurge:
+    """Тесты удаления оценок по сроку хранения"""
+    
+    def test_cascade_delete(self, db):
+        """Тест удаления индикаторов вместе с оценкой"""
+        grade_id = db.fetch_one("SELECT MIN(grade_id) FROM grade_indicators")[0]
+        db.execute_query("DELETE FROM grades WHERE id = ?", (grade_id,))
+        assert db.fetch_one("SELECT COUNT(*) FROM grade_indicators WHERE grade_id = ?", (grade_id,))[0] == 0
+    
+    def test_migration_removes_orphans(self, temp_db_path):
+        """Тест удаления индикаторов удаленных оценок при миграции"""
+        class LegacyDatabase(Database):
+            MIGRATIONS = Database.MIGRATIONS[:Database.MIGRATIONS.index(Database._migrate_grade_indicators_cascade)]
+        
+        db = LegacyDatabase(db_path=temp_db_path)
+        grade_id = db.fetch_one("SELECT MIN(grade_id) FROM grade_indicators")[0]
+        db.execute_query("DELETE FROM grades WHERE id = ?", (grade_id,))
+        assert db.fetch_one("SELECT COUNT(*) FROM grade_indicators WHERE grade_id = ?", (grade_id,))[0] > 0
+        db.close()
+        
+        db = Database(db_path=temp_db_path)
+        assert db.fetch_one("SELECT COUNT(*) FROM grade_indicators WHERE grade_id NOT IN (SELECT id FROM grades)")[0] == 0
+        db.close()
+    
+    def test_retention_cutoff(self):
+        """Тест начала срока хранения"""
+        assert retention_cutoff(5, date(2026, 10, 19)) == '2021-09-01'
+        assert retention_cutoff(1, date(2024, 3, 1)) == '2022-09-01'
+    
+    def test_purge_grades(self, db):
+        """Тест удаления старых оценок короткими транзакциями"""
+        generate_dataset(db, students=10, grades=1000)
+        db.connection.execute("INSERT INTO grade_indicators (grade_id, indicator_id) VALUES (1000000, 1)")
+        db.connection.commit()
+        old_grades = db.fetch_one("SELECT COUNT(*) FROM grades WHERE date < '2024-03-01'")[0]
+        kept = db.fetch_one("SELECT COUNT(*) FROM grades WHERE date >= '2024-03-01'")[0]
+        old_indicators = db.fetch_one("""
+            SELECT COUNT(*) FROM grade_indicators
+            WHERE grade_id NOT IN (SELECT id FROM grades WHERE date >= '2024-03-01')
+        """)[0]
+        
+        connection = sqlite3.connect(db.db_path, isolation_level=None)
+        result = purge_grades(connection, '2024-03-01', batch_ids=100, pause=0)
+        connection.close()
+        
+        assert result['grades'] == old_grades
+        assert result['indicators'] == old_indicators
+        assert result['batches'] > 10 and result['rate'] > 0
+        assert db.fetch_one("SELECT COUNT(*), MIN(date) FROM grades") == (kept, '2024-03-01')
+        assert db.fetch_one("SELECT COUNT(*) FROM grade_indicators WHERE grade_id NOT IN (SELECT id FROM grades)")[0] == 0
+    
+    def test_purge_archives(self, db):
+        """Тест удаления архивов учебных лет старше срока хранения"""
+        student_id = TestArchive.add_current_grade(db)
+        assert db.archive_academic_year(2023) > 0
+        archive_file = db._archive_file(db.get_archives()[0][1])
+        assert len(db.get_student_history(student_id)) > 1
+        
+        connection = sqlite3.connect(db.db_path, isolation_level=None)
+        connection.execute("ATTACH DATABASE ? AS archive_2023", (archive_file,))
+        assert purge_grades(connection, '2023-09-01', pause=0)['archives'] == []
+        assert os.path.exists(archive_file)
+        
+        result = purge_grades(connection, '2024-09-01', pause=0)
+        assert result['archives'] == [2023]
+        assert [row[1] for row in connection.execute("PRAGMA database_list")] == ['main']
+        connection.close()
+        
+        assert not os.path.exists(archive_file)
+        assert db.get_archives() == []
+        assert db.get_student_history(student_id) == db.get_student_history(student_id, 2024)
+        assert len(db.get_student_history(student_id)) == 1
+
+
+class TestCli:
+    """Тесты командной строки python -m edu_journal"""
+    
+    def test_stats(self, db, capsys):
+        """Тест сводки по базе"""
+        assert cli_main(['--db', db.db_path, 'stats']) == 0
+        output = capsys.readouterr().out
+        assert 'Оценок: 3' in output
+        assert 'Размер базы' in output
+    
+    def test_recompute(self, db):
+        """Тест пересчета оценок по индикаторам"""
+        generate_dataset(db, students=5, grades=100)
+        grades = db.fetch_all("SELECT id, grade_value, percentage FROM grades ORDER BY id")
+        # Синтетические оценки рассчитаны по тем же правилам, тестовые - вручную
+        changed = recompute_grades(db, dry_run=True)
+        assert 0 < changed <= 3
+        assert db.fetch_all("SELECT id, grade_value, percentage FROM grades ORDER BY id") == grades
+        
+        assert recompute_grades(db) == changed
+        assert recompute_grades(db, dry_run=True) == 0
+        
+        # Дробный процент сохраняется без округления и не считается расхождением
+        indicators = [row[0] for row in db.fetch_all(
+            "SELECT id FROM fgos_indicators WHERE competency_id = 6 ORDER BY id LIMIT 5")]
+        grade_id, = db.add_grades_bulk([((4, 1, 1, 6, 4, 62.5, 'Комментарий ПК ' * 10, '2024-03-01'), indicators)])
+        assert recompute_grades(db, dry_run=True) == 0
+        assert db.fetch_one("SELECT grade_value, percentage FROM grades WHERE id = ?", (grade_id,)) == (4, 62.5)
+    
+    def test_commands(self, db, tmp_path, monkeypatch):
+        """Тест экспорта, обслуживания и резервного копирования"""
+        path = str(tmp_path / 'journal.csv')
+        assert cli_main(['--db', db.db_path, 'export', path, '--date-from', '2024-02-16']) == 0
+        with open(path, encoding='utf-8-sig', newline='') as file:
+            assert len(list(csv.reader(file, delimiter=';'))) == 3
+        
+        assert cli_main(['--db', db.db_path, 'maintenance', 'integrity']) == 0
+        assert cli_main(['--db', db.db_path, 'backup', str(tmp_path / 'backups')]) == 0
+        assert len(os.listdir(tmp_path / 'backups')) == 1
+        
+        monkeypatch.delenv('EDU_JOURNAL_DB', raising=False)
+        with pytest.raises(SystemExit):
+            cli_main(['stats'])
+    
+    def test_module_entry(self, db):
+        """Тест запуска пакета как модуля"""
+        package_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        result = subprocess.run([sys.executable, '-m', 'edu_journal', '--db', db.db_path, 'stats'],
+                                cwd=package_dir, capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        assert 'Оценок: 3' in result.stdout
+
+
+class TestCorePackage:
+    """Тесты импорта ядра без зависимостей интерфейса"""
+    
+    def test_headless_import(self):
+        """Тест импорта слоя данных без PyQt5"""
+        package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        code = ("import sys; import core.database, core.models, core.validators; "
+                "print(sorted(name for name in ('PyQt5', 'numpy', 'pytest', 'concurrent.futures') if name in sys.modules))")
+        result = subprocess.run([sys.executable, '-c', code], cwd=package_dir, capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == '[]'
+
 # ============================================================================
 # ИНТЕГРАЦИОННЫЕ ТЕСТЫ
 # ============================================================================
@@ -616,8 +1850,9 @@ class TestFullGradeCycle:
         # 3. Получаем компетенции для предмета
         # Создаем связь между предметом и компетенцией по специальности
         cursor = db.connection.cursor()
-        cursor.execute("UPDATE subjects SET specialty = '15.02.01' WHERE id = ?", (subject_id,))
-        cursor.execute("UPDATE fgos_competencies SET specialty = '15.02.01'")
+        cursor.execute("UPDATE subjects SET specialty_id = (SELECT id FROM specialties WHERE code = '15.02.01') WHERE id = ?",
+                       (subject_id,))
+        cursor.execute("UPDATE fgos_competencies SET specialty_id = (SELECT id FROM specialties WHERE code = '15.02.01')")
         db.connection.commit()
         
         competencies = db.get_competencies_by_subject(subject_id)
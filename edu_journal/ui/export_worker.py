@@ -0,0 +1,71 @@
+import sqlite3
+
+from PyQt5.QtWidgets import QFileDialog, QMessageBox, QProgressDialog
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+
+from core.export import export_journal
+
+
+EXPORT_FILE_FILTER = 'Excel (*.xlsx);;CSV (*.csv)'
+
+
+class ExportWorker(QThread):
+    """Фоновый экспорт журнала, чтобы не блокировать интерфейс"""
+
+    progress = pyqtSignal(int, int)
+    finished_export = pyqtSignal(int, str)
+    failed = pyqtSignal(str)
+
+    def __init__(self, db_path, path, filters=None, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.path = path
+        self.filters = filters
+
+    def run(self):
+        """Выполняется в фоновом потоке"""
+        try:
+            count = export_journal(self.db_path, self.path, self.filters, self.progress.emit)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            self.failed.emit(str(e))
+            return
+        self.finished_export.emit(count, self.path)
+
+
+def start_journal_export(parent, db_path, filters, default_name):
+    """Выбор файла и запуск фонового экспорта журнала с окном прогресса"""
+    path, selected_filter = QFileDialog.getSaveFileName(
+        parent, 'Экспорт журнала', default_name, EXPORT_FILE_FILTER
+    )
+    if not path:
+        return None
+    if not path.lower().endswith(('.csv', '.xlsx')):
+        path += '.csv' if selected_filter.startswith('CSV') else '.xlsx'
+
+    dialog = QProgressDialog('Экспорт журнала...', None, 0, 0, parent)
+    dialog.setWindowTitle('Экспорт')
+    dialog.setWindowModality(Qt.WindowModal)
+    dialog.setMinimumDuration(0)
+
+    worker = ExportWorker(db_path, path, filters, parent)
+
+    def on_progress(done, total):
+        dialog.setMaximum(max(total, 1))
+        dialog.setValue(done)
+
+    def on_finished(count, saved_path):
+        dialog.close()
+        QMessageBox.information(parent, 'Экспорт',
+            f'Выгружено записей: {count}\nФайл: {saved_path}')
+
+    def on_failed(message):
+        dialog.close()
+        QMessageBox.critical(parent, 'Ошибка', f'Не удалось выполнить экспорт:\n{message}')
+
+    worker.progress.connect(on_progress)
+    worker.finished_export.connect(on_finished)
+    worker.failed.connect(on_failed)
+    worker.finished.connect(worker.deleteLater)
+    dialog.show()
+    worker.start()
+    return worker
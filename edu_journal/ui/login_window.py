@@ -4,6 +4,8 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt
 
+from core.models import User
+
 
 class LoginWindow(QWidget):
     def __init__(self, db, on_login_success):
@@ -115,11 +117,9 @@ class LoginWindow(QWidget):
             return
 
         # Поиск пользователя в базе данных
-        query = "SELECT * FROM users WHERE username = ? AND password = ? AND role = ?"
-        user_data = self.db.fetch_one(query, (username, password, selected_role))
+        user_data = self.db.authenticate(username, password, selected_role)
 
         if user_data:
-            from models import User
             self.current_user = User(*user_data)
             QMessageBox.information(self, 'Успех', f'Добро пожаловать, {self.current_user.full_name}!')
             self.hide()
@@ -0,0 +1,191 @@
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
+    QPushButton, QTableView, QHeaderView
+)
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QColor
+
+from core.change_watcher import ChangeWatcher
+from core.mastery import MasteryMatrix
+from ui.student_window import INTERPRETATION_COLORS
+
+
+MASTERY_MODES = [('Последняя оценка', 'latest'), ('Лучшая оценка', 'best')]
+COMPETENCY_TYPES = [('Все компетенции', None), ('ПК', 'ПК'), ('ОПК', 'ОПК'), ('УК', 'УК')]
+CELL_SIZE = 44  # Ширина столбца компетенции, пикселей
+
+
+class MasteryTableModel(QAbstractTableModel):
+    """Модель таблицы поверх разреженной карты освоения
+
+    Представление запрашивает данные только видимых ячеек, поэтому
+    отрисовка не зависит от общего размера карты.
+    """
+
+    def __init__(self, matrix, parent=None):
+        super().__init__(parent)
+        self.matrix = matrix
+        self.colors = {grade: (QColor(background), QColor(color))
+                       for grade, (background, color) in INTERPRETATION_COLORS.items()}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.matrix.students)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.matrix.competencies)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        cell = self.matrix.cell(index.row(), index.column())
+        if cell is None:
+            return None
+        grade_id, grade_value, percentage, date = cell
+        if role == Qt.DisplayRole:
+            return str(grade_value)
+        if role == Qt.BackgroundRole:
+            return self.colors.get(grade_value, self.colors[2])[0]
+        if role == Qt.ForegroundRole:
+            return self.colors.get(grade_value, self.colors[2])[1]
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == Qt.ToolTipRole:
+            code = self.matrix.competencies[index.column()][1]
+            return f'{code}: оценка {grade_value} ({percentage:.1f}%), {date}'
+        if role == Qt.UserRole:
+            return grade_id
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal:
+            _, code, name, competency_type = self.matrix.competencies[section]
+            if role == Qt.DisplayRole:
+                return code
+            if role == Qt.ToolTipRole:
+                return f'{competency_type}: {name}'
+        elif role == Qt.DisplayRole:
+            return self.matrix.students[section][1]
+        return None
+
+    def reload(self):
+        """Полная перезагрузка карты"""
+        self.beginResetModel()
+        self.matrix.load()
+        self.endResetModel()
+
+    def refresh(self):
+        """Обновление только изменившихся ячеек"""
+        changed = self.matrix.refresh()
+        if changed is None:
+            # Карта перезагружена целиком, представление читает ее заново
+            self.beginResetModel()
+            self.endResetModel()
+            return
+        for key in changed:
+            row, column = self.matrix.position(key)
+            index = self.index(row, column)
+            self.dataChanged.emit(index, index)
+
+
+class MasteryWindow(QWidget):
+    """Тепловая карта освоения компетенций ФГОС студентами группы"""
+
+    # Сигнал наблюдателя изменений, доставляется в поток интерфейса
+    external_change = pyqtSignal()
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.model = None
+        self.init_ui()
+
+        self.external_change.connect(self.on_external_change)
+        self.change_watcher = ChangeWatcher(self.db.db_path, self.external_change.emit)
+        self.change_watcher.start()
+
+        self.load_matrix()
+
+    def init_ui(self):
+        self.setWindowTitle('Карта освоения компетенций')
+        self.setGeometry(120, 120, 1200, 700)
+
+        main_layout = QVBoxLayout()
+        main_layout.setContentsMargins(20, 20, 20, 20)
+
+        filters_layout = QHBoxLayout()
+        filters_layout.addWidget(QLabel('Группа:'))
+        self.group_combo = QComboBox()
+        for group_name in self.db.get_groups():
+            self.group_combo.addItem(group_name)
+        filters_layout.addWidget(self.group_combo)
+
+        self.mode_combo = QComboBox()
+        for title, mode in MASTERY_MODES:
+            self.mode_combo.addItem(title, mode)
+        filters_layout.addWidget(self.mode_combo)
+
+        self.type_combo = QComboBox()
+        for title, competency_type in COMPETENCY_TYPES:
+            self.type_combo.addItem(title, competency_type)
+        filters_layout.addWidget(self.type_combo)
+
+        self.refresh_button = QPushButton('Обновить')
+        self.refresh_button.clicked.connect(self.refresh_matrix)
+        filters_layout.addWidget(self.refresh_button)
+        filters_layout.addStretch()
+        main_layout.addLayout(filters_layout)
+
+        self.group_combo.currentIndexChanged.connect(self.load_matrix)
+        self.mode_combo.currentIndexChanged.connect(self.load_matrix)
+        self.type_combo.currentIndexChanged.connect(self.load_matrix)
+
+        self.table = QTableView()
+        # Фиксированные размеры секций: без расчета по содержимому всех ячеек
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.horizontalHeader().setDefaultSectionSize(CELL_SIZE)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        main_layout.addWidget(self.table)
+
+        self.summary_label = QLabel('')
+        main_layout.addWidget(self.summary_label)
+
+        self.setLayout(main_layout)
+
+    def load_matrix(self):
+        """Загрузка карты для выбранной группы и режима"""
+        group_name = self.group_combo.currentText()
+        if not group_name:
+            self.summary_label.setText('Нет групп студентов')
+            return
+        matrix = MasteryMatrix(self.db, group_name, self.mode_combo.currentData(), self.type_combo.currentData())
+        self.model = MasteryTableModel(matrix, self)
+        self.model.reload()
+        self.table.setModel(self.model)
+        self.update_summary()
+
+    def refresh_matrix(self):
+        """Обновление изменившихся ячеек карты"""
+        if self.model is not None:
+            self.model.refresh()
+            self.update_summary()
+
+    def update_summary(self):
+        """Итог по освоению компетенций группой"""
+        matrix = self.model.matrix
+        coverage = matrix.coverage()
+        average = sum(coverage.values()) / len(coverage) * 100 if coverage else 0
+        self.summary_label.setText(
+            f'Студентов: {len(matrix.students)}, компетенций: {len(matrix.competencies)}, '
+            f'оценено ячеек: {len(matrix.cells)}, среднее освоение: {average:.1f}%'
+        )
+
+    def on_external_change(self):
+        """Обработка фиксации изменений в базе данных другим подключением"""
+        # data_version может проверить другое окно с тем же подключением,
+        # поэтому карта сверяется с журналом изменений напрямую
+        self.refresh_matrix()
+
+    def closeEvent(self, event):
+        """Остановка наблюдателя изменений при закрытии окна"""
+        self.change_watcher.stop()
+        super().closeEvent(event)
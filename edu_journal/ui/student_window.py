@@ -1,20 +1,53 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QTableWidget, QTableWidgetItem, QPushButton,
-    QMessageBox, QGroupBox, QTextEdit, QTabWidget,
-    QScrollArea, QFrame
+    QGroupBox, QTextEdit, QTabWidget,
+    QScrollArea, QFrame, QLineEdit, QComboBox
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QColor, QFont
 
+from core.cache import LRUCache
+from core.change_watcher import ChangeWatcher
+from core.trends import TrendAnalyzer
+from ui.export_worker import start_journal_export
+from ui.trend_chart import TrendChart
+from core.validators import get_grade_interpretation
+
+
+SEARCH_DELAY_MS = 300  # Задержка поиска после ввода текста
+SEARCH_LIMIT = 500  # Результатов поиска с фрагментами (строки фильтруются по всем найденным)
+DETAILS_CACHE_SIZE = 256  # Количество оценок в кэше детальной информации
+DETAILS_PREFETCH_ROWS = 10  # Количество соседних строк, загружаемых заранее
+TREND_GROUPS = [('По компетенциям', 'competency'), ('По предметам', 'subject'), ('Все оценки', 'all')]
+
+# Цвета блока интерпретации оценки: (фон, текст)
+INTERPRETATION_COLORS = {
+    5: ('#d4edda', '#155724'),
+    4: ('#d1ecf1', '#0c5460'),
+    3: ('#fff3cd', '#856404'),
+    2: ('#f8d7da', '#721c24'),
+}
 
 class StudentWindow(QWidget):
+    # Сигнал наблюдателя изменений, доставляется в поток интерфейса
+    external_change = pyqtSignal()
+
     def __init__(self, user, db):
         super().__init__()
         self.user = user
         self.db = db
+        self.grade_items = {}  # Ячейки оценок таблицы по id оценки
+        self.last_change_seq = None  # Точка синхронизации таблицы
+        self.details_cache = LRUCache(DETAILS_CACHE_SIZE)  # HTML деталей по id оценки
+        self.trend_analyzer = TrendAnalyzer(db)  # Ряды динамики с кэшем
         self.init_ui()
         self.load_grades()
+        
+        # Автообновление оценок при изменениях из других подключений
+        self.external_change.connect(self.on_external_change)
+        self.change_watcher = ChangeWatcher(self.db.db_path, self.external_change.emit)
+        self.change_watcher.start()
 
     def init_ui(self):
         self.setWindowTitle(f'Личный кабинет студента - {self.user.full_name}')
@@ -82,6 +115,24 @@ class StudentWindow(QWidget):
         self.table_tab = QWidget()
         table_layout = QVBoxLayout()
         
+        # Полнотекстовый поиск по комментариям и индикаторам
+        search_layout = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText('Поиск по комментариям и индикаторам...')
+        self.search_edit.setClearButtonEnabled(True)
+        search_layout.addWidget(self.search_edit)
+        self.search_status_label = QLabel('')
+        self.search_status_label.setStyleSheet('color: #7f8c8d;')
+        search_layout.addWidget(self.search_status_label)
+        table_layout.addLayout(search_layout)
+        
+        # Поиск запускается после паузы в наборе текста
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.apply_search)
+        self.search_edit.textChanged.connect(self.search_timer.start)
+        
         self.grades_table = QTableWidget()
         self.grades_table.setColumnCount(9)
         self.grades_table.setHorizontalHeaderLabels([
@@ -108,13 +159,43 @@ class StudentWindow(QWidget):
         self.detail_tab.setLayout(detail_layout)
         self.tab_widget.addTab(self.detail_tab, "Детальная информация")
         
+        # Вкладка с динамикой оценок
+        self.trend_tab = QWidget()
+        trend_layout = QVBoxLayout()
+        
+        trend_controls = QHBoxLayout()
+        trend_controls.addWidget(QLabel('Ряды:'))
+        self.trend_group_combo = QComboBox()
+        for title, group_by in TREND_GROUPS:
+            self.trend_group_combo.addItem(title, group_by)
+        self.trend_group_combo.currentIndexChanged.connect(self.load_trends)
+        trend_controls.addWidget(self.trend_group_combo)
+        trend_controls.addStretch()
+        trend_layout.addLayout(trend_controls)
+        
+        self.trend_chart = TrendChart()
+        trend_layout.addWidget(self.trend_chart)
+        
+        self.trend_table = QTableWidget()
+        self.trend_table.setColumnCount(4)
+        self.trend_table.setHorizontalHeaderLabels([
+            'Ряд', 'Последние оценки', 'Скользящее среднее', 'Изменение'
+        ])
+        self.trend_table.horizontalHeader().setStretchLastSection(True)
+        trend_layout.addWidget(self.trend_table)
+        
+        self.trend_tab.setLayout(trend_layout)
+        self.tab_widget.addTab(self.trend_tab, "Динамика")
+        # Ряды рассчитываются только при открытии вкладки
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
+        
         main_layout.addWidget(self.tab_widget)
 
         # Кнопки
         buttons_layout = QHBoxLayout()
         
         self.refresh_button = QPushButton('Обновить данные')
-        self.refresh_button.clicked.connect(self.load_grades)
+        self.refresh_button.clicked.connect(self.refresh_grades)
         self.refresh_button.setStyleSheet('''
             QPushButton {
                 background-color: #3498db;
@@ -129,8 +210,8 @@ class StudentWindow(QWidget):
             }
         ''')
         
-        self.export_button = QPushButton('Экспорт в PDF')
-        self.export_button.clicked.connect(self.export_to_pdf)
+        self.export_button = QPushButton('Экспорт журнала')
+        self.export_button.clicked.connect(self.export_journal)
         self.export_button.setStyleSheet('''
             QPushButton {
                 background-color: #9b59b6;
@@ -174,56 +255,188 @@ class StudentWindow(QWidget):
 
     def load_grades(self):
         """Загрузка оценок студента с деталями по ФГОС"""
-        grades = self.db.get_student_grades_with_details(self.user.id)
+        # Точка синхронизации фиксируется до чтения, чтобы не пропустить изменения
+        self.last_change_seq = self.db.get_change_seq()
+        grades = self.db.get_student_grades_with_details(self.user.id, as_models=True)
         
+        self.grades_table.setSortingEnabled(False)
+        self.grade_items.clear()
+        self.details_cache.clear()
         self.grades_table.setRowCount(len(grades))
         
         for row, grade in enumerate(grades):
-            grade_id, subject, competency_code, competency_name, grade_value, percentage, comment, date, teacher_name, indicators = grade
-            
-            # Определяем тип компетенции по коду
-            if competency_code.startswith('ПК'):
-                comp_type = 'Профессиональная'
-            elif competency_code.startswith('ОПК'):
-                comp_type = 'Общепрофессиональная'
-            elif competency_code.startswith('УК'):
-                comp_type = 'Универсальная'
-            else:
-                comp_type = 'Другая'
-            
-            # Заполняем таблицу
-            self.grades_table.setItem(row, 0, QTableWidgetItem(subject))
-            self.grades_table.setItem(row, 1, QTableWidgetItem(f"{competency_code}: {competency_name[:30]}..."))
-            self.grades_table.setItem(row, 2, QTableWidgetItem(comp_type))
-            
-            # Оценка с цветом
-            grade_item = QTableWidgetItem(str(grade_value))
-            grade_item.setBackground(self.get_grade_color(grade_value))
-            grade_item.setData(Qt.UserRole, grade_id)  # Сохраняем ID для деталей
-            self.grades_table.setItem(row, 3, grade_item)
-            
-            # Процент освоения
-            percentage_item = QTableWidgetItem(f'{percentage:.1f}%')
-            self.grades_table.setItem(row, 4, percentage_item)
-            
-            # Индикаторы
-            indicators_item = QTableWidgetItem(indicators[:100] + '...' if len(indicators) > 100 else indicators)
-            self.grades_table.setItem(row, 5, indicators_item)
-            
-            # Комментарий
-            comment_item = QTableWidgetItem(comment[:100] + '...' if len(comment) > 100 else comment)
-            self.grades_table.setItem(row, 6, comment_item)
-            
-            # Дата
-            self.grades_table.setItem(row, 7, QTableWidgetItem(date))
-            
-            # Преподаватель
-            self.grades_table.setItem(row, 8, QTableWidgetItem(teacher_name))
+            self.fill_grade_row(row, grade)
         
+        self.grades_table.setSortingEnabled(True)
         self.grades_table.resizeColumnsToContents()
         
         # Обновляем статистику
         self.update_statistics()
+        
+        if self.search_edit.text().strip():
+            self.apply_search()
+
+    def refresh_grades(self):
+        """Обновление таблицы: загружаются только оценки, измененные с прошлой синхронизации"""
+        if self.last_change_seq is None:
+            self.load_grades()
+            return
+        
+        last_seq, changed_ids = self.db.get_grade_changes(self.last_change_seq)
+        if not changed_ids:
+            return
+        
+        grades = self.db.get_student_grades_with_details(self.user.id, changed_ids, as_models=True)
+        
+        for grade_id in changed_ids:
+            self.details_cache.invalidate(grade_id)
+        
+        self.grades_table.setSortingEnabled(False)
+        
+        # Удаленные оценки
+        loaded_ids = {grade.id for grade in grades}
+        for grade_id in changed_ids:
+            if grade_id not in loaded_ids and grade_id in self.grade_items:
+                self.grades_table.removeRow(self.grade_items.pop(grade_id).row())
+        
+        # Измененные оценки обновляются на месте, новые добавляются в начало таблицы
+        for grade in grades:
+            grade_item = self.grade_items.get(grade.id)
+            if grade_item is not None:
+                row = grade_item.row()
+            else:
+                row = 0
+                self.grades_table.insertRow(row)
+            self.fill_grade_row(row, grade)
+        
+        self.grades_table.setSortingEnabled(True)
+        self.last_change_seq = last_seq
+        
+        self.update_statistics()
+        
+        if self.tab_widget.currentWidget() is self.trend_tab:
+            self.load_trends()
+        
+        if self.search_edit.text().strip():
+            self.apply_search()
+
+    def on_tab_changed(self, index):
+        """Загрузка динамики при переходе на вкладку"""
+        if self.tab_widget.widget(index) is self.trend_tab:
+            self.load_trends()
+
+    def load_trends(self):
+        """Заполнение графика и таблицы динамики оценок"""
+        series = self.trend_analyzer.trends(self.user.id, self.trend_group_combo.currentData())
+        self.trend_chart.set_series(series)
+        
+        self.trend_table.setRowCount(len(series))
+        for row, item in enumerate(series):
+            self.trend_table.setItem(row, 0, QTableWidgetItem(item['label']))
+            grades_text = ' '.join(str(point[2]) for point in item['points'])
+            self.trend_table.setItem(row, 1, QTableWidgetItem(grades_text))
+            
+            avg_item = QTableWidgetItem(f"{item['rolling_avg']:.2f}")
+            avg_item.setBackground(self.get_grade_color(round(item['rolling_avg'])))
+            self.trend_table.setItem(row, 2, avg_item)
+            
+            improvement = item['improvement']
+            if improvement is None:
+                improvement_text = '—'
+            elif improvement > 0:
+                improvement_text = f'▲ {improvement:+.2f}'
+            elif improvement < 0:
+                improvement_text = f'▼ {improvement:+.2f}'
+            else:
+                improvement_text = '= 0.00'
+            self.trend_table.setItem(row, 3, QTableWidgetItem(improvement_text))
+        self.trend_table.resizeColumnsToContents()
+
+    def on_external_change(self):
+        """Обработка фиксации изменений в базе данных другим подключением"""
+        if self.db.has_external_changes():
+            self.refresh_grades()
+
+    def closeEvent(self, event):
+        """Остановка наблюдателя изменений при закрытии окна"""
+        self.change_watcher.stop()
+        super().closeEvent(event)
+
+    def fill_grade_row(self, row, grade):
+        """Заполнение строки таблицы данными оценки (объект GradeWithDetails)"""
+        # Определяем тип компетенции по коду
+        if grade.competency_code.startswith('ПК'):
+            comp_type = 'Профессиональная'
+        elif grade.competency_code.startswith('ОПК'):
+            comp_type = 'Общепрофессиональная'
+        elif grade.competency_code.startswith('УК'):
+            comp_type = 'Универсальная'
+        else:
+            comp_type = 'Другая'
+        
+        # Заполняем таблицу
+        self.grades_table.setItem(row, 0, QTableWidgetItem(grade.subject_name))
+        self.grades_table.setItem(row, 1, QTableWidgetItem(f"{grade.competency_code}: {grade.competency_name[:30]}..."))
+        self.grades_table.setItem(row, 2, QTableWidgetItem(comp_type))
+        
+        # Оценка с цветом
+        grade_item = QTableWidgetItem(str(grade.grade_value))
+        grade_item.setBackground(self.get_grade_color(grade.grade_value))
+        grade_item.setData(Qt.UserRole, grade.id)  # Сохраняем ID для деталей
+        self.grades_table.setItem(row, 3, grade_item)
+        self.grade_items[grade.id] = grade_item
+        
+        # Процент освоения
+        percentage_item = QTableWidgetItem(f'{grade.percentage:.1f}%')
+        self.grades_table.setItem(row, 4, percentage_item)
+        
+        # Индикаторы
+        indicators = grade.indicators
+        indicators_item = QTableWidgetItem(indicators[:100] + '...' if len(indicators) > 100 else indicators)
+        self.grades_table.setItem(row, 5, indicators_item)
+        
+        # Комментарий
+        comment = grade.comment
+        comment_item = QTableWidgetItem(comment[:100] + '...' if len(comment) > 100 else comment)
+        self.grades_table.setItem(row, 6, comment_item)
+        
+        # Дата
+        self.grades_table.setItem(row, 7, QTableWidgetItem(grade.date))
+        
+        # Преподаватель
+        self.grades_table.setItem(row, 8, QTableWidgetItem(grade.teacher_name))
+
+    def apply_search(self):
+        """Фильтрация оценок по результатам полнотекстового поиска"""
+        text = self.search_edit.text().strip()
+        if not text:
+            for row in range(self.grades_table.rowCount()):
+                self.grades_table.setRowHidden(row, False)
+            self.search_status_label.setText('')
+            return
+        
+        filters = {'student_id': self.user.id}
+        results = self.db.search_grades(text, filters, SEARCH_LIMIT)
+        fragments = {result[0]: result[6] for result in results}
+        truncated = len(results) == SEARCH_LIMIT
+        # Фрагменты есть только у первых SEARCH_LIMIT результатов, а строки
+        # таблицы фильтруются по всем найденным оценкам
+        found = self.db.search_grade_ids(text, filters) if truncated else fragments.keys()
+        
+        for row in range(self.grades_table.rowCount()):
+            grade_item = self.grades_table.item(row, 3)
+            grade_id = grade_item.data(Qt.UserRole) if grade_item else None
+            self.grades_table.setRowHidden(row, grade_id not in found)
+            
+            # Фрагмент с найденными словами показывается во всплывающей подсказке
+            comment_item = self.grades_table.item(row, 6)
+            if comment_item:
+                comment_item.setToolTip(fragments.get(grade_id, ''))
+        
+        status = f'Найдено: {len(found)}'
+        if truncated:
+            status += f' (фрагменты показаны для {SEARCH_LIMIT} наиболее подходящих)'
+        self.search_status_label.setText(status)
 
     def show_grade_details(self):
         """Показ детальной информации о выбранной оценке"""
@@ -238,33 +451,37 @@ class StudentWindow(QWidget):
         
         grade_id = grade_id_item.data(Qt.UserRole)
         
-        # Получаем полную информацию об оценке
-        query = """
-        SELECT g.id, s.name as subject, fc.code as competency_code, fc.name as competency_name,
-               fc.description as competency_desc, fc.type as competency_type,
-               g.grade_value, g.percentage, g.comment, g.date, u.full_name as teacher_name
-        FROM grades g
-        JOIN subjects s ON g.subject_id = s.id
-        JOIN fgos_competencies fc ON g.competency_id = fc.id
-        JOIN users u ON g.teacher_id = u.id
-        WHERE g.id = ?
-        """
+        detail_text = self.details_cache.get(grade_id)
+        if detail_text is None:
+            self.prefetch_grade_details(current_row)
+            detail_text = self.details_cache.get(grade_id)
+            if detail_text is None:
+                return
         
-        grade_info = self.db.fetch_one(query, (grade_id,))
-        if not grade_info:
+        self.detail_text.setHtml(detail_text)
+
+    def prefetch_grade_details(self, current_row):
+        """Загрузка деталей выбранной и соседних оценок одним запросом"""
+        first_row = max(0, current_row - DETAILS_PREFETCH_ROWS)
+        last_row = min(self.grades_table.rowCount() - 1, current_row + DETAILS_PREFETCH_ROWS)
+        
+        grade_ids = []
+        for row in range(first_row, last_row + 1):
+            grade_item = self.grades_table.item(row, 3)
+            if grade_item is None:
+                continue
+            grade_id = grade_item.data(Qt.UserRole)
+            if grade_id not in self.details_cache:
+                grade_ids.append(grade_id)
+        
+        if not grade_ids:
             return
         
-        # Получаем индикаторы для этой оценки
-        indicator_query = """
-        SELECT fi.code, fi.description, fi.weight
-        FROM grade_indicators gi
-        JOIN fgos_indicators fi ON gi.indicator_id = fi.id
-        WHERE gi.grade_id = ?
-        ORDER BY fi.code
-        """
-        
-        indicators = self.db.fetch_all(indicator_query, (grade_id,))
-        
+        for grade_id, (grade_info, indicators) in self.db.get_grade_details(grade_ids).items():
+            self.details_cache.put(grade_id, self.render_grade_details(grade_info, indicators))
+
+    def render_grade_details(self, grade_info, indicators):
+        """Формирование HTML с детальной информацией об оценке"""
         # Формируем текст для отображения
         detail_text = f"""
         <h2>Детальная информация об оценке</h2>
@@ -300,40 +517,16 @@ class StudentWindow(QWidget):
         {self.get_grade_interpretation(grade_info[6], grade_info[7])}
         """
         
-        self.detail_text.setHtml(detail_text)
+        return detail_text
 
     def get_grade_interpretation(self, grade_value, percentage):
         """Получение интерпретации оценки"""
-        if grade_value == 5:
-            return """
-            <div style='background-color: #d4edda; color: #155724; padding: 10px; border-radius: 5px;'>
-            <b>Высокий уровень освоения (86-100%)</b><br>
-            Студент демонстрирует полное понимание компетенции, способен творчески применять знания 
-            в новых ситуациях, проявляет инициативу и самостоятельность.
-            </div>
-            """
-        elif grade_value == 4:
-            return """
-            <div style='background-color: #d1ecf1; color: #0c5460; padding: 10px; border-radius: 5px;'>
-            <b>Повышенный уровень освоения (67-85%)</b><br>
-            Студент уверенно применяет компетенцию в типовых ситуациях, понимает основные принципы,
-            но может испытывать затруднения в нестандартных условиях.
-            </div>
-            """
-        elif grade_value == 3:
-            return """
-            <div style='background-color: #fff3cd; color: #856404; padding: 10px; border-radius: 5px;'>
-            <b>Базовый уровень освоения (48-66%)</b><br>
-            Студент освоил основные элементы компетенции, но требуется дополнительная практика 
-            и поддержка для уверенного применения.
-            </div>
-            """
-        else:
-            return """
-            <div style='background-color: #f8d7da; color: #721c24; padding: 10px; border-radius: 5px;'>
-            <b>Компетенция не сформирована (0-47%)</b><br>
-            Требуется дополнительное обучение и практика. Рекомендуется индивидуальная работа 
-            с преподавателем и дополнительные задания.
+        title, text = get_grade_interpretation(grade_value)
+        background, color = INTERPRETATION_COLORS.get(grade_value, INTERPRETATION_COLORS[2])
+        return f"""
+            <div style='background-color: {background}; color: {color}; padding: 10px; border-radius: 5px;'>
+            <b>{title}</b><br>
+            {text}
             </div>
             """
 
@@ -381,8 +574,8 @@ class StudentWindow(QWidget):
         else:
             return QColor(255, 182, 193)  # Светло-розовый
 
-    def export_to_pdf(self):
-        """Экспорт оценок в PDF"""
-        QMessageBox.information(self, 'Экспорт', 
-            'Функция экспорта в PDF будет реализована в следующей версии.\n'
-            'Сейчас вы можете просмотреть детальную информацию во вкладке "Детальная информация".')
\ No newline at end of file
+    def export_journal(self):
+        """Экспорт оценок студента в CSV или XLSX"""
+        self.export_worker = start_journal_export(
+            self, self.db.db_path, {'student_id': self.user.id}, 'оценки.xlsx'
+        )
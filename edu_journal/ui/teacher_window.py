@@ -6,22 +6,47 @@ from PyQt5.QtWidgets import (
     QScrollArea, QFrame, QGridLayout, QButtonGroup,
     QRadioButton, QListWidget, QListWidgetItem
 )
-from PyQt5.QtCore import Qt, QDate
+from PyQt5.QtCore import Qt, QDate, QTimer, pyqtSignal
 from PyQt5.QtGui import QColor, QFont
 import sqlite3
+import time
 from datetime import datetime
 
+from core.change_watcher import ChangeWatcher
+from ui.export_worker import start_journal_export
+from ui.mastery_window import MasteryWindow
+from core.validators import calculate_grade_by_count
+
+
+SEARCH_DELAY_MS = 300  # Задержка поиска после ввода текста
+SEARCH_LIMIT = 500  # Результатов поиска с фрагментами (строки фильтруются по всем найденным)
+TIME_TO_INTERACTIVE_TARGET_MS = 500  # Целевое время готовности окна
 
 class TeacherWindow(QWidget):
+    # Сигнал наблюдателя изменений, доставляется в поток интерфейса
+    external_change = pyqtSignal()
+
     def __init__(self, user, db):
         super().__init__()
         self.user = user
         self.db = db
         self.selected_indicators = set()  # Множество выбранных индикаторов
+        self.grade_items = {}  # Ячейки оценок журнала по id оценки
+        self.last_change_seq = None  # Точка синхронизации журнала
         self.current_competency_id = None
+        self.competencies_by_subject = {}  # Компетенции предметов из снимка
+        self.indicators_by_competency = {}  # Индикаторы компетенций из снимка
+        self.time_to_interactive_ms = None
+        self.started_at = time.perf_counter()
+        
+        # Сначала показывается каркас окна, данные загружаются после отрисовки
         self.init_ui()
-        self.load_students()
-        self.load_subjects()
+        
+        # Автообновление журнала при изменениях из других подключений
+        self.external_change.connect(self.on_external_change)
+        self.change_watcher = ChangeWatcher(self.db.db_path, self.external_change.emit)
+        
+        QTimer.singleShot(0, self.load_bootstrap)
 
     def init_ui(self):
         self.setWindowTitle(f'Панель преподавателя - {self.user.full_name}')
@@ -45,6 +70,8 @@ class TeacherWindow(QWidget):
         
         # Форма выставления оценки
         form_group = QGroupBox('Выставление оценки по ФГОС')
+        form_group.setEnabled(False)  # Доступна после загрузки данных
+        self.form_group = form_group
         form_layout = QVBoxLayout()
 
         # Студент
@@ -151,6 +178,24 @@ class TeacherWindow(QWidget):
         grades_group = QGroupBox('Журнал оценок')
         grades_layout = QVBoxLayout()
         
+        # Полнотекстовый поиск по комментариям и индикаторам
+        search_layout = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText('Поиск по комментариям и индикаторам...')
+        self.search_edit.setClearButtonEnabled(True)
+        search_layout.addWidget(self.search_edit)
+        self.search_status_label = QLabel('')
+        self.search_status_label.setStyleSheet('color: #7f8c8d;')
+        search_layout.addWidget(self.search_status_label)
+        grades_layout.addLayout(search_layout)
+        
+        # Поиск запускается после паузы в наборе текста
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.apply_search)
+        self.search_edit.textChanged.connect(self.search_timer.start)
+        
         self.grades_table = QTableWidget()
         self.grades_table.setColumnCount(8)
         self.grades_table.setHorizontalHeaderLabels([
@@ -168,7 +213,7 @@ class TeacherWindow(QWidget):
         journal_buttons = QHBoxLayout()
         
         self.refresh_button = QPushButton('Обновить журнал')
-        self.refresh_button.clicked.connect(self.load_grades)
+        self.refresh_button.clicked.connect(self.refresh_grades)
         self.refresh_button.setStyleSheet('''
             QPushButton {
                 background-color: #3498db;
@@ -183,6 +228,38 @@ class TeacherWindow(QWidget):
             }
         ''')
         
+        self.export_button = QPushButton('Экспорт журнала')
+        self.export_button.clicked.connect(self.export_journal)
+        self.export_button.setStyleSheet('''
+            QPushButton {
+                background-color: #9b59b6;
+                color: white;
+                border: none;
+                padding: 8px 20px;
+                font-weight: bold;
+                border-radius: 5px;
+            }
+            QPushButton:hover {
+                background-color: #8e44ad;
+            }
+        ''')
+        
+        self.mastery_button = QPushButton('Карта освоения')
+        self.mastery_button.clicked.connect(self.show_mastery)
+        self.mastery_button.setStyleSheet('''
+            QPushButton {
+                background-color: #16a085;
+                color: white;
+                border: none;
+                padding: 8px 20px;
+                font-weight: bold;
+                border-radius: 5px;
+            }
+            QPushButton:hover {
+                background-color: #138d75;
+            }
+        ''')
+        
         self.logout_button = QPushButton('Выйти')
         self.logout_button.clicked.connect(self.close)
         self.logout_button.setStyleSheet('''
@@ -200,6 +277,8 @@ class TeacherWindow(QWidget):
         ''')
         
         journal_buttons.addWidget(self.refresh_button)
+        journal_buttons.addWidget(self.export_button)
+        journal_buttons.addWidget(self.mastery_button)
         journal_buttons.addWidget(self.logout_button)
         right_column.addLayout(journal_buttons)
 
@@ -209,23 +288,44 @@ class TeacherWindow(QWidget):
         
         main_layout.addLayout(container)
         self.setLayout(main_layout)
+        
+        self.search_status_label.setText('Загрузка журнала...')
 
-        # Загружаем начальные данные
-        self.load_grades()
+    def load_bootstrap(self):
+        """Заполнение окна данными, полученными из базы одним снимком"""
+        data = self.db.get_teacher_bootstrap(self.user.id, as_models=True)
+        
+        self.competencies_by_subject = data['competencies']
+        self.indicators_by_competency = data['indicators']
+        self.load_students(data['students'])
+        self.load_subjects(data['subjects'])
+        
+        self.search_status_label.setText('')
+        self.fill_journal(data['journal'], data['change_seq'])
+        self.form_group.setEnabled(True)
+        
+        self.time_to_interactive_ms = (time.perf_counter() - self.started_at) * 1000
+        print(f"✓ Окно преподавателя готово за {self.time_to_interactive_ms:.0f} мс")
+        if self.time_to_interactive_ms > TIME_TO_INTERACTIVE_TARGET_MS:
+            print(f"✗ Превышено целевое время готовности ({TIME_TO_INTERACTIVE_TARGET_MS} мс)")
+        
+        self.change_watcher.start()
 
-    def load_students(self):
+    def load_students(self, students=None):
         """Загрузка списка студентов"""
-        query = "SELECT id, full_name FROM users WHERE role = 'student' ORDER BY full_name"
-        students = self.db.fetch_all(query)
+        if students is None:
+            query = "SELECT id, full_name FROM users WHERE role = 'student' ORDER BY full_name"
+            students = self.db.fetch_all(query)
         
         self.student_combo.clear()
         for student_id, full_name in students:
             self.student_combo.addItem(full_name, student_id)
 
-    def load_subjects(self):
+    def load_subjects(self, subjects=None):
         """Загрузка списка предметов"""
-        query = "SELECT id, name FROM subjects WHERE teacher_id = ? OR teacher_id IS NULL ORDER BY name"
-        subjects = self.db.fetch_all(query, (self.user.id,))
+        if subjects is None:
+            query = "SELECT id, name FROM subjects WHERE teacher_id = ? OR teacher_id IS NULL ORDER BY name"
+            subjects = self.db.fetch_all(query, (self.user.id,))
         
         self.subject_combo.clear()
         for subject_id, name in subjects:
@@ -240,7 +340,10 @@ class TeacherWindow(QWidget):
         if not subject_id:
             return
         
-        competencies = self.db.get_competencies_by_subject(subject_id)
+        competencies = self.competencies_by_subject.get(subject_id)
+        if competencies is None:
+            competencies = self.db.get_competencies_by_subject(subject_id)
+            self.competencies_by_subject[subject_id] = competencies
         
         self.competency_combo.clear()
         for competency_id, code, name, type_ in competencies:
@@ -265,7 +368,7 @@ class TeacherWindow(QWidget):
             return
         
         # Получаем индикаторы
-        indicators = self.db.get_indicators_by_competency(self.current_competency_id)
+        indicators = self.get_indicators(self.current_competency_id)
         
         for indicator_id, code, description, weight, max_score in indicators:
             checkbox = QCheckBox(f"{code}: {description}")
@@ -278,6 +381,14 @@ class TeacherWindow(QWidget):
         
         self.update_progress()
 
+    def get_indicators(self, competency_id):
+        """Получение индикаторов компетенции из снимка или из базы данных"""
+        indicators = self.indicators_by_competency.get(competency_id)
+        if indicators is None:
+            indicators = self.db.get_indicators_by_competency(competency_id)
+            self.indicators_by_competency[competency_id] = indicators
+        return indicators
+
     def on_indicator_changed(self, state):
         """Обработка изменения состояния индикатора"""
         checkbox = self.sender()
@@ -298,15 +409,13 @@ class TeacherWindow(QWidget):
             self.add_grade_button.setEnabled(False)
             return
         
-        grade_value, percentage = self.db.calculate_grade_from_indicators(
-            list(self.selected_indicators), self.current_competency_id
-        )
-        
         # Получаем все индикаторы для подсчета
-        indicators = self.db.get_indicators_by_competency(self.current_competency_id)
+        indicators = self.get_indicators(self.current_competency_id)
         total_indicators = len(indicators)
         selected_count = len(self.selected_indicators)
         
+        grade_value, percentage = calculate_grade_by_count(selected_count, total_indicators)
+        
         # Получаем требования для этой компетенции
         requirements = self.get_requirements_text(total_indicators)
         
@@ -412,7 +521,7 @@ class TeacherWindow(QWidget):
                         widget.setChecked(False)
                 
                 self.update_progress()
-                self.load_grades()
+                self.refresh_grades()
             else:
                 QMessageBox.critical(self, 'Ошибка', 'Ошибка при сохранении оценки')
                 
@@ -421,51 +530,136 @@ class TeacherWindow(QWidget):
 
     def load_grades(self):
         """Загрузка всех оценок"""
-        query = """
-        SELECT g.id, u.full_name, s.name, fc.code, 
-               g.grade_value, g.comment, g.date, g.percentage
-        FROM grades g
-        JOIN users u ON g.student_id = u.id
-        JOIN subjects s ON g.subject_id = s.id
-        JOIN fgos_competencies fc ON g.competency_id = fc.id
-        WHERE g.teacher_id = ?
-        ORDER BY g.date DESC
-        """
-        
-        grades = self.db.fetch_all(query, (self.user.id,))
+        # Точка синхронизации фиксируется до чтения, чтобы не пропустить изменения
+        change_seq = self.db.get_change_seq()
+        self.fill_journal(self.db.get_teacher_journal(self.user.id, as_models=True), change_seq)
+
+    def fill_journal(self, grades, change_seq):
+        """Полное заполнение журнала оценок"""
+        self.last_change_seq = change_seq
         
+        self.grades_table.setSortingEnabled(False)
+        self.grade_items.clear()
         self.grades_table.setRowCount(len(grades))
         
         for row, grade in enumerate(grades):
-            grade_id, student_name, subject_name, competency_code, grade_value, comment, date, percentage = grade
-            
-            # Получаем индикаторы для этой оценки
-            indicator_query = """
-            SELECT fi.description 
-            FROM grade_indicators gi
-            JOIN fgos_indicators fi ON gi.indicator_id = fi.id
-            WHERE gi.grade_id = ?
-            """
-            indicators = self.db.fetch_all(indicator_query, (grade_id,))
-            indicator_text = '; '.join([ind[0] for ind in indicators])
-            
-            # Заполняем таблицу
-            self.grades_table.setItem(row, 0, QTableWidgetItem(student_name))
-            self.grades_table.setItem(row, 1, QTableWidgetItem(subject_name))
-            self.grades_table.setItem(row, 2, QTableWidgetItem(competency_code))
-            
-            grade_item = QTableWidgetItem(str(grade_value))
-            grade_item.setBackground(self.get_grade_color(grade_value))
-            self.grades_table.setItem(row, 3, grade_item)
-            
-            self.grades_table.setItem(row, 4, QTableWidgetItem(indicator_text[:100] + '...' if len(indicator_text) > 100 else indicator_text))
-            self.grades_table.setItem(row, 5, QTableWidgetItem(comment[:100] + '...' if len(comment) > 100 else comment))
-            self.grades_table.setItem(row, 6, QTableWidgetItem(date))
-            
-            percentage_item = QTableWidgetItem(f'{percentage:.1f}%')
-            self.grades_table.setItem(row, 7, percentage_item)
+            self.fill_grade_row(row, grade)
         
+        self.grades_table.setSortingEnabled(True)
         self.grades_table.resizeColumnsToContents()
+        
+        if self.search_edit.text().strip():
+            self.apply_search()
+
+    def refresh_grades(self):
+        """Обновление журнала: загружаются только оценки, измененные с прошлой синхронизации"""
+        if self.last_change_seq is None:
+            self.load_grades()
+            return
+        
+        last_seq, changed_ids = self.db.get_grade_changes(self.last_change_seq)
+        if not changed_ids:
+            return
+        
+        grades = self.db.get_teacher_journal(self.user.id, changed_ids, as_models=True)
+        
+        self.grades_table.setSortingEnabled(False)
+        
+        # Удаленные оценки и оценки, переданные другому преподавателю
+        loaded_ids = {grade.id for grade in grades}
+        for grade_id in changed_ids:
+            if grade_id not in loaded_ids and grade_id in self.grade_items:
+                self.grades_table.removeRow(self.grade_items.pop(grade_id).row())
+        
+        # Измененные оценки обновляются на месте, новые добавляются в начало журнала
+        for grade in grades:
+            grade_item = self.grade_items.get(grade.id)
+            if grade_item is not None:
+                row = grade_item.row()
+            else:
+                row = 0
+                self.grades_table.insertRow(row)
+            self.fill_grade_row(row, grade)
+        
+        self.grades_table.setSortingEnabled(True)
+        self.last_change_seq = last_seq
+        
+        if self.search_edit.text().strip():
+            self.apply_search()
+
+    def on_external_change(self):
+        """Обработка фиксации изменений в базе данных другим подключением"""
+        if self.db.has_external_changes():
+            self.refresh_grades()
+
+    def closeEvent(self, event):
+        """Остановка наблюдателя изменений при закрытии окна"""
+        self.change_watcher.stop()
+        super().closeEvent(event)
+
+    def fill_grade_row(self, row, grade):
+        """Заполнение строки журнала данными оценки (объект JournalEntry)"""
+        self.grades_table.setItem(row, 0, QTableWidgetItem(grade.student_name))
+        self.grades_table.setItem(row, 1, QTableWidgetItem(grade.subject_name))
+        self.grades_table.setItem(row, 2, QTableWidgetItem(grade.competency_code))
+        
+        grade_item = QTableWidgetItem(str(grade.grade_value))
+        grade_item.setBackground(self.get_grade_color(grade.grade_value))
+        grade_item.setData(Qt.UserRole, grade.id)  # Сохраняем ID для поиска и обновления
+        self.grades_table.setItem(row, 3, grade_item)
+        self.grade_items[grade.id] = grade_item
+        
+        indicator_text = grade.indicators
+        comment = grade.comment
+        self.grades_table.setItem(row, 4, QTableWidgetItem(indicator_text[:100] + '...' if len(indicator_text) > 100 else indicator_text))
+        self.grades_table.setItem(row, 5, QTableWidgetItem(comment[:100] + '...' if len(comment) > 100 else comment))
+        self.grades_table.setItem(row, 6, QTableWidgetItem(grade.date))
+        
+        percentage_item = QTableWidgetItem(f'{grade.percentage:.1f}%')
+        self.grades_table.setItem(row, 7, percentage_item)
+
+    def apply_search(self):
+        """Фильтрация журнала по результатам полнотекстового поиска"""
+        text = self.search_edit.text().strip()
+        if not text:
+            for row in range(self.grades_table.rowCount()):
+                self.grades_table.setRowHidden(row, False)
+            self.search_status_label.setText('')
+            return
+        
+        filters = {'teacher_id': self.user.id}
+        results = self.db.search_grades(text, filters, SEARCH_LIMIT)
+        fragments = {result[0]: result[6] for result in results}
+        truncated = len(results) == SEARCH_LIMIT
+        # Фрагменты есть только у первых SEARCH_LIMIT результатов, а строки
+        # таблицы фильтруются по всем найденным оценкам
+        found = self.db.search_grade_ids(text, filters) if truncated else fragments.keys()
+        
+        for row in range(self.grades_table.rowCount()):
+            grade_item = self.grades_table.item(row, 3)
+            grade_id = grade_item.data(Qt.UserRole) if grade_item else None
+            self.grades_table.setRowHidden(row, grade_id not in found)
+            
+            # Фрагмент с найденными словами показывается во всплывающей подсказке
+            comment_item = self.grades_table.item(row, 5)
+            if comment_item:
+                comment_item.setToolTip(fragments.get(grade_id, ''))
+        
+        status = f'Найдено: {len(found)}'
+        if truncated:
+            status += f' (фрагменты показаны для {SEARCH_LIMIT} наиболее подходящих)'
+        self.search_status_label.setText(status)
+
+    def export_journal(self):
+        """Экспорт журнала преподавателя в CSV или XLSX"""
+        self.export_worker = start_journal_export(
+            self, self.db.db_path, {'teacher_id': self.user.id}, 'журнал.xlsx'
+        )
+
+    def show_mastery(self):
+        """Открытие карты освоения компетенций группами"""
+        self.mastery_window = MasteryWindow(self.db)
+        self.mastery_window.show()
 
     def get_grade_color(self, grade_value):
         """Получение цвета в зависимости от оценки"""
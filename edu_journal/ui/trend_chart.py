@@ -0,0 +1,80 @@
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtCore import Qt, QPointF, QRectF
+from PyQt5.QtGui import QColor, QPainter, QPen, QPolygonF
+
+
+SERIES_COLORS = ['#2980b9', '#27ae60', '#c0392b', '#8e44ad', '#d35400', '#16a085', '#2c3e50', '#f39c12']
+GRADE_RANGE = (2, 5)  # Шкала оценок по вертикали
+MARGIN = 40  # Отступ области графика, пикселей
+LEGEND_ROW_HEIGHT = 18
+
+
+class TrendChart(QWidget):
+    """График скользящего среднего оценок по рядам динамики
+
+    Ряды (формат trends.build_series) рисуются ломаными: по горизонтали -
+    порядковый номер оценки среди последних, по вертикали - скользящее
+    среднее. Отрисовка выполняется средствами QPainter без зависимостей.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.series = []
+        self.setMinimumHeight(260)
+
+    def set_series(self, series):
+        """Замена отображаемых рядов"""
+        self.series = series
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.fillRect(self.rect(), Qt.white)
+
+        legend_width = 180
+        plot = QRectF(MARGIN, MARGIN / 2, self.width() - MARGIN * 1.5 - legend_width, self.height() - MARGIN * 1.5)
+        if plot.width() <= 0 or plot.height() <= 0:
+            return
+
+        low, high = GRADE_RANGE
+        # Горизонтальные линии сетки по значениям оценок
+        painter.setPen(QPen(QColor('#dcdde1'), 1))
+        for grade in range(low, high + 1):
+            y = plot.bottom() - (grade - low) / (high - low) * plot.height()
+            painter.drawLine(QPointF(plot.left(), y), QPointF(plot.right(), y))
+            painter.setPen(QColor('#7f8c8d'))
+            painter.drawText(QRectF(0, y - 8, MARGIN - 6, 16), Qt.AlignRight | Qt.AlignVCenter, str(grade))
+            painter.setPen(QPen(QColor('#dcdde1'), 1))
+
+        if not self.series:
+            painter.setPen(QColor('#7f8c8d'))
+            painter.drawText(plot, Qt.AlignCenter, 'Нет оценок')
+            return
+
+        # Последние оценки всех рядов выравниваются по правому краю
+        length = max(len(item['points']) for item in self.series)
+        step = plot.width() / max(1, length - 1)
+        for number, item in enumerate(self.series):
+            color = QColor(SERIES_COLORS[number % len(SERIES_COLORS)])
+            offset = length - len(item['points'])
+            polygon = QPolygonF()
+            for position, point in enumerate(item['points']):
+                rolling_avg = point[4]
+                x = plot.left() + (offset + position) * step if length > 1 else plot.center().x()
+                y = plot.bottom() - (rolling_avg - low) / (high - low) * plot.height()
+                polygon.append(QPointF(x, y))
+            painter.setPen(QPen(color, 2))
+            painter.drawPolyline(polygon)
+            painter.setBrush(color)
+            for point in polygon:
+                painter.drawEllipse(point, 3, 3)
+
+            # Легенда с изменением скользящего среднего
+            improvement = item['improvement']
+            sign = '' if improvement is None else f" ({improvement:+.2f})"
+            legend_y = plot.top() + number * LEGEND_ROW_HEIGHT
+            painter.fillRect(QRectF(plot.right() + 12, legend_y + 4, 10, 10), color)
+            painter.setPen(QColor('#2c3e50'))
+            painter.drawText(QRectF(plot.right() + 28, legend_y, legend_width - 28, LEGEND_ROW_HEIGHT),
+                             Qt.AlignLeft | Qt.AlignVCenter, f"{item['label']}{sign}")